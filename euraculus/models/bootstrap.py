@@ -0,0 +1,496 @@
+"""This module provides residual bootstrap inference for FactorVARs and FEVDs.
+
+Replications resample blocks of the estimated residuals, simulate the VAR
+recursively, refit the coefficients with fixed hyperparameters and warm starts
+from the point estimate, and recompute the FEVD network. Statistics of the
+replications are accumulated in streaming quantile estimators, so that memory
+does not grow with the number of replications.
+"""
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from euraculus.models.covariance import GLASSO
+from euraculus.models.elastic_net import GramElasticNet
+from euraculus.models.parallel import SharedWorkerPool
+from euraculus.models.var import FactorVAR
+from euraculus.network.fevd import FEVD
+
+
+class StreamingQuantiles:
+    """Streaming estimates of quantiles, means and standard deviations.
+
+    Quantiles of each entry of array-valued observations are tracked with the
+    P-square algorithm of Jain and Chlamtac (1985), which keeps five markers
+    per quantile and entry instead of all observations. Means and standard
+    deviations are accumulated with Welford's algorithm.
+
+    Attributes:
+        quantiles: The probabilities of the tracked quantiles.
+
+    Additional attributes:
+        n_obs_: The number of observations.
+        quantiles_: (n_quantiles, *shape) array of quantile estimates.
+        mean_: The mean of the observations.
+        std_: The standard deviation of the observations.
+    """
+
+    def __init__(self, quantiles: tuple = (0.05, 0.5, 0.95)):
+        """Initiates the StreamingQuantiles object with the probabilities."""
+        self.quantiles = quantiles
+        self.n_obs_ = 0
+
+    def update(self, x: np.ndarray):
+        """Adds an observation to the accumulated statistics.
+
+        Args:
+            x: Array-valued observation, all observations must have the same shape.
+
+        Returns:
+            self: The updated StreamingQuantiles object.
+        """
+        x = np.asarray(x, dtype="float64")
+        if self.n_obs_ == 0:
+            self.shape_ = x.shape
+            self._mean = np.zeros(x.size)
+            self._m2 = np.zeros(x.size)
+            self._initial = []
+        elif x.shape != self.shape_:
+            raise ValueError("observation shape mismatch")
+        x = x.ravel()
+        self.n_obs_ += 1
+
+        # moments
+        delta = x - self._mean
+        self._mean += delta / self.n_obs_
+        self._m2 += delta * (x - self._mean)
+
+        # quantiles
+        if self.n_obs_ <= 5:
+            self._initial += [x]
+            if self.n_obs_ == 5:
+                self._initialise_markers()
+        else:
+            self._update_markers(x)
+        return self
+
+    def _initialise_markers(self) -> None:
+        """Sets up the P-square markers from the first five observations."""
+        p = np.asarray(self.quantiles, dtype="float64").reshape(-1, 1)
+        initial = np.sort(np.stack(self._initial), axis=0)
+        self._heights = np.repeat(initial[None], p.shape[0], axis=0)
+        self._positions = np.zeros(self._heights.shape)
+        self._positions += np.arange(1.0, 6.0).reshape(1, 5, 1)
+        ones = np.ones_like(p)
+        self._desired = np.concatenate(
+            [ones, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5 * ones], axis=1
+        )[:, :, None]
+        self._increments = np.concatenate(
+            [0 * ones, p / 2, p, (1 + p) / 2, ones], axis=1
+        )[:, :, None]
+        self._initial = None
+
+    def _update_markers(self, x: np.ndarray) -> None:
+        """Moves the P-square markers towards their desired positions.
+
+        Args:
+            x: Flat observation.
+        """
+        q, n = self._heights, self._positions
+
+        # locate observation between markers
+        cell = (x >= q[:, 1:4]).sum(axis=1)
+        q[:, 0] = np.minimum(q[:, 0], x)
+        q[:, 4] = np.maximum(q[:, 4], x)
+        n += np.arange(5).reshape(1, 5, 1) > cell[:, None, :]
+        self._desired += self._increments
+
+        # adjust middle markers
+        for i in (1, 2, 3):
+            d = self._desired[:, i] - n[:, i]
+            step_up = (d >= 1) & (n[:, i + 1] - n[:, i] > 1)
+            step_down = (d <= -1) & (n[:, i - 1] - n[:, i] < -1)
+            s = step_up.astype("float64") - step_down
+            if not s.any():
+                continue
+            parabolic = q[:, i] + s / (n[:, i + 1] - n[:, i - 1]) * (
+                (n[:, i] - n[:, i - 1] + s)
+                * (q[:, i + 1] - q[:, i])
+                / (n[:, i + 1] - n[:, i])
+                + (n[:, i + 1] - n[:, i] - s)
+                * (q[:, i] - q[:, i - 1])
+                / (n[:, i] - n[:, i - 1])
+            )
+            neighbour_q = np.where(s > 0, q[:, i + 1], q[:, i - 1])
+            neighbour_n = np.where(s > 0, n[:, i + 1], n[:, i - 1])
+            linear = q[:, i] + s * (neighbour_q - q[:, i]) / (neighbour_n - n[:, i])
+            is_monotonic = (q[:, i - 1] < parabolic) & (parabolic < q[:, i + 1])
+            q[:, i] = np.where(
+                s != 0, np.where(is_monotonic, parabolic, linear), q[:, i]
+            )
+            n[:, i] += s
+
+    @property
+    def quantiles_(self) -> np.ndarray:
+        """Array of quantile estimates with the quantiles along the first axis."""
+        if self.n_obs_ == 0:
+            raise ValueError("No observations")
+        if self.n_obs_ < 5:
+            quantiles = np.quantile(np.stack(self._initial), self.quantiles, axis=0)
+        else:
+            quantiles = self._heights[:, 2]
+        return quantiles.reshape(len(self.quantiles), *self.shape_)
+
+    @property
+    def mean_(self) -> np.ndarray:
+        """Mean of the observations."""
+        if self.n_obs_ == 0:
+            raise ValueError("No observations")
+        return self._mean.reshape(self.shape_)
+
+    @property
+    def std_(self) -> np.ndarray:
+        """Standard deviation of the observations."""
+        if self.n_obs_ < 2:
+            raise ValueError("At least two observations required")
+        return np.sqrt(self._m2 / (self.n_obs_ - 1)).reshape(self.shape_)
+
+
+def _resample_blocks(
+    residuals: np.ndarray,
+    block_length: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """Draws a moving block bootstrap sample of residual rows.
+
+    Args:
+        residuals: (t_periods, n_series) array of residuals.
+        block_length: The number of consecutive periods in each block.
+        rng: Random number generator.
+
+    Returns:
+        resampled: (t_periods, n_series) array of resampled residuals.
+    """
+    t_periods = residuals.shape[0]
+    block_length = min(block_length, t_periods)
+    n_blocks = -(-t_periods // block_length)
+    starts = rng.integers(0, t_periods - block_length + 1, size=n_blocks)
+    indices = (starts[:, None] + np.arange(block_length)).ravel()[:t_periods]
+    resampled = residuals[indices]
+    return resampled
+
+
+def _simulate_var(
+    var: FactorVAR,
+    var_data: np.ndarray,
+    factor_data: np.ndarray,
+    residuals: np.ndarray,
+) -> np.ndarray:
+    """Simulates the fitted FactorVAR recursively from given innovations.
+
+    The first p_lags observations and the factors are kept fixed.
+
+    Args:
+        var: The fitted FactorVAR.
+        var_data: (t_periods, n_series) array with observations.
+        factor_data: (t_periods, k_factors) array with factor observations.
+        residuals: (t_periods-p_lags, n_series) array of innovations.
+
+    Returns:
+        simulated: (t_periods, n_series) array of simulated observations.
+    """
+    p_lags = var.p_lags
+    deterministic = factor_data[p_lags:] @ var.factor_loadings_.T + residuals
+    if var.has_intercepts:
+        deterministic += var.intercepts_.reshape(1, -1)
+
+    simulated = np.array(var_data, dtype="float64")
+    for t in range(p_lags, simulated.shape[0]):
+        simulated[t] = deterministic[t - p_lags]
+        for lag, var_matrix in enumerate(var.var_matrices_):
+            simulated[t] += var_matrix @ simulated[t - lag - 1]
+    return simulated
+
+
+def _bootstrap_replication(
+    seed: np.random.SeedSequence,
+    var: FactorVAR,
+    var_data: np.ndarray,
+    factor_data: np.ndarray,
+    residuals: np.ndarray,
+    alpha: float,
+    lambdau: float,
+    penalty_weights: np.ndarray,
+    penalize_diagonals: bool,
+    penalize_factors: bool,
+    coef_init: np.ndarray,
+    block_length: int,
+    cov_alpha: float,
+    horizon: int,
+    table_name: str,
+    normalize: bool,
+    **kwargs,
+) -> dict:
+    """Computes the statistics of a single bootstrap replication in a worker.
+
+    Returns:
+        statistics: Dictionary with the VAR(1) matrix and the connectedness
+            of each asset in the replication.
+    """
+    rng = np.random.default_rng(seed)
+    innovations = _resample_blocks(residuals, block_length=block_length, rng=rng)
+    var_data = pd.DataFrame(_simulate_var(var, var_data, factor_data, innovations))
+    factor_data = pd.DataFrame(factor_data)
+
+    # refit with fixed hyperparameters and penalty weights
+    replication = FactorVAR(has_intercepts=var.has_intercepts, p_lags=var.p_lags)
+    X_block, Y, default_weights = replication._build_block_inputs(
+        var_data=var_data,
+        factor_data=factor_data,
+        penalize_diagonals=penalize_diagonals,
+        penalize_factors=penalize_factors,
+    )
+    if penalty_weights is None:
+        penalty_weights = default_weights
+    model = GramElasticNet(alpha=alpha, lambdau=lambdau, **kwargs)
+    model.fit(X_block, Y, penalty_weights=penalty_weights, coef_init=coef_init)
+    replication._store_estimates(
+        var_data,
+        factor_data,
+        var_data.shape[1],
+        factor_data.shape[1],
+        model,
+        penalty_weights,
+    )
+    replication.is_fitted = True
+
+    # fevd network
+    replication_residuals = replication.residuals(
+        var_data.values, factor_data=factor_data.values
+    )
+    if cov_alpha is None:
+        error_cov = (
+            replication_residuals.T @ replication_residuals
+        ) / replication_residuals.shape[0]
+    else:
+        error_cov = GLASSO(alpha=cov_alpha, max_iter=400)
+        error_cov = error_cov.fit(replication_residuals).covariance_
+    fevd = FEVD(replication.var_1_matrix_, error_cov)
+    network = fevd.to_network(
+        table_name=table_name, horizon=horizon, normalize=normalize
+    )
+
+    statistics = {
+        "var_1_matrix": replication.var_1_matrix_,
+        "in_connectedness": network.in_connectedness().ravel(),
+        "out_connectedness": network.out_connectedness().ravel(),
+    }
+    return statistics
+
+
+class FactorVARBootstrap:
+    """Residual block bootstrap for FactorVAR coefficients and FEVD networks.
+
+    Each replication resamples blocks of the centred point estimate residuals,
+    simulates the VAR recursively conditional on the factors and the initial
+    observations, and refits the elastic net with the Gram solver at fixed
+    hyperparameters and the penalty weights of the point estimate, warm started
+    from the point estimate. The FEVD network is
+    recomputed with the sample or a fixed-penalty GLASSO covariance of the
+    replication residuals. Replications run in batches on a SharedWorkerPool.
+    Every replication draws from its own child of a SeedSequence, so that the
+    results do not depend on the number of workers or the batch size.
+
+    Attributes:
+        var: The fitted FactorVAR point estimate.
+        alpha: The ratio of L1 penalisation to L2 penalisation.
+        lambdau: The penalty factor over all penalty terms.
+        penalty_weights: Stacked coefficient penalty weights, the penalty_weights_
+            of the point estimate are used if None, e.g. its adaptive weights
+            with zeros for unpenalised factor loadings, default=None.
+        penalize_diagonals: Indicates if diagonal VAR entries are penalized if
+            neither penalty_weights nor the point estimate provide weights.
+        penalize_factors: Indicates if factor loadings are penalized if neither
+            penalty_weights nor the point estimate provide weights.
+        n_replications: The number of bootstrap replications, default=500.
+        block_length: The number of consecutive residuals per block, default=10.
+        cov_alpha: GLASSO penalty for the innovation covariance, the sample
+            covariance is used if None, default=None.
+        horizon: The FEVD horizon, default=21.
+        table_name: Abbreviated name of the FEVD network table, default='fevd'.
+        normalize: Indicates if the network table is row-normalized.
+        confidence_level: The coverage of the confidence bands, default=0.9.
+        seed: Seed for the random number generation, default=None.
+        n_jobs: The number of worker processes, -1 to use all cores.
+        blas_threads: The maximum number of BLAS threads per worker, default=1.
+        batch_size: The number of replications per parallel batch, default=64.
+
+    Additional attributes:
+        statistics_: Dictionary of StreamingQuantiles objects for the VAR(1)
+            matrix entries and the in- and out-connectedness of each asset.
+        n_replications_: The number of completed replications.
+    """
+
+    def __init__(
+        self,
+        var: FactorVAR,
+        alpha: float,
+        lambdau: float,
+        penalty_weights: np.ndarray = None,
+        penalize_diagonals: bool = True,
+        penalize_factors: bool = True,
+        n_replications: int = 500,
+        block_length: int = 10,
+        cov_alpha: float = None,
+        horizon: int = 21,
+        table_name: str = "fevd",
+        normalize: bool = False,
+        confidence_level: float = 0.9,
+        seed: int = None,
+        n_jobs: int = -1,
+        blas_threads: int = 1,
+        batch_size: int = 64,
+        **kwargs,
+    ):
+        """Initiates the FactorVARBootstrap object with its settings.
+
+        Args:
+            kwargs: Additional keyword arguments for GramElasticNet.
+        """
+        self.var = var
+        self.alpha = alpha
+        self.lambdau = lambdau
+        self.penalty_weights = penalty_weights
+        self.penalize_diagonals = penalize_diagonals
+        self.penalize_factors = penalize_factors
+        self.n_replications = n_replications
+        self.block_length = block_length
+        self.cov_alpha = cov_alpha
+        self.horizon = horizon
+        self.table_name = table_name
+        self.normalize = normalize
+        self.confidence_level = confidence_level
+        self.seed = seed
+        self.n_jobs = n_jobs
+        self.blas_threads = blas_threads
+        self.batch_size = batch_size
+        self.kwargs = kwargs
+
+    @property
+    def quantiles(self) -> tuple:
+        """Probabilities of the lower band, the median and the upper band."""
+        tail = (1 - self.confidence_level) / 2
+        return (tail, 0.5, 1 - tail)
+
+    def _scaled_coef_block(
+        self, var_data: np.ndarray, factor_data: np.ndarray
+    ) -> np.ndarray:
+        """Point estimate coefficients on the standardised data.
+
+        Inverts the rescaling of FactorVAR._scale_coefs to warm start the
+        replications.
+
+        Returns:
+            coef_block: (n_series, m_features) coefficients without intercepts.
+        """
+        coef_block = self.var._coef_matrix_.T[:, int(self.var.has_intercepts) :]
+        x_block = self.var._build_X_block(
+            var_data=var_data, factor_data=factor_data, add_intercepts=False
+        )
+        x_scales = x_block.std(axis=0).reshape(1, -1)
+        y_scales = var_data.std(axis=0, ddof=1).reshape(-1, 1)
+        coef_block = coef_block * x_scales / y_scales
+        return coef_block
+
+    def fit(self, var_data: pd.DataFrame, factor_data: pd.DataFrame):
+        """Runs the bootstrap replications and accumulates their statistics.
+
+        Args:
+            var_data: (t_periods, n_series) data the point estimate was fitted on.
+            factor_data: (t_periods, k_factors) factor data of the point estimate.
+
+        Returns:
+            self: The fitted FactorVARBootstrap object.
+        """
+        if not self.var.is_fitted:
+            raise ValueError("Model is not fitted")
+        var_data = np.asarray(var_data, dtype="float64")
+        factor_data = np.asarray(factor_data, dtype="float64")
+        residuals = self.var.residuals(var_data, factor_data=factor_data)
+        residuals -= residuals.mean(axis=0)
+        coef_init = self._scaled_coef_block(var_data, factor_data)
+        penalty_weights = self.penalty_weights
+        if penalty_weights is None:
+            penalty_weights = getattr(self.var, "penalty_weights_", None)
+
+        seeds = np.random.SeedSequence(self.seed).spawn(self.n_replications)
+        self.statistics_ = {
+            key: StreamingQuantiles(quantiles=self.quantiles)
+            for key in ["var_1_matrix", "in_connectedness", "out_connectedness"]
+        }
+        self.n_replications_ = 0
+
+        with SharedWorkerPool(
+            n_jobs=self.n_jobs, blas_threads=self.blas_threads
+        ) as pool:
+            var_data, factor_data = pool.share(var_data), pool.share(factor_data)
+            residuals = pool.share(residuals)
+            for start in range(0, self.n_replications, self.batch_size):
+                replications = joblib.Parallel()(
+                    joblib.delayed(_bootstrap_replication)(
+                        seed=seed,
+                        var=self.var,
+                        var_data=var_data,
+                        factor_data=factor_data,
+                        residuals=residuals,
+                        alpha=self.alpha,
+                        lambdau=self.lambdau,
+                        penalty_weights=penalty_weights,
+                        penalize_diagonals=self.penalize_diagonals,
+                        penalize_factors=self.penalize_factors,
+                        coef_init=coef_init,
+                        block_length=self.block_length,
+                        cov_alpha=self.cov_alpha,
+                        horizon=self.horizon,
+                        table_name=self.table_name,
+                        normalize=self.normalize,
+                        **self.kwargs,
+                    )
+                    for seed in seeds[start : start + self.batch_size]
+                )
+                for statistics in replications:
+                    for key, value in statistics.items():
+                        self.statistics_[key].update(value)
+                    self.n_replications_ += 1
+        return self
+
+    def confidence_bands(self, statistic: str = "var_1_matrix") -> tuple:
+        """Lower and upper confidence bands of a bootstrapped statistic.
+
+        Args:
+            statistic: One of 'var_1_matrix', 'in_connectedness' or
+                'out_connectedness'.
+
+        Returns:
+            lower: Lower band with the shape of the statistic.
+            upper: Upper band with the shape of the statistic.
+        """
+        if statistic not in self.statistics_:
+            raise ValueError("statistic '{}' not available".format(statistic))
+        lower, _, upper = self.statistics_[statistic].quantiles_
+        return (lower, upper)
+
+    def standard_errors(self, statistic: str = "var_1_matrix") -> np.ndarray:
+        """Bootstrap standard errors of a statistic.
+
+        Args:
+            statistic: One of 'var_1_matrix', 'in_connectedness' or
+                'out_connectedness'.
+
+        Returns:
+            standard_errors: Standard deviation across replications.
+        """
+        if statistic not in self.statistics_:
+            raise ValueError("statistic '{}' not available".format(statistic))
+        return self.statistics_[statistic].std_
@@ -1,11 +1,18 @@
 import numpy as np
 import scipy as sp
 from sklearn.base import BaseEstimator
-from sklearn.covariance import GraphicalLasso
+from sklearn.covariance import GraphicalLasso, empirical_covariance, graphical_lasso
 from sklearn.linear_model import LinearRegression
+from sklearn.utils import check_array
 
 from euraculus.models.elastic_net import ElasticNet
 
+try:
+    # scikit-learn>=1.3 only accepts cov_init in the private solver
+    from sklearn.covariance._graph_lasso import _graphical_lasso
+except ImportError:
+    _graphical_lasso = None
+
 
 class AdaptiveThresholdEstimator(BaseEstimator):
     """AdaptiveThresholdEstimator object.
@@ -147,6 +154,46 @@ class AdaptiveThresholdEstimator(BaseEstimator):
 class GLASSO(GraphicalLasso):
     """"""
 
+    def fit(self, X, y=None, cov_init=None):
+        """Fits the GLASSO to the data in X.
+
+        Args:
+            X: Data of shape (n_samples, n_features).
+            y: Ignored.
+            cov_init: Initial guess for the covariance matrix, e.g. a previous
+                estimate, to warm start the solver, default=None.
+
+        Returns:
+            self
+        """
+        if cov_init is None:
+            return super().fit(X, y)
+
+        X = check_array(X, ensure_min_features=2, ensure_min_samples=2)
+        if self.assume_centered:
+            self.location_ = np.zeros(X.shape[1])
+        else:
+            self.location_ = X.mean(0)
+        emp_cov = empirical_covariance(X, assume_centered=self.assume_centered)
+        kwargs = dict(
+            alpha=self.alpha,
+            cov_init=cov_init,
+            mode=self.mode,
+            tol=self.tol,
+            enet_tol=self.enet_tol,
+            max_iter=self.max_iter,
+            verbose=self.verbose,
+        )
+        if _graphical_lasso is None:
+            self.covariance_, self.precision_, self.n_iter_ = graphical_lasso(
+                emp_cov, return_n_iter=True, **kwargs
+            )
+        else:
+            self.covariance_, self.precision_, _, self.n_iter_ = _graphical_lasso(
+                emp_cov, **kwargs
+            )
+        return self
+
     def _covar_loss(self, data):
         """Frobenius norm loss wrt sample covariance matrix."""
         # differences
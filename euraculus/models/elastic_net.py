@@ -7,12 +7,372 @@ import numpy as np
 import scipy as sp
 
 from glmnet import glmnet
-from sklearn.base import BaseEstimator
+from scipy.sparse.csgraph import connected_components
+from sklearn.base import BaseEstimator, clone
 from sklearn.metrics import mean_squared_error
-from sklearn.model_selection import GridSearchCV, PredefinedSplit
+from sklearn.model_selection import (
+    GridSearchCV,
+    KFold,
+    ParameterGrid,
+    PredefinedSplit,
+)
 from sklearn.utils.validation import check_array, check_is_fitted, check_X_y
 
 
+def _soft_threshold(z: np.ndarray, threshold: np.ndarray) -> np.ndarray:
+    """Apply the soft-thresholding operator elementwise.
+
+    Args:
+        z: The values to be thresholded.
+        threshold: The non-negative thresholds, broadcastable to z.
+
+    Returns:
+        thresholded: sign(z) * max(|z| - threshold, 0).
+    """
+    thresholded = np.sign(z) * np.maximum(abs(z) - threshold, 0)
+    return thresholded
+
+
+def _coordinate_sweeps(
+    scaled_gram: np.ndarray,
+    l1_penalties: np.ndarray,
+    denominators: np.ndarray,
+    coef: np.ndarray,
+    gradient: np.ndarray,
+    threshold: float,
+    max_iter: float,
+    eligible: np.ndarray = None,
+) -> int:
+    """Run coordinate descent sweeps in place until convergence.
+
+    Args:
+        scaled_gram: (m_features, m_features) Gram matrix divided by n_obs.
+        l1_penalties: (m_features, n_responses) soft-thresholding levels.
+        denominators: (m_features, n_responses) curvatures of the coordinates.
+        coef: (m_features, n_responses) coefficients, updated in place.
+        gradient: (n_responses, m_features) gradient of the squared loss at
+            coef, updated in place.
+        threshold: Convergence threshold on the largest weighted squared
+            coefficient change in a sweep.
+        max_iter: Maximum number of sweeps.
+        eligible: (m_features, n_responses) boolean array indicating which
+            coefficients may be updated, default=None.
+
+    Returns:
+        n_iter: The number of coordinate sweeps performed.
+    """
+    # responses to update for each feature, features without any are skipped
+    if eligible is None:
+        all_features = np.arange(coef.shape[0])
+        responses = [slice(None)] * coef.shape[0]
+    else:
+        all_features = np.flatnonzero(eligible.any(axis=1))
+        responses = [np.flatnonzero(row) for row in eligible]
+    response_index = np.arange(coef.shape[1])
+    diag = np.diag(scaled_gram)
+    n_dense = coef.shape[1] // 2
+
+    # alternate full sweeps and sweeps over the active set until convergence
+    features = all_features
+    n_iter = 0
+    while n_iter < max_iter:
+        n_iter += 1
+        max_change = 0.0
+        for j in features:
+            rows = responses[j]
+            z = gradient[rows, j] + diag[j] * coef[j, rows]
+            update = _soft_threshold(z, l1_penalties[j, rows]) / denominators[j, rows]
+            delta = update - coef[j, rows]
+            changed = np.flatnonzero(delta)
+            if changed.size > n_dense:
+                coef[j, rows] = update
+                gradient[rows] -= np.outer(delta, scaled_gram[j])
+            elif changed.size > 0:
+                delta = delta[changed]
+                changed = response_index[rows][changed]
+                coef[j, changed] += delta
+                gradient[changed] -= np.outer(delta, scaled_gram[j])
+            else:
+                continue
+            max_change = max(max_change, diag[j] * (delta**2).max())
+
+        if max_change < threshold:
+            if features is all_features:
+                break
+            features = all_features
+        else:
+            features = np.flatnonzero(coef.any(axis=1))
+
+    return n_iter
+
+
+def gram_coordinate_descent(
+    gram: np.ndarray,
+    xty: np.ndarray,
+    n_obs: int,
+    lambdau: float,
+    alpha: float,
+    penalty_weights: np.ndarray = None,
+    coef: np.ndarray = None,
+    threshold: float = 1e-4,
+    max_iter: float = 1e5,
+    eligible: np.ndarray = None,
+) -> tuple:
+    """Fit elastic net coefficients for several responses with shared regressors.
+
+    Minimises the objective
+        1/(2*n_obs) * ||y_i - X b_i||^2
+            + lambdau * sum_j w_ji * (alpha * |b_ji| + (1-alpha)/2 * b_ji^2)
+    for all response columns i simultaneously through cyclical coordinate
+    descent with covariance updates. Only the Gram matrix X'X and the
+    cross-products X'Y enter the optimisation, so that each coordinate update
+    is a vectorized operation over all responses. Gradients are kept response
+    by response, so that updates of few responses only touch contiguous rows.
+
+    Args:
+        gram: (m_features, m_features) Gram matrix X'X of the regressors.
+        xty: (m_features, n_responses) cross-products X'Y.
+        n_obs: The number of observations scaling the squared loss.
+        lambdau: The penalty factor over all penalty terms.
+        alpha: The ratio of L1 penalisation to L2 penalisation.
+        penalty_weights: (m_features, n_responses) coefficient penalty weights,
+            zero if not penalised, default=None.
+        coef: (m_features, n_responses) initial coefficients to warm start
+            the optimisation, default=None.
+        threshold: Convergence threshold on the largest weighted squared
+            coefficient change in a sweep, default=1e-4.
+        max_iter: Maximum number of sweeps, default=1e5.
+        eligible: (m_features, n_responses) boolean array indicating which
+            coefficients may be nonzero, the others are fixed at zero and
+            skipped in all sweeps, default=None.
+
+    Returns:
+        coef: (m_features, n_responses) array of fitted coefficients.
+        n_iter: The number of coordinate sweeps performed.
+    """
+    # setup
+    if penalty_weights is None:
+        penalty_weights = np.ones(xty.shape)
+    if coef is None:
+        coef = np.zeros(xty.shape)
+    else:
+        coef = np.array(coef, dtype="float64")
+    if eligible is not None:
+        coef[~eligible] = 0
+
+    # penalty terms and curvature
+    scaled_gram = gram / n_obs
+    l1_penalties, denominators = _coordinate_penalties(
+        scaled_gram, lambdau, alpha, penalty_weights
+    )
+    gradient = ((xty - gram @ coef) / n_obs).T.copy()
+
+    n_iter = _coordinate_sweeps(
+        scaled_gram,
+        l1_penalties,
+        denominators,
+        coef=coef,
+        gradient=gradient,
+        threshold=threshold,
+        max_iter=max_iter,
+        eligible=eligible,
+    )
+    return (coef, n_iter)
+
+
+def _coordinate_penalties(
+    scaled_gram: np.ndarray,
+    lambdau: float,
+    alpha: float,
+    penalty_weights: np.ndarray,
+) -> tuple:
+    """Returns the soft-thresholding levels and curvatures of all coordinates."""
+    l1_penalties = lambdau * alpha * penalty_weights
+    denominators = (
+        np.diag(scaled_gram).reshape(-1, 1)
+        + lambdau * (1 - alpha) * penalty_weights
+    )
+    denominators[denominators == 0] = np.inf
+    return (l1_penalties, denominators)
+
+
+def strong_rule_coordinate_descent(
+    gram: np.ndarray,
+    xty: np.ndarray,
+    n_obs: int,
+    lambdau: float,
+    alpha: float,
+    previous_lambdau: float,
+    coef: np.ndarray,
+    penalty_weights: np.ndarray = None,
+    threshold: float = 1e-4,
+    max_iter: float = 1e5,
+) -> tuple:
+    """Fit elastic net coefficients along a path with strong-rule screening.
+
+    Given the solution coef at a larger penalty previous_lambdau, the
+    sequential strong rule of Tibshirani et al. (2012) discards coefficients
+    with |x_j'(y_i - X b_i)|/n_obs < alpha * (2*lambdau - previous_lambdau) * w_ji,
+    as they are likely to remain zero. Sweeps only visit the remaining
+    coefficients and skip features without any, after which the KKT
+    conditions are checked for all discarded coefficients. Violators are
+    added back and the sweeps continue, so that the solution coincides with
+    the unscreened one. The gradient is computed once from the Gram matrix
+    and then maintained by the sweeps, so that the screening and the KKT
+    checks come at no additional matrix products.
+
+    Args:
+        gram: (m_features, m_features) Gram matrix X'X of the regressors.
+        xty: (m_features, n_responses) cross-products X'Y.
+        n_obs: The number of observations scaling the squared loss.
+        lambdau: The penalty factor over all penalty terms.
+        alpha: The ratio of L1 penalisation to L2 penalisation.
+        previous_lambdau: The penalty factor at which coef was estimated.
+        coef: (m_features, n_responses) solution at previous_lambdau.
+        penalty_weights: (m_features, n_responses) coefficient penalty weights,
+            zero if not penalised, default=None.
+        threshold: Convergence threshold on the largest weighted squared
+            coefficient change in a sweep, default=1e-4.
+        max_iter: Maximum number of sweeps, default=1e5.
+
+    Returns:
+        coef: (m_features, n_responses) array of fitted coefficients.
+        n_iter: The number of coordinate sweeps performed.
+        n_screened: The number of coefficients excluded from the optimisation.
+    """
+    if penalty_weights is None:
+        penalty_weights = np.ones(xty.shape)
+    coef = np.array(coef, dtype="float64")
+    scaled_gram = gram / n_obs
+    l1_penalties, denominators = _coordinate_penalties(
+        scaled_gram, lambdau, alpha, penalty_weights
+    )
+
+    # sequential strong rule at the previous solution
+    gradient = ((xty - gram @ coef) / n_obs).T.copy()
+    strong_thresholds = alpha * (2 * lambdau - previous_lambdau) * penalty_weights
+    eligible = (abs(gradient.T) >= strong_thresholds) | (coef != 0)
+
+    # fit on the strong set and add back KKT violators
+    kkt_thresholds = l1_penalties * (1 + 1e-6)
+    n_iter = 0
+    while True:
+        n_iter += _coordinate_sweeps(
+            scaled_gram,
+            l1_penalties,
+            denominators,
+            coef=coef,
+            gradient=gradient,
+            threshold=threshold,
+            max_iter=max_iter - n_iter,
+            eligible=eligible,
+        )
+        violations = ~eligible & (abs(gradient.T) > kkt_thresholds)
+        if not violations.any() or n_iter >= max_iter:
+            break
+        eligible |= violations
+
+    n_screened = int((~eligible).sum())
+    return (coef, n_iter, n_screened)
+
+
+def _gram_blocks(gram) -> list:
+    """Split features into groups that are uncorrelated with each other.
+
+    A sparse Gram matrix, e.g. of a stacked block diagonal design, is split into
+    its connected components, a dense Gram matrix forms a single group.
+
+    Args:
+        gram: (m_features, m_features) Gram matrix X'X, can be sparse.
+
+    Returns:
+        blocks: List of feature index arrays.
+    """
+    if not sp.sparse.issparse(gram):
+        return [np.arange(gram.shape[0])]
+    n_blocks, labels = connected_components(gram != 0)
+    order = np.argsort(labels, kind="stable")
+    splits = np.cumsum(np.bincount(labels, minlength=n_blocks))[:-1]
+    blocks = np.split(order, splits)
+    return blocks
+
+
+def ridge_path(
+    gram,
+    xty: np.ndarray,
+    n_obs: int,
+    lambdaus: np.ndarray,
+    penalty_weights: np.ndarray = None,
+) -> np.ndarray:
+    """Compute ridge coefficients for a sequence of penalties in closed form.
+
+    Solves (X'X + n_obs * lambdau * W) B = X'Y, the first-order condition of
+    the unstandardized elastic net objective of sklearn ElasticNet with
+    alpha=0, for all lambdau values at once. As the gaussian glmnet routine
+    standardizes the response internally, its ridge fits coincide only for
+    responses with unit variance.
+    Unpenalised features are profiled out and the Schur complement of the
+    penalised features is eigendecomposed once, so that each additional
+    penalty only requires a rescaling of the rotated cross-products. A sparse
+    Gram matrix is decomposed separately for each of its independent blocks.
+
+    Args:
+        gram: (m_features, m_features) Gram matrix X'X, can be sparse.
+        xty: (m_features, n_responses) cross-products X'Y.
+        n_obs: The number of observations scaling the squared loss.
+        lambdaus: Sequence of penalty factors.
+        penalty_weights: (m_features, n_responses) coefficient penalty weights,
+            zero if not penalised, default=None. The weights have to be equal
+            across responses and take a single nonzero value.
+
+    Returns:
+        coefs: (n_lambdaus, m_features, n_responses) array of coefficients.
+    """
+    # penalty structure
+    m_features, n_responses = xty.shape
+    if penalty_weights is None:
+        penalty_weights = np.ones(xty.shape)
+    levels = np.unique(penalty_weights[penalty_weights != 0])
+    if len(levels) > 1 or not (penalty_weights == penalty_weights[:, :1]).all():
+        raise ValueError("ridge path requires one penalty level for all responses")
+    weight = levels[0] if len(levels) > 0 else 0.0
+    penalised = penalty_weights[:, 0] != 0
+    lambdaus = np.asarray(lambdaus, dtype="float64")
+
+    coefs = np.zeros([len(lambdaus), m_features, n_responses])
+    for block in _gram_blocks(gram):
+        gram_block = gram[block][:, block]
+        if sp.sparse.issparse(gram_block):
+            gram_block = gram_block.toarray()
+        xty_block = xty[block]
+        P = np.flatnonzero(penalised[block])
+        U = np.flatnonzero(~penalised[block])
+
+        # profile out unpenalised features
+        if U.size > 0:
+            gram_UU = gram_block[np.ix_(U, U)]
+            projection = np.linalg.lstsq(
+                gram_UU, gram_block[np.ix_(U, P)], rcond=None
+            )[0]
+            fitted_U = np.linalg.lstsq(gram_UU, xty_block[U], rcond=None)[0]
+            schur = gram_block[np.ix_(P, P)] - gram_block[np.ix_(P, U)] @ projection
+            residual = xty_block[P] - gram_block[np.ix_(P, U)] @ fitted_U
+        else:
+            schur = gram_block[np.ix_(P, P)]
+            residual = xty_block[P]
+
+        # rotate once, rescale for each penalty
+        eigenvalues, eigenvectors = np.linalg.eigh(schur)
+        rotated = eigenvectors.T @ residual
+        for i, lambdau in enumerate(lambdaus):
+            shrinkage = 1 / (eigenvalues + n_obs * lambdau * weight)
+            coef_P = eigenvectors @ (shrinkage.reshape(-1, 1) * rotated)
+            coefs[i, block[P]] = coef_P
+            if U.size > 0:
+                coefs[i, block[U]] = fitted_U - projection @ coef_P
+    return coefs
+
+
 class ElasticNet(BaseEstimator):
     """Elastic Net estimator based on the Fortran routine glmnet.
 
@@ -196,6 +556,8 @@ class AdaptiveElasticNet(ElasticNet):
         ini_lambdau: The penalty factor in the first estimation.
         penalty_weights: Coefficient penalty weights, zero if not penalised,
                 of shape (k_features,), default=None.
+        n_jobs: The number of parallel jobs in the first-stage cross-validation,
+            None to use the active joblib backend, default=-1.
 
     Attributes inherited from ElasticNet:
         lambdau: The penalty factor over all penalty terms, default=0.1.
@@ -215,6 +577,7 @@ class AdaptiveElasticNet(ElasticNet):
         ini_alpha: float = 0,  # 1e-4,
         ini_lambdau: float = None,
         penalty_weights: np.ndarray = None,
+        n_jobs: int = -1,
         **kwargs,
     ):
         ElasticNet.__init__(
@@ -226,6 +589,7 @@ class AdaptiveElasticNet(ElasticNet):
         self.ini_alpha = ini_alpha
         self.ini_lambdau = ini_lambdau
         self.penalty_weights = penalty_weights
+        self.n_jobs = n_jobs
         self._gamma = gamma
 
     @property
@@ -241,6 +605,10 @@ class AdaptiveElasticNet(ElasticNet):
         # set gamma
         self._gamma = gamma
 
+    def _count_features(self, X: np.ndarray, y: np.ndarray) -> int:
+        """Returns the number of coefficients estimated for inputs X and y."""
+        return X.shape[1]
+
     def _guess_grid(
         self,
         X: np.ndarray,
@@ -266,8 +634,9 @@ class AdaptiveElasticNet(ElasticNet):
                 and lambdau.
         """
         # limits
-        lower = y.std() / X.shape[1]
-        upper = y.std() * X.shape[1]
+        k_features = self._count_features(X, y)
+        lower = y.std() / k_features
+        upper = y.std() * k_features
 
         # consider linear scale or geometric or both
         if logs is None:
@@ -286,6 +655,80 @@ class AdaptiveElasticNet(ElasticNet):
         grid = {"alpha": [self.ini_alpha], "lambdau": lambdau_grid}
         return grid
 
+    def _ridge_penalty_weights(
+        self,
+        X: np.ndarray,
+        y: np.ndarray,
+        penalty_weights: np.ndarray = None,
+    ) -> np.ndarray:
+        """Returns first-stage penalty weights of shape (k_features, 1) for ridge_path.
+
+        As in glmnet, penalty weights are rescaled to sum to the number of features.
+        """
+        if penalty_weights is None:
+            return np.ones([X.shape[1], 1])
+        penalty_weights = np.asarray(penalty_weights, dtype="float64")
+        penalty_weights = penalty_weights * penalty_weights.size / penalty_weights.sum()
+        return penalty_weights.reshape(-1, 1)
+
+    def _fit_ridge_first_stage(
+        self,
+        X: np.ndarray,
+        y: np.ndarray,
+        penalty_weights: np.ndarray = None,
+        grid: dict = None,
+        split: int = 5,
+    ) -> np.ndarray:
+        """Fits a pure ridge first stage in closed form.
+
+        If ini_alpha is zero, the first-stage coefficients are computed with
+        ridge_path, and the cross-validation of ini_lambdau is performed on the
+        closed-form path of each fold with ridge_path_cv.
+
+        Args:
+            X: The input samples of shape (n_samples, k_features),
+                can be a sparse matrix.
+            y: Labels of shape (n_samples,) corresponding to the inputs X.
+            penalty_weights: Indicator of penalised coefficients, default=None.
+            grid: Dictionary with candidate hyperparameter values for alpha
+                and lambdau.
+            split: Number of splits or PredefinedSplit to use for cross-validation.
+
+        Returns:
+            ini_coef: The stacked first-stage coefficients, None if the closed
+                form does not apply.
+        """
+        if self.ini_alpha != 0:
+            return None
+        responses = np.asarray(y, dtype="float64").reshape(X.shape[0], -1)
+        weights = self._ridge_penalty_weights(X, responses, penalty_weights)
+        if not (weights == weights[:, :1]).all():
+            return None
+
+        if self.ini_lambdau is not None:
+            coef = ridge_path(
+                gram=X.T @ X,
+                xty=np.asarray(X.T @ responses),
+                n_obs=responses.size,
+                lambdaus=[self.ini_lambdau],
+                penalty_weights=weights,
+            )[0]
+        else:
+            if grid is None:
+                grid = self._guess_grid(X, y, logs=None, n_values=25)
+            if set(grid) - {"alpha", "lambdau"} or np.any(grid.get("alpha", 0)):
+                return None
+            print("Searching suitable init_lambda hyperparameter...")
+            self.ini_lambdau, coef, _ = ridge_path_cv(
+                X,
+                responses,
+                lambdaus=np.asarray(grid["lambdau"]),
+                cv=split,
+                penalty_weights=weights,
+            )
+        ini_coef = coef.T.ravel()
+        return ini_coef
+
     def _update_penalty_weights(
         self,
         X: np.ndarray,
@@ -314,10 +757,19 @@ class AdaptiveElasticNet(ElasticNet):
         else:
             penalise = None
 
+        # closed-form ridge first stage if available
+        ini_coef = self._fit_ridge_first_stage(
+            X, y, penalty_weights=penalise, grid=grid, split=split
+        )
+
         # initialise first-stage net
         ini_net = ElasticNet(alpha=self.ini_alpha, lambdau=self.ini_lambdau)
 
-        if self.ini_lambdau is not None:
+        if ini_coef is not None:
+            # coefficients available from the closed-form ridge path
+            pass
+
+        elif self.ini_lambdau is not None:
             # fit initialising net for given hyperparmeters
             ini_coef = ini_net.fit(X, y, penalty_weights=penalise, **kwargs).coef_
 
@@ -326,7 +778,7 @@ class AdaptiveElasticNet(ElasticNet):
             print("Searching suitable init_lambda hyperparameter...")
             if grid is None:
                 grid = self._guess_grid(X, y, logs=None, n_values=25)
-            cv = GridSearchCV(ini_net, grid, cv=split, n_jobs=-1)
+            cv = GridSearchCV(ini_net, grid, cv=split, n_jobs=self.n_jobs)
             cv.fit(X, y, penalty_weights=penalise, **kwargs)
             ini_coef = cv.best_estimator_.coef_
             self.ini_lambdau = cv.best_params_["lambdau"]
@@ -399,3 +851,744 @@ class AdaptiveElasticNet(ElasticNet):
             return fit
         else:
             return self
+
+
+class GramElasticNet(ElasticNet):
+    """Multi-response Elastic Net estimator based on a shared Gram matrix.
+
+    All response variables are regressed on the same block of regressors,
+    so that the Gram matrix X'X is shared across equations. Coefficients are
+    estimated with covariance-update coordinate descent on all responses
+    simultaneously. The objective is the unstandardized elastic net objective
+    of sklearn ElasticNet applied to the stacked system with design kron(I, X),
+    and penalty weights are rescaled as in glmnet. Since the gaussian glmnet
+    routine standardizes the response internally, estimates coincide with
+    ElasticNet fits on the stacked data only for alpha=1 or a stacked response
+    with unit variance.
+
+    Attributes:
+        lambdau: The penalty factor over all penalty terms, default=0.1.
+        alpha: The ratio of L1 penalisation to L2 penalisation, default=0.1.
+        standardize: Not supported, features are used as provided.
+        intercept: Not supported, no intercept is included.
+        threshold: Optimisation convergence threshold, defaut=1e-4.
+        max_iter: Maximum number of iterations, default=1e5.
+
+    Additional attributes:
+        coef_block_: (n_responses, m_features) matrix of coefficients.
+        coef_: The coefficients stacked equation by equation.
+        n_iter_: The number of coordinate sweeps used in the last fit.
+        n_screened_: The number of coefficients discarded by strong-rule
+            screening in the last fit.
+    """
+
+    def _make_penalty_weights(
+        self,
+        penalty_weights: np.ndarray,
+        m_features: int,
+        n_responses: int,
+    ) -> np.ndarray:
+        """Reshape and rescale stacked penalty weights for the block solver.
+
+        As in glmnet, penalty weights are rescaled to sum to the total number
+        of coefficients.
+
+        Args:
+            penalty_weights: Stacked coefficient penalty weights of shape
+                (n_responses*m_features,), default=None.
+            m_features: The number of regressors in each equation.
+            n_responses: The number of response variables.
+
+        Returns:
+            penalty_weights: (m_features, n_responses) array of weights.
+        """
+        if penalty_weights is None:
+            return np.ones([m_features, n_responses])
+        penalty_weights = np.asarray(penalty_weights, dtype="float64").reshape(
+            n_responses, m_features
+        )
+        penalty_weights = penalty_weights * penalty_weights.size / penalty_weights.sum()
+        return penalty_weights.T
+
+    def fit_gram(
+        self,
+        gram: np.ndarray,
+        xty: np.ndarray,
+        n_obs: int,
+        penalty_weights: np.ndarray = None,
+        coef_init: np.ndarray = None,
+        previous_lambdau: float = None,
+    ):
+        """Fits the model parameters to sufficient statistics of the data.
+
+        Args:
+            gram: (m_features, m_features) Gram matrix X'X of the regressors.
+            xty: (m_features, n_responses) cross-products X'Y.
+            n_obs: The number of observations of the stacked system, i.e.
+                t_samples * n_responses.
+            penalty_weights: Stacked coefficient penalty weights, zero if not
+                penalised, of shape (n_responses*m_features,), default=None.
+            coef_init: (n_responses, m_features) coefficients to warm start
+                the estimation, default=None.
+            previous_lambdau: The larger penalty at which coef_init was
+                estimated on the same data, enables strong-rule screening,
+                default=None.
+
+        Returns:
+            self : The fitted GramElasticNet object.
+        """
+        m_features, n_responses = xty.shape
+        penalty_weights = self._make_penalty_weights(
+            penalty_weights, m_features=m_features, n_responses=n_responses
+        )
+        if coef_init is not None:
+            coef_init = np.asarray(coef_init).reshape(n_responses, m_features).T
+
+        # estimate
+        kwargs = dict(
+            gram=gram,
+            xty=xty,
+            n_obs=n_obs,
+            lambdau=self.lambdau,
+            alpha=self.alpha,
+            penalty_weights=penalty_weights,
+            coef=coef_init,
+            threshold=self.threshold,
+            max_iter=self.max_iter,
+        )
+        if coef_init is not None and previous_lambdau is not None:
+            coef, n_iter, n_screened = strong_rule_coordinate_descent(
+                previous_lambdau=previous_lambdau, **kwargs
+            )
+        else:
+            coef, n_iter = gram_coordinate_descent(**kwargs)
+            n_screened = 0
+
+        # store results
+        self.coef_block_ = coef.T
+        self.coef_ = self.coef_block_.ravel()
+        self.df_used_ = np.count_nonzero(coef)
+        self.n_iter_ = n_iter
+        self.n_screened_ = n_screened
+        self.is_fitted_ = True
+        return self
+
+    def fit(
+        self,
+        X: np.ndarray,
+        y: np.ndarray,
+        penalty_weights: np.ndarray = None,
+        coef_init: np.ndarray = None,
+        **kwargs,
+    ):
+        """Fits the model parameters to input data.
+
+        Args:
+            X: The shared regressors of shape (t_samples, m_features).
+            y: The response values of shape (t_samples, n_responses).
+            penalty_weights: Stacked coefficient penalty weights, zero if not
+                penalised, of shape (n_responses*m_features,), default=None.
+            coef_init: (n_responses, m_features) coefficients to warm start
+                the estimation, default=None.
+
+        Returns:
+            self : The fitted GramElasticNet object.
+        """
+        if X.shape[0] != y.shape[0]:
+            raise ValueError("data dimension mismatch")
+        X = np.asarray(X, dtype="float64")
+        y = np.asarray(y, dtype="float64").reshape(X.shape[0], -1)
+
+        self.fit_gram(
+            gram=X.T @ X,
+            xty=X.T @ y,
+            n_obs=y.size,
+            penalty_weights=penalty_weights,
+            coef_init=coef_init,
+        )
+        return self
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Predicts values for all responses given the shared regressors X.
+
+        Args:
+            X: The shared regressors of shape (t_samples, m_features).
+
+        Returns:
+            y: Predicted values of shape (t_samples, n_responses).
+        """
+        X = check_array(X)
+        check_is_fitted(self, "is_fitted_")
+
+        y = X @ self.coef_block_.T
+        return y
+
+
+class AdaptiveGramElasticNet(AdaptiveElasticNet, GramElasticNet):
+    """Adaptive Elastic Net estimator for multiple responses with shared regressors.
+
+    Both estimation stages are performed with the shared Gram matrix solver
+    of GramElasticNet, the first-stage cross-validation uses GramGridSearchCV.
+
+    Attributes:
+        gamma: The exponent used to scale the penalty weights, default=1.
+        init_alpha: The ratio of L1 to L2 penalisation in the first estimation.
+        ini_lambdau: The penalty factor in the first estimation.
+        penalty_weights: Stacked coefficient penalty weights, zero if not
+            penalised, of shape (n_responses*m_features,), default=None.
+
+    Attributes inherited from GramElasticNet:
+        lambdau: The penalty factor over all penalty terms, default=0.1.
+        alpha: The ratio of L1 penalisation to L2 penalisation, default=0.1.
+        threshold: Optimisation convergence threshold, defaut=1e-4.
+        max_iter: Maximum number of iterations, default=1e5.
+    """
+
+    def _count_features(self, X: np.ndarray, y: np.ndarray) -> int:
+        """Returns the number of coefficients in the stacked system."""
+        return X.shape[1] * y.shape[1]
+
+    def _ridge_penalty_weights(
+        self,
+        X: np.ndarray,
+        y: np.ndarray,
+        penalty_weights: np.ndarray = None,
+    ) -> np.ndarray:
+        """Returns first-stage penalty weights of shape (m_features, n_responses)."""
+        return self._make_penalty_weights(
+            penalty_weights, m_features=X.shape[1], n_responses=y.shape[1]
+        )
+
+    def _update_penalty_weights(
+        self,
+        X: np.ndarray,
+        y: np.ndarray,
+        penalty_weights: np.ndarray = None,
+        grid: dict = None,
+        split: int = 5,
+        **kwargs,
+    ) -> None:
+        """Updates the penalty_weights attribute using a first-stage elastic net.
+
+        If lambda is not set explicitly, cross-validation is performed to find it.
+
+        Args:
+            X: The shared regressors of shape (t_samples, m_features).
+            y: The response values of shape (t_samples, n_responses).
+            penalty_weights: Stacked coefficient penalty weights, zero if not
+                penalised, of shape (n_responses*m_features,), default=None.
+            grid: Dictionary with candidate hyperparameter values for alpha
+                and lambdau.
+            split: Number of splits or PredefinedSplit to use for cross-validation.
+        """
+        if penalty_weights is not None:
+            penalise = penalty_weights != 0
+        else:
+            penalise = None
+
+        # closed-form ridge first stage if available
+        ini_coef = self._fit_ridge_first_stage(
+            X, y, penalty_weights=penalise, grid=grid, split=split
+        )
+
+        # initialise first-stage net
+        ini_net = GramElasticNet(
+            alpha=self.ini_alpha,
+            lambdau=self.ini_lambdau,
+            threshold=self.threshold,
+            max_iter=self.max_iter,
+        )
+
+        if ini_coef is not None:
+            # coefficients available from the closed-form ridge path
+            pass
+
+        elif self.ini_lambdau is not None:
+            # fit initialising net for given hyperparmeters
+            ini_coef = ini_net.fit(X, y, penalty_weights=penalise, **kwargs).coef_
+
+        else:
+            # perform cross-validation on initialising net hyperparmeters
+            print("Searching suitable init_lambda hyperparameter...")
+            if grid is None:
+                grid = self._guess_grid(X, y, logs=None, n_values=25)
+            cv = GramGridSearchCV(ini_net, grid, cv=split)
+            cv.fit(X, y, penalty_weights=penalise)
+            ini_coef = cv.best_estimator_.coef_
+            self.ini_lambdau = cv.best_params_["lambdau"]
+
+        # create penalty weights
+        penalty_weights = abs(ini_coef.ravel() + 1 / y.size) ** -self.gamma
+        if penalise is not None:
+            penalty_weights *= penalise
+
+        self.penalty_weights = penalty_weights
+
+    def fit_gram(
+        self,
+        gram: np.ndarray,
+        xty: np.ndarray,
+        n_obs: int,
+        penalty_weights: np.ndarray = None,
+        coef_init: np.ndarray = None,
+        previous_lambdau: float = None,
+    ):
+        """Fits the second-stage model parameters to sufficient statistics.
+
+        The penalty weights have to be available from a previous call to fit.
+
+        Args:
+            gram: (m_features, m_features) Gram matrix X'X of the regressors.
+            xty: (m_features, n_responses) cross-products X'Y.
+            n_obs: The number of observations of the stacked system, i.e.
+                t_samples * n_responses.
+            penalty_weights: Ignored, the penalty_weights attribute is used.
+            coef_init: (n_responses, m_features) coefficients to warm start
+                the estimation, default=None.
+            previous_lambdau: The larger penalty at which coef_init was
+                estimated on the same data, enables strong-rule screening,
+                default=None.
+
+        Returns:
+            self : The fitted AdaptiveGramElasticNet object.
+        """
+        if self.penalty_weights is None:
+            raise ValueError("penalty weights need to be set before fitting")
+        GramElasticNet.fit_gram(
+            self,
+            gram=gram,
+            xty=xty,
+            n_obs=n_obs,
+            penalty_weights=self.penalty_weights,
+            coef_init=coef_init,
+            previous_lambdau=previous_lambdau,
+        )
+        return self
+
+    def fit(
+        self,
+        X: np.ndarray,
+        y: np.ndarray,
+        penalty_weights: np.ndarray = None,
+        force_update: bool = False,
+        ini_grid: dict = None,
+        ini_split: int = 5,
+        coef_init: np.ndarray = None,
+        **kwargs,
+    ):
+        """Fits the model parameters to input data.
+
+        Will perform a two-step estimation, where the first step is
+        cross-validated if penalty weights are not explicitly fixed.
+
+        Args:
+            X: The shared regressors of shape (t_samples, m_features).
+            y: The response values of shape (t_samples, n_responses).
+            penalty_weights: Stacked coefficient penalty weights, zero if not
+                penalised, default=None. Note that passing this parameter only
+                defines which ceofficients are not penalised.
+            force_update: If set True, forces penalty weights to be updated,
+                default=False.
+            ini_grid: Dictionary with candidate hyperparameter values for alpha
+                and lambdau in the initialising estimation.
+            ini_split: Defines cross-validation sample splitting for the
+                initilising estimation.
+            coef_init: (n_responses, m_features) coefficients to warm start
+                the estimation, default=None.
+
+        Returns:
+            self : The fitted AdaptiveGramElasticNet object.
+        """
+        # update penalty weights if not available or user forced
+        if self.penalty_weights is None or force_update:
+            print("Updating penalty_weights...")
+            self._update_penalty_weights(
+                X, y, penalty_weights=penalty_weights, grid=ini_grid, split=ini_split
+            )
+
+        # fit using parent class method with pre-defined penalty weights
+        GramElasticNet.fit(
+            self,
+            X,
+            y,
+            penalty_weights=self.penalty_weights,
+            coef_init=coef_init,
+        )
+        return self
+
+
+def _make_test_fold(n_samples: int, cv) -> np.ndarray:
+    """Create an array of test fold labels for each sample.
+
+    Args:
+        n_samples: The number of samples to be split.
+        cv: Number of contiguous folds, a PredefinedSplit, or an array of fold
+            labels where -1 indicates samples that are never tested.
+
+    Returns:
+        test_fold: (n_samples,) array of fold labels.
+    """
+    if isinstance(cv, int):
+        test_fold = np.empty(n_samples, dtype=int)
+        for i_fold, (_, test) in enumerate(KFold(cv).split(np.empty(n_samples))):
+            test_fold[test] = i_fold
+    elif isinstance(cv, PredefinedSplit):
+        test_fold = cv.test_fold
+    else:
+        test_fold = np.asarray(cv)
+    if len(test_fold) != n_samples:
+        raise ValueError("cross-validation split does not match number of samples")
+    return test_fold
+
+
+class GramGridSearchCV:
+    """Exhaustive cross-validated grid search for GramElasticNet estimators.
+
+    Instead of slicing the data for every fold and grid point, the Gram matrix,
+    cross-products and response sums of squares are computed once for each
+    fold. The statistics of each training set are obtained by subtracting the
+    held-out fold from the full sample totals, and validation losses are
+    evaluated from the statistics of the held-out fold. Along the lambdau
+    dimension, solutions are warm started from the next larger penalty and,
+    if screening is enabled, coefficients are discarded with the sequential
+    strong rule before each fit.
+
+    The results are exposed with the same attributes as sklearn's GridSearchCV.
+
+    Attributes:
+        estimator: The GramElasticNet (or AdaptiveGramElasticNet) to be tuned.
+        param_grid: Hyperparameter grid as dict of iterables.
+        cv: Number of contiguous folds, a PredefinedSplit, or an array of
+            fold labels for each sample.
+        return_train_score: Indicates whether training scores are computed.
+        verbose: Indicates whether progress is printed.
+        screening: Indicates whether strong-rule screening with KKT checks is
+            used along the lambdau path. Screening shortens the coordinate
+            sweeps, mostly at large penalties, but leaves the gradient
+            product of each fit, so that the total cost falls little where
+            sweeps are few, default=False.
+
+    Additional attributes:
+        cv_results_: Dictionary with scores for each candidate, including the
+            mean number of screened coefficients 'mean_n_screened'.
+        best_index_: The index of the best candidate in cv_results_.
+        best_params_: The hyperparameters with the best mean validation score.
+        best_score_: The mean validation score of the best candidate.
+        best_estimator_: The estimator refit on all data with best_params_.
+        n_splits_: The number of cross-validation folds.
+        n_fits_: The number of model fits performed, including the refit.
+    """
+
+    def __init__(
+        self,
+        estimator: GramElasticNet,
+        param_grid: dict,
+        cv=5,
+        return_train_score: bool = True,
+        verbose: int = 0,
+        screening: bool = False,
+    ):
+        """Initiates the GramGridSearchCV object with its settings."""
+        self.estimator = estimator
+        self.param_grid = param_grid
+        self.cv = cv
+        self.return_train_score = return_train_score
+        self.verbose = verbose
+        self.screening = screening
+
+    @staticmethod
+    def _fold_statistics(
+        X: np.ndarray,
+        y: np.ndarray,
+        test_fold: np.ndarray,
+    ) -> tuple:
+        """Compute sufficient statistics per fold and for the full sample.
+
+        Args:
+            X: The shared regressors of shape (t_samples, m_features).
+            y: The response values of shape (t_samples, n_responses).
+            test_fold: (t_samples,) array of fold labels.
+
+        Returns:
+            fold_stats: Dictionary of per-fold arrays 'gram' (k, m, m),
+                'xty' (k, m, n), 'yty' (k, n), and 'n_samples' (k,).
+            total_stats: Dictionary with the same statistics for all samples.
+        """
+        folds = np.unique(test_fold[test_fold >= 0])
+        gram, xty, yty, n_samples = [], [], [], []
+        for fold in folds:
+            X_fold = X[test_fold == fold]
+            y_fold = y[test_fold == fold]
+            gram += [X_fold.T @ X_fold]
+            xty += [X_fold.T @ y_fold]
+            yty += [(y_fold**2).sum(axis=0)]
+            n_samples += [X_fold.shape[0]]
+        fold_stats = {
+            "gram": np.stack(gram),
+            "xty": np.stack(xty),
+            "yty": np.stack(yty),
+            "n_samples": np.array(n_samples),
+        }
+        total_stats = {
+            "gram": X.T @ X,
+            "xty": X.T @ y,
+            "yty": (y**2).sum(axis=0),
+            "n_samples": X.shape[0],
+        }
+        return (fold_stats, total_stats)
+
+    @staticmethod
+    def _score(
+        coef_block: np.ndarray,
+        gram: np.ndarray,
+        xty: np.ndarray,
+        yty: np.ndarray,
+        n_samples: int,
+    ) -> float:
+        """Calculate the negative MSE of coefficients from sufficient statistics.
+
+        Uses ||Y - XB||^2 = tr(Y'Y) - 2 tr(B'X'Y) + tr(B'X'XB).
+
+        Args:
+            coef_block: (n_responses, m_features) matrix of coefficients.
+            gram: (m_features, m_features) Gram matrix of the evaluation sample.
+            xty: (m_features, n_responses) cross-products of the evaluation sample.
+            yty: (n_responses,) response sums of squares of the evaluation sample.
+            n_samples: The number of samples in the evaluation sample.
+
+        Returns:
+            score: The negative mean squared error over all responses.
+        """
+        coef = coef_block.T
+        rss = yty.sum() - 2 * (coef * xty).sum() + (coef * (gram @ coef)).sum()
+        score = -rss / (n_samples * yty.size)
+        return score
+
+    def _candidate_order(self, candidates: list) -> list:
+        """Order candidates so that lambdau decreases within each group.
+
+        Args:
+            candidates: List of hyperparameter dictionaries.
+
+        Returns:
+            order: Indices of candidates in evaluation order.
+        """
+
+        def sort_key(i: int) -> tuple:
+            params = candidates[i]
+            group = tuple(sorted((k, v) for k, v in params.items() if k != "lambdau"))
+            return (group, -params.get("lambdau", 0))
+
+        order = sorted(range(len(candidates)), key=sort_key)
+        return order
+
+    def _same_group(self, params: dict, other: dict) -> bool:
+        """Check if two candidates only differ in lambdau."""
+        keys = set(params) | set(other)
+        return all(params.get(k) == other.get(k) for k in keys if k != "lambdau")
+
+    def fit(
+        self,
+        X: np.ndarray,
+        y: np.ndarray,
+        penalty_weights: np.ndarray = None,
+        coef_init: np.ndarray = None,
+        **kwargs,
+    ):
+        """Run the cross-validated grid search and refit the best candidate.
+
+        Args:
+            X: The shared regressors of shape (t_samples, m_features).
+            y: The response values of shape (t_samples, n_responses).
+            penalty_weights: Stacked coefficient penalty weights, zero if not
+                penalised, of shape (n_responses*m_features,), default=None.
+            coef_init: (n_responses, m_features) coefficients to warm start the
+                largest penalty of each candidate group and the refit,
+                default=None.
+
+        Returns:
+            self: The fitted GramGridSearchCV object.
+        """
+        # setup
+        X = np.asarray(X, dtype="float64")
+        y = np.asarray(y, dtype="float64").reshape(X.shape[0], -1)
+        n_responses = y.shape[1]
+        test_fold = _make_test_fold(n_samples=X.shape[0], cv=self.cv)
+        fold_stats, total_stats = self._fold_statistics(X, y, test_fold)
+        n_splits = len(fold_stats["n_samples"])
+        candidates = list(ParameterGrid(self.param_grid))
+        if self.verbose:
+            print(
+                "Fitting {} folds for each of {} candidates, totalling {} fits".format(
+                    n_splits, len(candidates), n_splits * len(candidates)
+                )
+            )
+
+        # evaluate candidates fold by fold along decreasing penalties
+        test_scores = np.zeros([len(candidates), n_splits])
+        train_scores = np.zeros([len(candidates), n_splits])
+        n_screened = np.zeros([len(candidates), n_splits], dtype=int)
+        order = self._candidate_order(candidates)
+        for i_fold in range(n_splits):
+            train_stats = {
+                key: total_stats[key] - fold_stats[key][i_fold] for key in total_stats
+            }
+            warm_start = None
+            previous = None
+            for i_candidate in order:
+                params = candidates[i_candidate]
+                if previous is None or not self._same_group(params, previous):
+                    warm_start = coef_init
+                    previous_lambdau = None
+                elif self.screening:
+                    previous_lambdau = previous.get("lambdau")
+                estimator = clone(self.estimator).set_params(**params)
+                estimator.fit_gram(
+                    gram=train_stats["gram"],
+                    xty=train_stats["xty"],
+                    n_obs=train_stats["n_samples"] * n_responses,
+                    penalty_weights=penalty_weights,
+                    coef_init=warm_start,
+                    previous_lambdau=previous_lambdau,
+                )
+                n_screened[i_candidate, i_fold] = estimator.n_screened_
+                test_scores[i_candidate, i_fold] = self._score(
+                    estimator.coef_block_,
+                    **{key: fold_stats[key][i_fold] for key in fold_stats},
+                )
+                if self.return_train_score:
+                    train_scores[i_candidate, i_fold] = self._score(
+                        estimator.coef_block_, **train_stats
+                    )
+                warm_start = estimator.coef_block_
+                previous = params
+
+        # collect results
+        self._store_results(candidates, test_scores, train_scores)
+        self.cv_results_["mean_n_screened"] = n_screened.mean(axis=1)
+        self.n_splits_ = n_splits
+        self.n_fits_ = len(candidates) * n_splits + 1
+
+        # refit best candidate on all data
+        self.best_estimator_ = clone(self.estimator).set_params(**self.best_params_)
+        self.best_estimator_.fit_gram(
+            gram=total_stats["gram"],
+            xty=total_stats["xty"],
+            n_obs=total_stats["n_samples"] * n_responses,
+            penalty_weights=penalty_weights,
+            coef_init=coef_init,
+        )
+        return self
+
+    def _store_results(
+        self,
+        candidates: list,
+        test_scores: np.ndarray,
+        train_scores: np.ndarray,
+    ) -> None:
+        """Store cross-validation results in the format of GridSearchCV.
+
+        Args:
+            candidates: List of evaluated hyperparameter dictionaries.
+            test_scores: (n_candidates, n_splits) array of validation scores.
+            train_scores: (n_candidates, n_splits) array of training scores.
+        """
+        cv_results = {"params": candidates}
+        for key in candidates[0]:
+            cv_results[f"param_{key}"] = np.array([c[key] for c in candidates])
+        for name, scores in [("test", test_scores), ("train", train_scores)]:
+            if name == "train" and not self.return_train_score:
+                continue
+            for i_split in range(scores.shape[1]):
+                cv_results[f"split{i_split}_{name}_score"] = scores[:, i_split]
+            cv_results[f"mean_{name}_score"] = scores.mean(axis=1)
+            cv_results[f"std_{name}_score"] = scores.std(axis=1)
+        cv_results["rank_test_score"] = sp.stats.rankdata(
+            -cv_results["mean_test_score"], method="min"
+        ).astype(int)
+
+        self.cv_results_ = cv_results
+        self.best_index_ = int(np.argmax(cv_results["mean_test_score"]))
+        self.best_params_ = candidates[self.best_index_]
+        self.best_score_ = cv_results["mean_test_score"][self.best_index_]
+
+
+def ridge_path_cv(
+    X,
+    y: np.ndarray,
+    lambdaus: np.ndarray,
+    cv=5,
+    penalty_weights: np.ndarray = None,
+) -> tuple:
+    """Cross-validate the ridge penalty with closed-form paths on each fold.
+
+    Sufficient statistics are computed once per fold as in GramGridSearchCV,
+    the full lambdau path of each training set is obtained from ridge_path,
+    and validation losses are evaluated from the held-out fold statistics.
+    Scores equal the negative mean squared errors of GridSearchCV.
+
+    Args:
+        X: The regressors of shape (t_samples, m_features), can be sparse.
+        y: The response values of shape (t_samples,) or (t_samples, n_responses).
+        lambdaus: Sequence of candidate penalty factors.
+        cv: Number of contiguous folds, a PredefinedSplit, or an array of
+            fold labels for each sample.
+        penalty_weights: (m_features, n_responses) coefficient penalty weights,
+            zero if not penalised, default=None.
+
+    Returns:
+        best_lambdau: The penalty with the best mean validation score.
+        coef: (m_features, n_responses) coefficients refit on all data.
+        mean_scores: (n_lambdaus,) mean validation scores.
+    """
+    # fold statistics
+    if not sp.sparse.issparse(X):
+        X = np.asarray(X, dtype="float64")
+    y = np.asarray(y, dtype="float64").reshape(X.shape[0], -1)
+    n_responses = y.shape[1]
+    test_fold = _make_test_fold(n_samples=X.shape[0], cv=cv)
+    folds = np.unique(test_fold[test_fold >= 0])
+    fold_stats = []
+    for fold in folds:
+        X_fold = X[test_fold == fold]
+        y_fold = y[test_fold == fold]
+        fold_stats += [
+            {
+                "gram": X_fold.T @ X_fold,
+                "xty": np.asarray(X_fold.T @ y_fold),
+                "yty": (y_fold**2).sum(axis=0),
+                "n_samples": X_fold.shape[0],
+            }
+        ]
+    total_stats = {
+        "gram": X.T @ X,
+        "xty": np.asarray(X.T @ y),
+        "yty": (y**2).sum(axis=0),
+        "n_samples": X.shape[0],
+    }
+
+    # closed-form paths
+    scores = np.zeros([len(lambdaus), len(folds)])
+    for i_fold, stats in enumerate(fold_stats):
+        train_stats = {key: total_stats[key] - stats[key] for key in total_stats}
+        coefs = ridge_path(
+            gram=train_stats["gram"],
+            xty=train_stats["xty"],
+            n_obs=train_stats["n_samples"] * n_responses,
+            lambdaus=lambdaus,
+            penalty_weights=penalty_weights,
+        )
+        for i_lambdau, coef in enumerate(coefs):
+            scores[i_lambdau, i_fold] = GramGridSearchCV._score(coef.T, **stats)
+
+    # refit
+    mean_scores = scores.mean(axis=1)
+    best_lambdau = lambdaus[int(np.argmax(mean_scores))]
+    coef = ridge_path(
+        gram=total_stats["gram"],
+        xty=total_stats["xty"],
+        n_obs=total_stats["n_samples"] * n_responses,
+        lambdaus=[best_lambdau],
+        penalty_weights=penalty_weights,
+    )[0]
+    return (best_lambdau, coef, mean_scores)
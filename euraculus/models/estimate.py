@@ -7,6 +7,8 @@ from euraculus.data.map import DataMap
 from euraculus.data.preprocess import prepare_log_data, log_replace
 from euraculus.models.var import FactorVAR
 from euraculus.models.covariance import GLASSO
+from euraculus.models.parallel import SharedWorkerPool
+from euraculus.models.search import RefinedGridSearchCV
 from euraculus.network.fevd import FEVD
 from euraculus.utils.utils import (
     matrix_asymmetry,
@@ -128,11 +130,45 @@ def build_lookup_table(df_info: pd.DataFrame) -> pd.DataFrame:
     return df_lookup
 
 
+def _make_cov_search(cov_grid: dict, search: str = "grid", n_jobs: int = -1):
+    """Creates the cross-validation object for the GLASSO covariance estimate.
+
+    Args:
+        cov_grid: Grid with covariance hyperparameters.
+        search: Either 'grid' for an exhaustive search or 'refine' for a
+            coarse-to-fine search over the grid.
+        n_jobs: The number of parallel jobs, None to use the active joblib
+            backend, default=-1.
+
+    Returns:
+        cov_cv: The unfitted search object.
+    """
+    cov_cv = GridSearchCV(
+        GLASSO(max_iter=400),
+        param_grid=cov_grid,
+        cv=12,
+        n_jobs=n_jobs,
+        verbose=1,
+        return_train_score=True,
+    )
+    if search == "refine":
+        cov_cv = RefinedGridSearchCV(cov_cv, cov_grid)
+    elif search != "grid":
+        raise ValueError("search '{}' not available".format(search))
+    return cov_cv
+
+
 def estimate_fevd(
     var_data: pd.DataFrame,
     factor_data: pd.DataFrame,
     var_grid: dict,
     cov_grid: dict,
+    solver: str = "glmnet",
+    search: str = "grid",
+    n_jobs: int = -1,
+    blas_threads: int = 1,
+    cov_init: np.ndarray = None,
+    **kwargs,
 ) -> tuple:
     """Perform all estimation steps necessary to construct FEVD.
 
@@ -141,6 +177,17 @@ def estimate_fevd(
         factor_data: Dataframe with the control factor data.
         var_grid: Grid with VAR hyperparameters.
         cov_grid: Grid with covariance hyperparameters.
+        solver: Solver used for the VAR, either 'glmnet' or 'gram'.
+        search: Either 'grid' for exhaustive searches or 'refine' for
+            coarse-to-fine searches over both grids.
+        n_jobs: The number of worker processes, -1 to use all cores.
+        blas_threads: The maximum number of BLAS threads per worker.
+        cov_init: Initial guess for the GLASSO covariance, e.g. a previous
+            estimate. Series with zero variance in cov_init, such as series
+            entering the sample, start from their residual variance,
+            default=None.
+        kwargs: Warm start arguments for the VAR estimation, e.g. ini_lambdau,
+            adaptive_weights or coef_init.
 
     Returns:
         var_cv: Cross-validation object for VAR.
@@ -158,18 +205,24 @@ def estimate_fevd(
         grid=var_grid,
         return_cv=True,
         penalize_factors=False,
+        solver=solver,
+        search=search,
+        n_jobs=n_jobs,
+        blas_threads=blas_threads,
+        **kwargs,
     )
     residuals = var.residuals(var_data=var_data, factor_data=factor_data)
 
     # estimate covariance
-    cov_cv = GridSearchCV(
-        GLASSO(max_iter=400),
-        param_grid=cov_grid,
-        cv=12,
-        n_jobs=-1,
-        verbose=1,
-        return_train_score=True,
-    ).fit(residuals)
+    fit_params = {}
+    if cov_init is not None:
+        cov_init = np.array(cov_init, dtype=float)
+        new = np.diag(cov_init) == 0
+        cov_init[new, new] = np.asarray(residuals)[:, new].var(axis=0)
+        fit_params["cov_init"] = cov_init
+    with SharedWorkerPool(n_jobs=n_jobs, blas_threads=blas_threads):
+        cov_cv = _make_cov_search(cov_grid, search=search, n_jobs=None)
+        cov_cv.fit(residuals, **fit_params)
     cov = cov_cv.best_estimator_
 
     # create fevd
@@ -178,6 +231,215 @@ def estimate_fevd(
     return (var_cv, var, cov_cv, cov, fevd)
 
 
+def _grid_neighbourhood(grid: dict, best_params: dict, steps: int) -> dict:
+    """Restrict a hyperparameter grid to the neighbourhood of previous optima.
+
+    Args:
+        grid: Hyperparameter grid as dict of iterables.
+        best_params: Previously selected hyperparameter values.
+        steps: Number of grid points to keep on either side of the optimum.
+
+    Returns:
+        local_grid: Grid with at most 2*steps+1 candidates per hyperparameter.
+    """
+    local_grid = {}
+    for key, values in grid.items():
+        values = np.asarray(values)
+        if key not in best_params:
+            local_grid[key] = values
+            continue
+        i_best = np.argmin(abs(values - best_params[key]))
+        local_grid[key] = values[max(i_best - steps, 0) : i_best + steps + 1]
+    return local_grid
+
+
+def _align_block(
+    block: np.ndarray,
+    old_series: pd.Index,
+    new_series: pd.Index,
+    k_factors: int = 0,
+    p_lags: int = 0,
+    fill_value: float = 0.0,
+) -> np.ndarray:
+    """Align a coefficient block or square matrix to a new set of series.
+
+    Rows belong to series, columns consist of k_factors factor columns
+    followed by p_lags blocks of series columns. Entries of series not
+    contained in the old set are filled with fill_value.
+
+    Args:
+        block: (n_old, k_factors + n_old*p_lags) array to align.
+        old_series: Names of the series in block.
+        new_series: Names of the series in the aligned output.
+        k_factors: Number of leading factor columns.
+        p_lags: Number of series column blocks.
+        fill_value: Value for entries of new series.
+
+    Returns:
+        aligned: (n_new, k_factors + n_new*p_lags) array.
+    """
+    n_old, n_new = len(old_series), len(new_series)
+    positions = pd.Index(old_series).get_indexer(new_series)
+    known = positions >= 0
+    rows_old, rows_new = positions[known], np.flatnonzero(known)
+
+    aligned = np.full([n_new, k_factors + n_new * p_lags], fill_value)
+    aligned[rows_new, :k_factors] = block[rows_old, :k_factors]
+    for lag in range(p_lags):
+        aligned[np.ix_(rows_new, k_factors + lag * n_new + rows_new)] = block[
+            np.ix_(rows_old, k_factors + lag * n_old + rows_old)
+        ]
+    return aligned
+
+
+class RollingFEVDEstimator:
+    """Estimates FEVDs on consecutive, overlapping sampling windows.
+
+    Each call to estimate runs estimate_fevd, but uses the previous estimates
+    to warm start the current window: VAR coefficients initialise the
+    coordinate descent and the previous covariance initialises the GLASSO.
+    Warm starts require the 'gram' solver. With 'glmnet', every window starts
+    cold, so that the estimates equal those of estimate_fevd.
+    Optionally, the first-stage penalty is carried over to avoid repeating its
+    cross-validation. Optionally, the hyperparameter grids are restricted
+    to the neighbourhood of the previously selected values. Series are aligned
+    by name, so that assets entering the sample start from zero coefficients.
+
+    Attributes:
+        var_grid: Grid with VAR hyperparameters.
+        cov_grid: Grid with covariance hyperparameters.
+        neighbourhood: Number of grid points around the previous optimum to
+            search, the full grids are searched if None, default=None.
+        reuse_ini_lambdau: Indicates if the first-stage penalty of the previous
+            window is used instead of cross-validating it, which keeps the
+            penalty of the first window for all later windows, default=False.
+        reuse_penalty_weights: Indicates if the adaptive penalty weights of the
+            previous window are reused if the set of series is unchanged,
+            default=False.
+        solver: Solver used for the VAR, either 'gram' or 'glmnet', warm starts
+            of the coefficients and the covariance require 'gram',
+            default='gram'.
+        search: Either 'grid' for exhaustive searches or 'refine' for
+            coarse-to-fine searches over both grids, default='grid'.
+        n_jobs: The number of worker processes, -1 to use all cores.
+        blas_threads: The maximum number of BLAS threads per worker, default=1.
+    """
+
+    def __init__(
+        self,
+        var_grid: dict,
+        cov_grid: dict,
+        neighbourhood: int = None,
+        reuse_ini_lambdau: bool = False,
+        reuse_penalty_weights: bool = False,
+        solver: str = "gram",
+        search: str = "grid",
+        n_jobs: int = -1,
+        blas_threads: int = 1,
+    ):
+        self.var_grid = var_grid
+        self.cov_grid = cov_grid
+        self.neighbourhood = neighbourhood
+        self.reuse_ini_lambdau = reuse_ini_lambdau
+        self.reuse_penalty_weights = reuse_penalty_weights
+        self.solver = solver
+        self.search = search
+        self.n_jobs = n_jobs
+        self.blas_threads = blas_threads
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard the previous estimates, so that the next window starts cold."""
+        self.series_ = None
+        self.var_cv_ = None
+        self.cov_ = None
+        self.n_estimates_ = 0
+
+    @property
+    def is_warm(self) -> bool:
+        """Indicates if previous estimates are available."""
+        return self.series_ is not None
+
+    def _var_warm_start(self, series: pd.Index, k_factors: int, p_lags: int) -> dict:
+        """Collect warm start inputs for the VAR estimation."""
+        if not self.is_warm:
+            return {"var_grid": self.var_grid}
+
+        model = self.var_cv_.best_estimator_
+        warm_start = {"var_grid": self.var_grid}
+        if self.neighbourhood is not None:
+            warm_start["var_grid"] = _grid_neighbourhood(
+                self.var_grid, self.var_cv_.best_params_, self.neighbourhood
+            )
+        if self.reuse_ini_lambdau:
+            warm_start["ini_lambdau"] = model.ini_lambdau
+        if self.reuse_penalty_weights and self.series_.equals(series):
+            warm_start["adaptive_weights"] = model.penalty_weights
+        if self.solver == "gram":
+            warm_start["coef_init"] = _align_block(
+                model.coef_block_,
+                old_series=self.series_,
+                new_series=series,
+                k_factors=k_factors,
+                p_lags=p_lags,
+            )
+        return warm_start
+
+    def _cov_warm_start(self, series: pd.Index) -> dict:
+        """Collect warm start inputs for the covariance estimation."""
+        if not self.is_warm:
+            return {"cov_grid": self.cov_grid}
+
+        grid = self.cov_grid
+        if self.neighbourhood is not None:
+            grid = _grid_neighbourhood(
+                grid, {"alpha": self.cov_.alpha}, self.neighbourhood
+            )
+        warm_start = {"cov_grid": grid}
+        if self.solver == "gram":
+            warm_start["cov_init"] = _align_block(
+                self.cov_.covariance_,
+                old_series=self.series_,
+                new_series=series,
+                p_lags=1,
+            )
+        return warm_start
+
+    def estimate(self, var_data: pd.DataFrame, factor_data: pd.DataFrame) -> tuple:
+        """Perform all estimation steps necessary to construct FEVD.
+
+        Args:
+            var_data: Dataframe with the data panel for the VAR.
+            factor_data: Dataframe with the control factor data.
+
+        Returns:
+            var_cv: Cross-validation object for VAR.
+            var: The estimated VAR object.
+            cov_cv: Cross-validation object for the covariance.
+            cov: The estimated covariance object.
+            fevd: The constructed FEVD from the estimates.
+        """
+        series = pd.Index(var_data.columns)
+        var_cv, var, cov_cv, cov, fevd = estimate_fevd(
+            var_data=var_data,
+            factor_data=factor_data,
+            solver=self.solver,
+            search=self.search,
+            n_jobs=self.n_jobs,
+            blas_threads=self.blas_threads,
+            **self._var_warm_start(series, k_factors=factor_data.shape[1], p_lags=1),
+            **self._cov_warm_start(series),
+        )
+
+        # keep estimates for the next window
+        self.series_ = series
+        self.var_cv_ = var_cv
+        self.cov_ = cov
+        self.n_estimates_ += 1
+
+        return (var_cv, var, cov_cv, cov, fevd)
+
+
 def estimate_sigma(
     ret_data: pd.DataFrame,
     sigma_grid: dict,
@@ -269,6 +531,12 @@ def describe_var(
     """
     ols_var = var.copy()
     ols_var.fit_ols(var_data=var_data, factor_data=factor_data)
+    diagnostics = var.diagnostics(var_data=var_data, factor_data=factor_data)
+    ols_diagnostics = ols_var.diagnostics(var_data=var_data, factor_data=factor_data)
+    partial_r2s = diagnostics.partial_r2s(weighting="equal")
+    component_r2s = diagnostics.component_r2s(weighting="equal")
+    ols_partial_r2s = ols_diagnostics.partial_r2s(weighting="equal")
+    ols_component_r2s = ols_diagnostics.component_r2s(weighting="equal")
 
     stats = {
         "lambda": var_cv.best_params_["lambdau"],
@@ -279,34 +547,16 @@ def describe_var(
         "var_mean_connection": var.var_1_matrix_.mean(),
         "var_mean_abs_connection": abs(var.var_1_matrix_).mean(),
         "var_asymmetry": matrix_asymmetry(M=var.var_1_matrix_),
-        "var_r2": var.r2(var_data=var_data, factor_data=factor_data, weighting="equal"),
-        "var_r2_ols": ols_var.r2(
-            var_data=var_data, factor_data=factor_data, weighting="equal"
-        ),
-        "var_component_r2_factors": var.component_r2s(
-            var_data=var_data, factor_data=factor_data, weighting="equal"
-        )["factors"],
-        "var_component_r2_spillovers": var.component_r2s(
-            var_data=var_data, factor_data=factor_data, weighting="equal"
-        )["var"],
-        "var_component_r2_factors_ols": ols_var.component_r2s(
-            var_data=var_data, factor_data=factor_data, weighting="equal"
-        )["factors"],
-        "var_component_r2_spillovers_ols": ols_var.component_r2s(
-            var_data=var_data, factor_data=factor_data, weighting="equal"
-        )["var"],
-        "var_partial_r2_factors": var.partial_r2s(
-            var_data=var_data, factor_data=factor_data, weighting="equal"
-        )["factors"],
-        "var_partial_r2_spillovers": var.partial_r2s(
-            var_data=var_data, factor_data=factor_data, weighting="equal"
-        )["var"],
-        "var_partial_r2_factors_ols": ols_var.partial_r2s(
-            var_data=var_data, factor_data=factor_data, weighting="equal"
-        )["factors"],
-        "var_partial_r2_spillovers_ols": ols_var.partial_r2s(
-            var_data=var_data, factor_data=factor_data, weighting="equal"
-        )["var"],
+        "var_r2": diagnostics.r2(weighting="equal"),
+        "var_r2_ols": ols_diagnostics.r2(weighting="equal"),
+        "var_component_r2_factors": component_r2s["factors"],
+        "var_component_r2_spillovers": component_r2s["var"],
+        "var_component_r2_factors_ols": ols_component_r2s["factors"],
+        "var_component_r2_spillovers_ols": ols_component_r2s["var"],
+        "var_partial_r2_factors": partial_r2s["factors"],
+        "var_partial_r2_spillovers": partial_r2s["var"],
+        "var_partial_r2_factors_ols": ols_partial_r2s["factors"],
+        "var_partial_r2_spillovers_ols": ols_partial_r2s["var"],
         "var_df_full": var.df_full_,
         "var_df_used": var.df_used_,
         "var_nonzero_shrinkage": shrinkage_factor(
@@ -333,17 +583,7 @@ def describe_var(
         "var_train_loss": -var_cv.cv_results_["mean_train_score"][var_cv.best_index_],
     }
 
-    partial_r2s = var.partial_r2s(
-        var_data=var_data,
-        factor_data=factor_data,
-        weighting="equal",
-    )
     stats.update({"var_partial_r2_" + k: v for (k, v) in partial_r2s.items()})
-    component_r2s = var.component_r2s(
-        var_data=var_data,
-        factor_data=factor_data,
-        weighting="equal",
-    )
     stats.update({"var_component_r2_" + k: v for (k, v) in component_r2s.items()})
 
     return stats
@@ -617,28 +857,21 @@ def collect_var_estimates(
     estimates["var_mean_abs_out"] = (
         abs(var.var_1_matrix_).sum(axis=0) - abs(np.diag(var.var_1_matrix_))
     ) / (var.var_1_matrix_.shape[0] - 1)
-    factor_residuals = var.factor_residuals(var_data=var_data, factor_data=factor_data)
-    estimates["var_factor_residual_variance"] = np.diag(factor_residuals.cov())
-    residuals = var.residuals(var_data=var_data, factor_data=factor_data)
-    estimates["var_residual_variance"] = np.diag(residuals.cov())
+    diagnostics = var.diagnostics(var_data=var_data, factor_data=factor_data)
+    estimates["var_factor_residual_variance"] = np.diag(
+        diagnostics.factor_residuals.cov()
+    )
+    estimates["var_residual_variance"] = np.diag(diagnostics.residuals.cov())
     estimates["var_systematic_variance"] = var.systematic_variances(
         factor_data=factor_data
     )
-    estimates["var_component_r2_factors"] = var.component_r2s(
-        var_data=var_data, factor_data=factor_data, weighting="granular"
-    )["factors"]
-    estimates["var_component_r2_spillovers"] = var.component_r2s(
-        var_data=var_data, factor_data=factor_data, weighting="granular"
-    )["var"]
-    estimates["var_partial_r2_factors"] = var.partial_r2s(
-        var_data=var_data, factor_data=factor_data, weighting="granular"
-    )["factors"]
-    estimates["var_partial_r2_spillovers"] = var.partial_r2s(
-        var_data=var_data, factor_data=factor_data, weighting="granular"
-    )["var"]
-    estimates["var_r2"] = var.r2(
-        var_data=var_data, factor_data=factor_data, weighting="granular"
-    )
+    component_r2s = diagnostics.component_r2s(weighting="granular")
+    estimates["var_component_r2_factors"] = component_r2s["factors"]
+    estimates["var_component_r2_spillovers"] = component_r2s["var"]
+    partial_r2s = diagnostics.partial_r2s(weighting="granular")
+    estimates["var_partial_r2_factors"] = partial_r2s["factors"]
+    estimates["var_partial_r2_spillovers"] = partial_r2s["var"]
+    estimates["var_r2"] = diagnostics.r2(weighting="granular")
     return estimates
 
 
@@ -730,6 +963,7 @@ def collect_fevd_estimates(
     horizon: int,
     data: pd.DataFrame,
     weights: np.ndarray,
+    streaming: bool = False,
 ) -> pd.DataFrame:
     """Extract estimates from a Forecast Error Variance Decomposition network.
 
@@ -740,11 +974,22 @@ def collect_fevd_estimates(
         horizon: Horizon to calculate some estimates with.
         data: Data the estimation is performed on.
         weights: A vector indicating the weights of each node in the aggregate.
+        streaming: Indicates if the connectedness and concentration estimates
+            are streamed from the FEVD without forming the tables, which omits
+            eigenvector centralities and page ranks, default=False.
 
     Returns:
         estimates: Extracted estimates in a DataFrame.
     """
     estimates = pd.DataFrame(index=data.columns)
+    if streaming:
+        streamed = fevd.stream_network_estimates(horizon=horizon, weights=weights)
+        for table_name, table_estimates in streamed.items():
+            network_estimates = pd.DataFrame(table_estimates, index=data.columns)
+            network_estimates = network_estimates.add_prefix(f"{table_name}_")
+            estimates = estimates.join(network_estimates)
+        return estimates
+
     tables = [
         ("fevd", None),
         ("fev", None),
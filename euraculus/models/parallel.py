@@ -0,0 +1,155 @@
+"""This module provides a coordinated worker pool for parallel cross-validation.
+
+Design matrices are written once to memory-mapped files, preferably in shared
+memory, so that the workers of the pool receive file handles instead of
+serialised copies of the data for every task.
+"""
+
+import os
+import shutil
+import tempfile
+
+import joblib
+import numpy as np
+import scipy as sp
+import scipy.sparse
+
+
+def _default_temp_folder() -> str:
+    """Returns the shared memory folder if available, otherwise None."""
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        return "/dev/shm"
+    return None
+
+
+def share_array(array: np.ndarray, folder: str) -> np.ndarray:
+    """Copy an array into a read-only memory-mapped file.
+
+    Args:
+        array: The array to be shared.
+        folder: Directory in which the memory-mapped file is created.
+
+    Returns:
+        shared: Read-only np.memmap with the same content as array.
+    """
+    array = np.asarray(array)
+    handle, filename = tempfile.mkstemp(dir=folder, suffix=".mmap")
+    os.close(handle)
+    shared = np.memmap(filename, dtype=array.dtype, mode="w+", shape=array.shape)
+    shared[...] = array
+    shared.flush()
+    shared = np.memmap(filename, dtype=array.dtype, mode="r", shape=array.shape)
+    return shared
+
+
+def share_data(data, folder: str):
+    """Place dense or sparse data in memory-mapped files.
+
+    Sparse matrices keep their format, with data and index arrays backed by
+    memory-mapped files.
+
+    Args:
+        data: Dense array, sparse matrix, or None.
+        folder: Directory in which the memory-mapped files are created.
+
+    Returns:
+        shared: The data backed by memory-mapped files, None if data is None.
+    """
+    if data is None:
+        return None
+    elif sp.sparse.isspmatrix_csc(data) or sp.sparse.isspmatrix_csr(data):
+        shared = data.__class__(
+            (
+                share_array(data.data, folder),
+                share_array(data.indices, folder),
+                share_array(data.indptr, folder),
+            ),
+            shape=data.shape,
+            copy=False,
+        )
+    elif sp.sparse.issparse(data):
+        shared = share_data(data.tocsc(), folder)
+    else:
+        shared = share_array(data, folder)
+    return shared
+
+
+class SharedWorkerPool:
+    """Single worker pool with shared inputs and limited BLAS threads.
+
+    Within the context, all joblib-based parallel loops that do not set n_jobs
+    explicitly run on one loky process pool with n_jobs workers. Every worker
+    limits BLAS and OpenMP to blas_threads threads, so that the number of
+    busy threads does not exceed the number of cores. Nested loops inside the
+    workers run sequentially. Data passed through share is written to
+    memory-mapped files once and only referenced by the tasks.
+
+    If no parallel loops run within the context, either because the caller
+    disables the pool or because n_jobs amounts to a single job, the context
+    neither starts a backend nor writes any files, and share returns its
+    input unchanged.
+
+    Attributes:
+        n_jobs: The number of worker processes, -1 to use all cores.
+        blas_threads: The maximum number of BLAS threads per worker, default=1.
+        temp_folder: Directory for memory-mapped files, defaults to shared
+            memory if available.
+        enabled: Indicates if parallel loops run within the context,
+            default=True.
+
+    Additional attributes:
+        folder_: The temporary directory holding the shared files, None if
+            the pool is inactive.
+    """
+
+    def __init__(
+        self,
+        n_jobs: int = -1,
+        blas_threads: int = 1,
+        temp_folder: str = None,
+        enabled: bool = True,
+    ):
+        """Initiates the SharedWorkerPool object with its settings."""
+        self.n_jobs = n_jobs
+        self.blas_threads = blas_threads
+        self.temp_folder = temp_folder
+        self.enabled = enabled
+
+    @property
+    def is_active(self) -> bool:
+        """Indicates if the context runs a worker pool with shared inputs."""
+        return self.enabled and joblib.effective_n_jobs(self.n_jobs) > 1
+
+    def __enter__(self):
+        """Creates the shared folder and activates the worker pool."""
+        self.folder_ = None
+        if not self.is_active:
+            return self
+        temp_folder = self.temp_folder or _default_temp_folder()
+        self.folder_ = tempfile.mkdtemp(prefix="euraculus_", dir=temp_folder)
+        self._backend = joblib.parallel_backend(
+            "loky", n_jobs=self.n_jobs, inner_max_num_threads=self.blas_threads
+        )
+        self._backend.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        """Deactivates the worker pool and removes the shared files."""
+        if self.folder_ is None:
+            return
+        self._backend.__exit__(*exc_info)
+        shutil.rmtree(self.folder_, ignore_errors=True)
+
+    def share(self, data):
+        """Place dense or sparse data in shared memory for the workers.
+
+        Args:
+            data: Dense array, sparse matrix, or None.
+
+        Returns:
+            shared: The data backed by memory-mapped files, the unchanged data
+                if the pool is inactive.
+        """
+        if self.folder_ is None:
+            return data
+        return share_data(data, self.folder_)
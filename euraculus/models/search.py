@@ -0,0 +1,184 @@
+"""This module provides coarse-to-fine alternatives to exhaustive grid searches."""
+
+import copy
+import itertools
+
+import numpy as np
+import scipy as sp
+
+
+def count_fits(cv) -> int:
+    """Returns the number of model fits performed by a fitted search object.
+
+    Args:
+        cv: Fitted GridSearchCV, GramGridSearchCV or RefinedGridSearchCV.
+
+    Returns:
+        n_fits: The number of fits, including refits on the full sample.
+    """
+    if hasattr(cv, "n_fits_"):
+        return cv.n_fits_
+    n_fits = len(cv.cv_results_["params"]) * cv.n_splits_
+    if getattr(cv, "refit", False):
+        n_fits += 1
+    return n_fits
+
+
+class RefinedGridSearchCV:
+    """Coarse-to-fine cross-validated search over a hyperparameter grid.
+
+    Instead of evaluating all grid points, a coarse sub-grid containing every
+    initial_stride-th value of each hyperparameter is searched first. The
+    stride is then halved, and only the grid points adjacent to the current
+    optimum are evaluated, until the full grid resolution is reached and the
+    optimum no longer moves. Points are never evaluated twice. For loss
+    surfaces that are smooth and unimodal along the grid, as is the case for
+    the penalty hyperparameters, the optimum coincides with the exhaustive
+    search at a fraction of the fits.
+
+    Each stage is carried out by a copy of a template search object, so that
+    the refinement works with GridSearchCV as well as GramGridSearchCV.
+
+    Attributes:
+        search_cv: Unfitted search object with a param_grid attribute, e.g.
+            GridSearchCV or GramGridSearchCV.
+        param_grid: Hyperparameter grid as dict of sorted iterables.
+        initial_stride: Step between grid points in the coarse stage, default=4.
+        verbose: Indicates whether progress is printed.
+
+    Additional attributes:
+        cv_results_: Dictionary with scores for each evaluated candidate.
+        best_index_: The index of the best candidate in cv_results_.
+        best_params_: The hyperparameters with the best mean validation score.
+        best_score_: The mean validation score of the best candidate.
+        best_estimator_: The estimator refit on all data with best_params_.
+        n_splits_: The number of cross-validation folds.
+        n_stages_: The number of search stages performed.
+        n_fits_: The number of model fits performed, including refits.
+    """
+
+    def __init__(
+        self,
+        search_cv,
+        param_grid: dict,
+        initial_stride: int = 4,
+        verbose: int = 0,
+    ):
+        """Initiates the RefinedGridSearchCV object with its settings."""
+        self.search_cv = search_cv
+        self.param_grid = param_grid
+        self.initial_stride = initial_stride
+        self.verbose = verbose
+
+    def _stage_indices(self, stride: int, center: dict = None) -> dict:
+        """Grid indices of each hyperparameter to consider in a stage.
+
+        Args:
+            stride: Step between grid points.
+            center: Grid indices of the current optimum, None in the first stage.
+
+        Returns:
+            indices: Dictionary of index arrays for each hyperparameter.
+        """
+        indices = {}
+        for key, values in self.param_grid.items():
+            n_values = len(values)
+            if center is None:
+                indices[key] = np.unique(np.r_[0:n_values:stride, n_values - 1])
+            else:
+                steps = center[key] + np.array([-stride, 0, stride])
+                indices[key] = np.unique(steps.clip(0, n_values - 1))
+        return indices
+
+    def _stage_candidates(self, indices: dict, evaluated: set) -> list:
+        """Candidate grid points of a stage that have not been evaluated yet."""
+        keys = list(self.param_grid)
+        points = itertools.product(*[indices[key] for key in keys])
+        candidates = [
+            tuple(int(i) for i in point)
+            for point in points
+            if tuple(int(i) for i in point) not in evaluated
+        ]
+        return candidates
+
+    def _point_params(self, point: tuple) -> dict:
+        """Hyperparameter values of a grid point."""
+        return {
+            key: self.param_grid[key][i] for key, i in zip(self.param_grid, point)
+        }
+
+    def fit(self, X, y=None, **fit_params):
+        """Run the coarse-to-fine search and keep the best candidate.
+
+        Args:
+            X: Input samples passed on to the stage searches.
+            y: Labels passed on to the stage searches, default=None.
+            fit_params: Additional keyword arguments for the stage searches.
+
+        Returns:
+            self: The fitted RefinedGridSearchCV object.
+        """
+        stride = max(int(self.initial_stride), 1)
+        center = None
+        evaluated = set()
+        stages = []
+        best_score = -np.inf
+
+        while True:
+            indices = self._stage_indices(stride=stride, center=center)
+            points = self._stage_candidates(indices, evaluated)
+            improved = False
+            if len(points) > 0:
+                stage = copy.deepcopy(self.search_cv)
+                stage.param_grid = [
+                    {key: [value] for key, value in self._point_params(p).items()}
+                    for p in points
+                ]
+                stage.fit(X, y, **fit_params)
+                evaluated.update(points)
+                stages += [(stage, points)]
+                if stage.best_score_ > best_score:
+                    best_score = stage.best_score_
+                    center = dict(zip(self.param_grid, points[stage.best_index_]))
+                    self.best_estimator_ = stage.best_estimator_
+                    improved = True
+            if self.verbose:
+                print(
+                    "Stage {}: stride {}, {} new candidates".format(
+                        len(stages), stride, len(points)
+                    )
+                )
+            if stride == 1 and not improved:
+                break
+            stride = max(stride // 2, 1)
+
+        self._store_results(stages)
+        return self
+
+    def _store_results(self, stages: list) -> None:
+        """Merge the results of all stages in the format of GridSearchCV.
+
+        Args:
+            stages: List of fitted stage searches and their grid points.
+        """
+        results = [stage.cv_results_ for stage, _ in stages]
+        keys = [k for k in results[0] if all(k in r for r in results)]
+        cv_results = {}
+        for key in keys:
+            if key == "params":
+                cv_results[key] = [p for r in results for p in r[key]]
+            elif key.startswith("param_"):
+                cv_results[key] = np.ma.concatenate([r[key] for r in results])
+            elif key != "rank_test_score":
+                cv_results[key] = np.concatenate([r[key] for r in results])
+        cv_results["rank_test_score"] = sp.stats.rankdata(
+            -cv_results["mean_test_score"], method="min"
+        ).astype(int)
+
+        self.cv_results_ = cv_results
+        self.best_index_ = int(np.argmax(cv_results["mean_test_score"]))
+        self.best_params_ = cv_results["params"][self.best_index_]
+        self.best_score_ = cv_results["mean_test_score"][self.best_index_]
+        self.n_splits_ = stages[0][0].n_splits_
+        self.n_stages_ = len(stages)
+        self.n_fits_ = sum(count_fits(stage) for stage, _ in stages)
@@ -2,14 +2,51 @@
 
 import copy
 
+import joblib
 import numpy as np
 import pandas as pd
 import scipy as sp
 import sklearn
+from scipy.linalg import solve_triangular
 from sklearn.linear_model import LinearRegression
 from sklearn.model_selection import GridSearchCV, PredefinedSplit
 
-from euraculus.models.elastic_net import AdaptiveElasticNet, ElasticNet
+from euraculus.models.elastic_net import (
+    AdaptiveElasticNet,
+    AdaptiveGramElasticNet,
+    ElasticNet,
+    GramElasticNet,
+    GramGridSearchCV,
+)
+from euraculus.models.parallel import SharedWorkerPool
+from euraculus.models.search import RefinedGridSearchCV
+from euraculus.utils.utils import sparsify
+
+
+def _estimate_attribute(name: str) -> property:
+    """Creates a property storing an estimate under its name in __dict__.
+
+    Assigning a new estimate discards the cached prediction coefficients, so
+    that every code path storing estimates keeps predictions consistent.
+
+    Args:
+        name: The attribute name of the stored estimate.
+
+    Returns:
+        attribute: Property reading and writing the instance dictionary.
+    """
+
+    def getter(self):
+        try:
+            return self.__dict__[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def setter(self, value):
+        self.__dict__[name] = value
+        self.__dict__.pop("_prediction_cache_", None)
+
+    return property(getter, setter)
 
 
 class VAR:
@@ -22,13 +59,21 @@ class VAR:
         has_intercepts: Indicates if the VAR model includes a constant vector.
         p_lags: The order of lags in the VAR(p) model.
         is_fitted: Indicates if the VAR model has been fitted to data.
+        density_threshold: The maximum coefficient density for which sparse
+            matrix products are used, default=0.1.
 
     Additional attributes:
         var_matrices_: The VAR coefficient matrices.
         var_1_matrix_: The VAR matrix corresponding to the first lag.
+        sparse_var_matrices_: The VAR coefficient matrices, in CSR format if
+            sufficiently sparse.
         intercepts_: The model intercepts.
     """
 
+    density_threshold = 0.1
+    _intercepts_ = _estimate_attribute("_intercepts_")
+    _var_matrices_ = _estimate_attribute("_var_matrices_")
+
     def __init__(
         self,
         has_intercepts: bool = True,
@@ -68,6 +113,30 @@ class VAR:
         coef_ = np.concatenate([self.intercepts_] + self.var_matrices_, axis=1).ravel()
         return coef_
 
+    @property
+    def _coef_matrix_(self) -> np.ndarray:
+        """The (m_features, n_series) coefficient matrix matching X_block."""
+        blocks = self.var_matrices_
+        if self.has_intercepts:
+            blocks = [self.intercepts_] + blocks
+        return np.concatenate(blocks, axis=1).T
+
+    @property
+    def _prediction_matrix_(self):
+        """The _coef_matrix_ in CSR format if sufficiently sparse.
+
+        The matrix is built once after the estimates are stored and reused by
+        all subsequent predictions.
+        """
+        cache = self.__dict__.get("_prediction_cache_")
+        if cache is None or cache[0] != self.density_threshold:
+            coef_matrix = sparsify(
+                self._coef_matrix_, density_threshold=self.density_threshold
+            )
+            cache = (self.density_threshold, coef_matrix)
+            self._prediction_cache_ = cache
+        return cache[1]
+
     @property
     def n_series_(self) -> int:
         """The number of dependent variables in the fitted VAR model."""
@@ -136,6 +205,18 @@ class VAR:
         sparsity = 1 - self.var_density_
         return sparsity
 
+    @property
+    def sparse_var_matrices_(self) -> list:
+        """List of VAR coefficient matrices in CSR format if sufficiently sparse.
+
+        Matrices with a density above density_threshold remain dense arrays.
+        """
+        sparse_var_matrices = [
+            sparsify(var_matrix, density_threshold=self.density_threshold)
+            for var_matrix in self.var_matrices_
+        ]
+        return sparse_var_matrices
+
     def _build_y(self, var_data: np.ndarray) -> np.ndarray:
         """Create an array of dependent variables reshaped for estimation.
 
@@ -148,6 +229,18 @@ class VAR:
         y = var_data.values[self.p_lags :].reshape(-1, 1, order="F")
         return y
 
+    def _build_Y(self, var_data: np.ndarray) -> np.ndarray:
+        """Create a matrix of dependent variables with one column per equation.
+
+        Args:
+            var_data: (t_periods, n_series) array with observations.
+
+        Returns:
+            Y: (t_periods-p_lags, n_series) array of responses.
+        """
+        Y = np.asarray(var_data)[self.p_lags :]
+        return Y
+
     def _build_X_block(
         self,
         var_data: np.ndarray,
@@ -291,38 +384,98 @@ class VAR:
             var_matrices += [var_matrix]
         return var_matrices
 
+    @staticmethod
+    def _solve_ols_block(X_block: np.ndarray, Y: np.ndarray) -> tuple:
+        """Solves all equations by least squares from one QR decomposition.
+
+        All equations share the regressors X_block, so that the stacked OLS
+        problem separates into the multi-response problem Y = X_block B.
+        Standard errors assume homoskedastic errors within each equation.
+
+        Args:
+            X_block: (t_periods, m_features) array of shared regressors.
+            Y: (t_periods, n_series) array of responses.
+
+        Returns:
+            coef_block: (n_series, m_features) matrix of coefficients.
+            standard_errors: (n_series, m_features) matrix of standard errors.
+        """
+        t_periods, m_features = X_block.shape
+        Q, R = np.linalg.qr(X_block)
+        diag = abs(np.diag(R))
+        if diag.min() <= diag.max() * max(X_block.shape) * np.finfo(float).eps:
+            # rank deficient, use minimum norm solution without standard errors
+            coef = np.linalg.lstsq(X_block, Y, rcond=None)[0]
+            standard_errors = np.full([Y.shape[1], m_features], np.nan)
+            return (coef.T, standard_errors)
+
+        R_inv = solve_triangular(R, np.eye(m_features))
+        coef = R_inv @ (Q.T @ Y)
+        residuals = Y - X_block @ coef
+        dof = t_periods - m_features
+        sigma2 = (residuals**2).sum(axis=0) / dof if dof > 0 else np.nan
+        standard_errors = np.sqrt(np.outer(sigma2, (R_inv**2).sum(axis=1)))
+        return (coef.T, standard_errors)
+
+    @staticmethod
+    def _make_ols_model(coef_: np.ndarray) -> LinearRegression:
+        """Wraps stacked OLS coefficients in a LinearRegression object."""
+        model = LinearRegression(fit_intercept=False)
+        model.coef_ = coef_.reshape(1, -1)
+        model.intercept_ = 0.0
+        return model
+
     def fit_ols(
         self,
         var_data: np.ndarray,
         return_model: bool = False,
-        **kwargs,
+        return_se: bool = False,
     ) -> None:
         """Fits the VAR coefficients using OLS.
 
+        As all equations share the same regressors, the coefficients of all
+        equations are obtained from a single QR decomposition of the block of
+        regressors instead of a fit on the stacked system.
+
         Args:
             var_data: (t_periods, n_series) array with observations.
             return_model: Indicates whether to return the fitted model.
+            return_se: Indicates whether to return standard errors.
 
         Returns:
-            model (optional): The LinearRegression object fitted to the data.
+            model (optional): LinearRegression object with the stacked coefficients.
+            standard_errors (optional): Dictionary with standard errors of the
+                'intercepts' and 'var_matrices'.
         """
         # build inputs
-        X, y = self._build_X_y(var_data=var_data, add_intercepts=self.has_intercepts)
+        var_data = np.asarray(var_data)
         n_series = var_data.shape[1]
+        X_block = self._build_X_block(
+            var_data=var_data, add_intercepts=self.has_intercepts
+        )
+        Y = self._build_Y(var_data=var_data)
 
         # estimate
-        model = LinearRegression(fit_intercept=False, **kwargs)
-        model.fit(X, y)
+        coef_block, se_block = self._solve_ols_block(X_block, Y)
 
         # store coefficient estimates
-        coef_ = model.coef_.ravel()
+        coef_ = coef_block.ravel()
         self._intercepts_ = self._extract_intercepts(coef_=coef_, n_series=n_series)
         self._var_matrices_ = self._extract_var_matrices(coef_=coef_, n_series=n_series)
         self.is_fitted = True
 
         # returns
-        if return_model:
-            return model
+        se_ = se_block.ravel()
+        standard_errors = {
+            "intercepts": self._extract_intercepts(coef_=se_, n_series=n_series),
+            "var_matrices": self._extract_var_matrices(coef_=se_, n_series=n_series),
+        }
+        if return_model and return_se:
+            return (self._make_ols_model(coef_), standard_errors)
+        elif return_model:
+            return self._make_ols_model(coef_)
+        elif return_se:
+            return standard_errors
 
     def _scale_data(
         self,
@@ -461,6 +614,47 @@ class VAR:
         )
         return (X, y, penalty_weights)
 
+    def _build_block_inputs(
+        self,
+        var_data: np.ndarray,
+        penalize_diagonals: bool,
+    ) -> tuple:
+        """Builds the inputs needed to fit a regularized multi-response regression.
+
+        In contrast to _build_inputs, the design is not expanded into the
+        stacked Kronecker form, as all equations share the same regressors.
+
+        Args:
+            var_data: (t_periods, n_series) array with observations.
+            penalize_diagonals: Indicates if diagonal VAR entries are to be penalized.
+
+        Returns:
+            X_block: (t_periods, m_features) array of shared regressors.
+            Y: (t_periods, n_series) array of responses.
+            penalty_weights: Array of ones and zeros to indicate which
+                coefficients should be penalized.
+        """
+        # dimensions
+        n_series = var_data.shape[1]
+
+        # scaled data
+        scaled_var_data = self._scale_data(
+            data=var_data,
+            demean=self.has_intercepts,
+        )
+
+        # regression inputs
+        X_block = self._build_X_block(
+            var_data=scaled_var_data,
+            add_intercepts=False,
+        )
+        Y = self._build_Y(var_data=scaled_var_data)
+        penalty_weights = self._make_penalty_weights(
+            n_series=n_series,
+            penalize_diagonals=penalize_diagonals,
+        )
+        return (X_block, Y, penalty_weights)
+
     def _store_estimates(
         self,
         var_data: np.ndarray,
@@ -498,6 +692,7 @@ class VAR:
         lambdau: float = 0.1,
         penalize_diagonals: bool = True,
         return_model: bool = False,
+        solver: str = "glmnet",
         **kwargs,
     ) -> None:
         """Fits the VAR coefficients using the glmnet routine.
@@ -508,21 +703,36 @@ class VAR:
             lambdau: The penalty factor over all penalty terms, default=0.1.
             penalize_diagonals: Indicates if diagonal VAR entries are to be penalized.
             return_model: Indicates whether to return the fitted model.
+            solver: Either 'glmnet' to fit the stacked system or 'gram' to fit
+                all equations jointly on their shared Gram matrix.
 
         Returns:
             model (optional): The LinearRegression object fitted to the data.
         """
         # build inputs
         n_series = var_data.shape[1]
-        X, y, penalty_weights = self._build_inputs(
-            var_data=var_data,
-            penalize_diagonals=penalize_diagonals,
-        )
+        if solver == "glmnet":
+            X, y, penalty_weights = self._build_inputs(
+                var_data=var_data,
+                penalize_diagonals=penalize_diagonals,
+            )
+            model = ElasticNet(
+                alpha=alpha,
+                lambdau=lambdau,
+                intercept=False,
+                standardize=False,
+                **kwargs,
+            )
+        elif solver == "gram":
+            X, y, penalty_weights = self._build_block_inputs(
+                var_data=var_data,
+                penalize_diagonals=penalize_diagonals,
+            )
+            model = GramElasticNet(alpha=alpha, lambdau=lambdau, **kwargs)
+        else:
+            raise ValueError("solver '{}' not available".format(solver))
 
         # estimate
-        model = ElasticNet(
-            alpha=alpha, lambdau=lambdau, intercept=False, standardize=False, **kwargs
-        )
         model.fit(
             X,
             y,
@@ -602,23 +812,22 @@ class VAR:
         if return_model:
             return model
 
-    def _make_cv_splitter(
+    def _make_cv_folds(
         self,
         var_data: np.ndarray,
         folds: int = 12,
-    ) -> sklearn.model_selection._split.PredefinedSplit:
-        """Creates a PredefinedSplit object for cross validation.
+    ) -> list:
+        """Creates contiguous fold labels for the periods of a single series.
 
         Args:
             var_data: (t_periods, n_series) array with observations.
             folds: The number of folds used for cross-validation.
 
         Returns:
-            splitter: Cross-validation sample splits.
+            single_series_split: (t_periods-p_lags,) list of fold labels.
         """
         # shapes
         t_periods = var_data.shape[0] - self.p_lags
-        n_series = var_data.shape[1]
         length = t_periods // folds
         resid = t_periods % folds
 
@@ -628,12 +837,88 @@ class VAR:
             single_series_split += length * [i]
             if i < resid:
                 single_series_split += [i]
+        return single_series_split
+
+    def _make_cv_splitter(
+        self,
+        var_data: np.ndarray,
+        folds: int = 12,
+        stacked: bool = True,
+    ) -> sklearn.model_selection._split.PredefinedSplit:
+        """Creates a PredefinedSplit object for cross validation.
+
+        Args:
+            var_data: (t_periods, n_series) array with observations.
+            folds: The number of folds used for cross-validation.
+            stacked: Indicates if the split refers to the stacked regression
+                form or to the rows of the shared regressor block.
+
+        Returns:
+            splitter: Cross-validation sample splits.
+        """
+        single_series_split = self._make_cv_folds(var_data=var_data, folds=folds)
 
         # make splitter object
-        split = n_series * single_series_split
+        if stacked:
+            split = var_data.shape[1] * single_series_split
+        else:
+            split = single_series_split
         splitter = PredefinedSplit(split)
         return splitter
 
+    def _make_grid_search(
+        self,
+        estimator: sklearn.base.BaseEstimator,
+        grid: dict,
+        split: sklearn.model_selection._split.PredefinedSplit,
+        solver: str,
+        search: str = "grid",
+        **kwargs,
+    ):
+        """Creates the cross-validation object for the chosen solver.
+
+        The 'glmnet' search leaves the number of jobs to the active joblib
+        backend, such that it runs on the pool of a SharedWorkerPool context.
+
+        Args:
+            estimator: The elastic net estimator to be cross-validated.
+            grid: Hyperparameter grid as dict of iterables.
+            split: Cross-validation sample splits.
+            solver: Either 'glmnet' or 'gram'.
+            search: Either 'grid' for an exhaustive search or 'refine' for a
+                coarse-to-fine search over the grid.
+
+        Returns:
+            cv: The unfitted search object.
+        """
+        if solver == "glmnet":
+            cv = GridSearchCV(
+                estimator,
+                grid,
+                cv=split,
+                n_jobs=None,
+                verbose=1,
+                return_train_score=True,
+                **kwargs,
+            )
+        elif solver == "gram":
+            cv = GramGridSearchCV(
+                estimator,
+                grid,
+                cv=split,
+                verbose=1,
+                return_train_score=True,
+                **kwargs,
+            )
+        else:
+            raise ValueError("solver '{}' not available".format(solver))
+
+        if search == "refine":
+            cv = RefinedGridSearchCV(cv, grid)
+        elif search != "grid":
+            raise ValueError("search '{}' not available".format(search))
+        return cv
+
     def fit_elastic_net_cv(
         self,
         var_data: np.ndarray,
@@ -641,6 +926,10 @@ class VAR:
         folds: int = 12,
         penalize_diagonals: bool = True,
         return_cv: bool = False,
+        solver: str = "glmnet",
+        search: str = "grid",
+        n_jobs: int = -1,
+        blas_threads: int = 1,
         **kwargs,
     ) -> None:
         """Fits the VAR coefficients using adaptive elastic net with cross-validation.
@@ -651,37 +940,50 @@ class VAR:
             folds: The number of folds used for cross-validation.
             penalize_diagonals: Indicates if diagonal VAR entries are to be penalized.
             return_cv: Indicates whether to return the cross-validation object.
+            solver: Either 'glmnet' to cross-validate on the stacked system or
+                'gram' to cross-validate on fold-wise sufficient statistics.
+            search: Either 'grid' for an exhaustive search or 'refine' for a
+                coarse-to-fine search over the grid.
+            n_jobs: The number of worker processes, -1 to use all cores.
+            blas_threads: The maximum number of BLAS threads per worker.
 
         Returns:
             cv (optional): The GridSearchCV object fitted to the data.
         """
         # build inputs
         n_series = var_data.shape[1]
-        X, y, penalty_weights = self._build_inputs(
-            var_data=var_data,
-            penalize_diagonals=penalize_diagonals,
-        )
-
-        # set up CV
-        split = self._make_cv_splitter(var_data=var_data, folds=folds)
-        elnet = ElasticNet(intercept=False, standardize=False)
-
-        # estimate
-        cv = GridSearchCV(
-            elnet,
-            grid,
-            cv=split,
-            n_jobs=-1,
-            verbose=1,
-            return_train_score=True,
-            **kwargs,
-        )
-        cv.fit(
-            X,
-            y,
-            split=split,
-            penalty_weights=penalty_weights,
-        )
+        if solver == "gram":
+            X, y, penalty_weights = self._build_block_inputs(
+                var_data=var_data,
+                penalize_diagonals=penalize_diagonals,
+            )
+            split = self._make_cv_splitter(
+                var_data=var_data, folds=folds, stacked=False
+            )
+            elnet = GramElasticNet()
+        else:
+            X, y, penalty_weights = self._build_inputs(
+                var_data=var_data,
+                penalize_diagonals=penalize_diagonals,
+            )
+            split = self._make_cv_splitter(var_data=var_data, folds=folds)
+            elnet = ElasticNet(intercept=False, standardize=False)
+
+        # estimate, glmnet searches run on one worker pool with shared inputs
+        with SharedWorkerPool(
+            n_jobs=n_jobs, blas_threads=blas_threads, enabled=solver != "gram"
+        ) as pool:
+            X, y = pool.share(X), pool.share(y)
+            penalty_weights = pool.share(penalty_weights)
+            cv = self._make_grid_search(
+                elnet, grid, split, solver=solver, search=search, **kwargs
+            )
+            cv.fit(
+                X,
+                y,
+                split=split,
+                penalty_weights=penalty_weights,
+            )
 
         # store estimates
         model = cv.best_estimator_
@@ -703,6 +1005,13 @@ class VAR:
         folds: int = 12,
         penalize_diagonals: bool = True,
         return_cv: bool = False,
+        solver: str = "glmnet",
+        search: str = "grid",
+        ini_lambdau: float = None,
+        adaptive_weights: np.ndarray = None,
+        coef_init: np.ndarray = None,
+        n_jobs: int = -1,
+        blas_threads: int = 1,
         **kwargs,
     ) -> None:
         """Fits the VAR coefficients using the glmnet routine with cross-validation.
@@ -713,43 +1022,79 @@ class VAR:
             folds: The number of folds used for cross-validation.
             penalize_diagonals: Indicates if diagonal VAR entries are to be penalized.
             return_cv: Indicates whether to return the cross-validation object.
+            solver: Either 'glmnet' to cross-validate on the stacked system or
+                'gram' to cross-validate on fold-wise sufficient statistics.
+            search: Either 'grid' for an exhaustive search or 'refine' for a
+                coarse-to-fine search over the grid.
+            ini_lambdau: Fixed first-stage penalty, e.g. from a previous estimate,
+                skips the first-stage cross-validation if set, default=None.
+            adaptive_weights: Fixed second-stage penalty weights of the stacked
+                coefficients, e.g. from a previous estimate, skips the first
+                stage entirely if set, default=None.
+            coef_init: (n_series, m_features) coefficients of the scaled system
+                to warm start the 'gram' solver, default=None.
+            n_jobs: The number of worker processes, -1 to use all cores.
+            blas_threads: The maximum number of BLAS threads per worker.
 
         Returns:
             cv (optional): The GridSearchCV object fitted to the data.
         """
         # build inputs
         n_series = var_data.shape[1]
-        X, y, penalty_weights = self._build_inputs(
-            var_data=var_data,
-            penalize_diagonals=penalize_diagonals,
-        )
-
-        # set up CV
-        split = self._make_cv_splitter(var_data=var_data, folds=folds)
-        elnet = AdaptiveElasticNet(intercept=False, standardize=False)
-        elnet.fit(
-            X,
-            y,
-            ini_split=split,
-            penalty_weights=penalty_weights,
-        )  # required to update the penalty weights only once
+        if solver == "gram":
+            X, y, penalty_weights = self._build_block_inputs(
+                var_data=var_data,
+                penalize_diagonals=penalize_diagonals,
+            )
+            split = self._make_cv_splitter(
+                var_data=var_data, folds=folds, stacked=False
+            )
+            elnet = AdaptiveGramElasticNet(
+                ini_lambdau=ini_lambdau,
+                penalty_weights=adaptive_weights,
+                n_jobs=None,
+            )
+        else:
+            X, y, penalty_weights = self._build_inputs(
+                var_data=var_data,
+                penalize_diagonals=penalize_diagonals,
+            )
+            split = self._make_cv_splitter(var_data=var_data, folds=folds)
+            elnet = AdaptiveElasticNet(
+                intercept=False,
+                standardize=False,
+                ini_lambdau=ini_lambdau,
+                penalty_weights=adaptive_weights,
+                n_jobs=None,
+            )
 
-        # estimate
-        cv = GridSearchCV(
-            elnet,
-            grid,
-            cv=split,
-            n_jobs=-1,
-            verbose=1,
-            return_train_score=True,
-            **kwargs,
-        )
-        cv.fit(
-            X,
-            y,
-            split=split,
-            penalty_weights=penalty_weights,
-        )
+        # estimate, glmnet searches run on one worker pool with shared inputs
+        with SharedWorkerPool(
+            n_jobs=n_jobs, blas_threads=blas_threads, enabled=solver != "gram"
+        ) as pool:
+            X, y = pool.share(X), pool.share(y)
+            penalty_weights = pool.share(penalty_weights)
+
+            # set up CV
+            elnet.fit(
+                X,
+                y,
+                ini_split=split,
+                penalty_weights=penalty_weights,
+                coef_init=coef_init,
+            )  # required to update the penalty weights only once
+
+            # estimate
+            cv = self._make_grid_search(
+                elnet, grid, split, solver=solver, search=search, **kwargs
+            )
+            cv.fit(
+                X,
+                y,
+                split=split,
+                penalty_weights=penalty_weights,
+                coef_init=coef_init,
+            )
 
         # store estimates
         model = cv.best_estimator_
@@ -794,41 +1139,86 @@ class VAR:
         else:
             raise Exception("Fit method not implemented.")
 
-    def predict(self, var_data: np.ndarray, **kwargs) -> pd.DataFrame:
-        """Calculate fitted values for the fitted model and input data.
+    def _predict_array(
+        self,
+        var_data: np.ndarray,
+        out: np.ndarray = None,
+        **kwargs,
+    ) -> np.ndarray:
+        """Calculate fitted values as an array from the single equation design.
 
         Args:
             var_data: (t_periods, n_series) array with observations.
+            out: Optional (t_periods-p_lags, n_series) array to write into.
 
         Returns:
-            y_pred: (t_periods-p_lags, n_series) dataframe with fitted values.
+            y_pred: (t_periods-p_lags, n_series) array with fitted values.
         """
-        # setup
-        t_periods = var_data.shape[0] - self.p_lags
-        n_series = var_data.shape[1]
-        X = self._build_X(
-            var_data=var_data, add_intercepts=self.has_intercepts, **kwargs
+        kwargs = {k: v if v is None else np.asarray(v) for (k, v) in kwargs.items()}
+        X_block = self._build_X_block(
+            var_data=np.asarray(var_data),
+            add_intercepts=self.has_intercepts,
+            **kwargs,
         )
+        coef_matrix = self._prediction_matrix_
+        if sp.sparse.issparse(coef_matrix):
+            y_pred = (coef_matrix.T @ X_block.T).T
+            if out is not None:
+                out[...] = y_pred
+                y_pred = out
+        else:
+            y_pred = np.matmul(X_block, coef_matrix, out=out)
+        return y_pred
+
+    def predict(
+        self,
+        var_data: np.ndarray,
+        out: np.ndarray = None,
+        **kwargs,
+    ) -> pd.DataFrame:
+        """Calculate fitted values for the fitted model and input data.
+
+        Args:
+            var_data: (t_periods, n_series) array with observations.
+            out: Optional (t_periods-p_lags, n_series) array to write the
+                fitted values into.
 
-        # make predictions
-        y_pred = (X @ self._coef_).reshape(t_periods, n_series, order="F")
+        Returns:
+            y_pred: (t_periods-p_lags, n_series) dataframe with fitted values,
+                an array if var_data is an array.
+        """
+        y_pred = self._predict_array(var_data=var_data, out=out, **kwargs)
         if type(var_data) == pd.DataFrame:
             y_pred = pd.DataFrame(
                 y_pred, index=var_data.index[self.p_lags :], columns=var_data.columns
             )
         return y_pred
 
-    def residuals(self, var_data: np.ndarray, **kwargs) -> pd.DataFrame:
+    def residuals(
+        self,
+        var_data: np.ndarray,
+        out: np.ndarray = None,
+        **kwargs,
+    ) -> pd.DataFrame:
         """Calculate prediction residuals for the fitted model and input data.
 
         Args:
             var_data: (t_periods, n_series) array with observations.
+            out: Optional (t_periods-p_lags, n_series) array to write the
+                residuals into.
 
         Returns:
-            residuals: (t_periods-p_lags, n_series) dataframe with residuals.
+            residuals: (t_periods-p_lags, n_series) dataframe with residuals,
+                an array if var_data is an array.
         """
-        y_pred = self.predict(var_data=var_data, **kwargs)
-        residuals = var_data[self.p_lags :] - y_pred
+        y_pred = self._predict_array(var_data=var_data, out=out, **kwargs)
+        residuals = np.subtract(self._build_Y(var_data), y_pred, out=y_pred)
+        if type(var_data) == pd.DataFrame:
+            residuals = pd.DataFrame(
+                residuals,
+                index=var_data.index[self.p_lags :],
+                columns=var_data.columns,
+            )
         return residuals
 
     def r2(
@@ -847,14 +1237,39 @@ class VAR:
         Returns:
             r2: The goodness of fit statistic for the input data and the model.
         """
-        levels = var_data[self.p_lags :].mean().values
-        tss = np.nansum((var_data[self.p_lags :] - levels) ** 2, axis=0)
-        rss = np.nansum(self.residuals(var_data, **kwargs) ** 2, axis=0)
+        observations = self._build_Y(var_data)
+        levels = np.nanmean(observations, axis=0)
+        tss = np.nansum((observations - levels) ** 2, axis=0)
+        residuals = self._predict_array(var_data=var_data, **kwargs)
+        np.subtract(observations, residuals, out=residuals)
+        rss = np.nansum(residuals**2, axis=0)
+        r2 = self._weigh_r2(rss=rss, tss=tss, weighting=weighting, weights=levels)
+        return r2
+
+    @staticmethod
+    def _weigh_r2(
+        rss: np.ndarray,
+        tss: np.ndarray,
+        weighting: str,
+        weights: np.ndarray,
+    ):
+        """Aggregate series-wise sums of squares into a goodness of fit statistic.
+
+        Args:
+            rss: (n_series,) array with residual sums of squares.
+            tss: (n_series,) array with reference sums of squares.
+            weighting: Indicates how to weigh dependent variables. Available
+                options are ["equal", "variance", "granular"].
+            weights: (n_series,) array used to scale the series with the
+                "variance" weighting.
+
+        Returns:
+            r2: The goodness of fit statistic, an array for "granular" weighting.
+        """
         if weighting == "equal":
             r2 = 1 - rss.sum() / tss.sum()
         elif weighting == "variance":
-            variances = var_data[self.p_lags :].mean().values
-            r2 = 1 - (rss / variances).sum() / (tss / variances).sum()
+            r2 = 1 - (rss / weights).sum() / (tss / weights).sum()
         elif weighting == "granular":
             r2 = 1 - rss / tss
         else:
@@ -884,6 +1299,8 @@ class FactorVAR(VAR):
         intercepts_: The model intercepts.
         factor_loadings_: The model factor loadings.
         k_factors_: The number of factors in the model.
+        penalty_weights_: The stacked coefficient penalty weights of the last
+            penalised fit, None after OLS estimation.
     """
 
     def __init__(
@@ -894,6 +1311,14 @@ class FactorVAR(VAR):
         """Initiates the VAR object with descriptive attributes."""
         VAR.__init__(self, has_intercepts=has_intercepts, p_lags=p_lags)
 
+    _factor_loadings_ = _estimate_attribute("_factor_loadings_")
+
+    def __getstate__(self) -> dict:
+        """Returns the state for pickling without memoized diagnostics."""
+        state = self.__dict__.copy()
+        state.pop("_diagnostics_cache_", None)
+        return state
+
     @property
     def factor_loadings_(self) -> np.ndarray:
         """Matrix with factor loadings."""
@@ -909,6 +1334,14 @@ class FactorVAR(VAR):
         ).ravel()
         return coef_
 
+    @property
+    def _coef_matrix_(self) -> np.ndarray:
+        """The (m_features, n_series) coefficient matrix matching X_block."""
+        blocks = [self.factor_loadings_] + self.var_matrices_
+        if self.has_intercepts:
+            blocks = [self.intercepts_] + blocks
+        return np.concatenate(blocks, axis=1).T
+
     @property
     def k_factors_(self) -> int:
         """The number of common factors in the fitted FactorVAR model."""
@@ -1169,33 +1602,42 @@ class FactorVAR(VAR):
         var_data: np.ndarray,
         factor_data: np.ndarray = None,
         return_model: bool = False,
-        **kwargs,
+        return_se: bool = False,
     ) -> None:
         """Fits the VAR coefficients using OLS.
 
+        As all equations share the same regressors, the coefficients of all
+        equations are obtained from a single QR decomposition of the block of
+        regressors instead of a fit on the stacked system.
+
         Args:
             var_data: (t_periods, n_series) array with observations.
             factor_data: (t_periods, k_factors) array with factor observations.
             return_model: Indicates whether to return the fitted model.
+            return_se: Indicates whether to return standard errors.
 
         Returns:
-            model (optional): The LinearRegression object fitted to the data.
+            model (optional): LinearRegression object with the stacked coefficients.
+            standard_errors (optional): Dictionary with standard errors of the
+                'intercepts', 'factor_loadings' and 'var_matrices'.
         """
         # build inputs
+        var_data = np.asarray(var_data)
+        factor_data = np.asarray(factor_data)
         n_series = var_data.shape[1]
         k_factors = factor_data.shape[1]
-        X, y = self._build_X_y(
+        X_block = self._build_X_block(
             var_data=var_data,
             factor_data=factor_data,
             add_intercepts=self.has_intercepts,
         )
+        Y = self._build_Y(var_data=var_data)
 
         # estimate
-        model = LinearRegression(fit_intercept=False, **kwargs)
-        model.fit(X, y)
+        coef_block, se_block = self._solve_ols_block(X_block, Y)
 
         # store coefficient estimates
-        coef_ = model.coef_.ravel()
+        coef_ = coef_block.ravel()
         self._intercepts_ = self._extract_intercepts(
             coef_=coef_, n_series=n_series, k_factors=k_factors
         )
@@ -1205,11 +1647,28 @@ class FactorVAR(VAR):
         self._var_matrices_ = self._extract_var_matrices(
             coef_=coef_, n_series=n_series, k_factors=k_factors
         )
+        self.penalty_weights_ = None
         self.is_fitted = True
 
         # returns
-        if return_model:
-            return model
+        se_ = se_block.ravel()
+        standard_errors = {
+            "intercepts": self._extract_intercepts(
+                coef_=se_, n_series=n_series, k_factors=k_factors
+            ),
+            "factor_loadings": self._extract_factor_loadings(
+                coef_=se_, n_series=n_series, k_factors=k_factors
+            ),
+            "var_matrices": self._extract_var_matrices(
+                coef_=se_, n_series=n_series, k_factors=k_factors
+            ),
+        }
+        if return_model and return_se:
+            return (self._make_ols_model(coef_), standard_errors)
+        elif return_model:
+            return self._make_ols_model(coef_)
+        elif return_se:
+            return standard_errors
 
     def _scale_coefs(
         self,
@@ -1362,30 +1821,91 @@ class FactorVAR(VAR):
         )
         return (X, y, penalty_weights)
 
-    def _store_estimates(
+    def _build_block_inputs(
         self,
         var_data: np.ndarray,
         factor_data: np.ndarray,
-        n_series: int,
-        k_factors: int,
-        model: sklearn.base.BaseEstimator,
-    ) -> None:
-        """Stores the regression coefficients in the FactorVAR object.
+        penalize_diagonals: bool,
+        penalize_factors: bool,
+    ) -> tuple:
+        """Builds the inputs needed to fit a regularized multi-response regression.
+
+        In contrast to _build_inputs, the design is not expanded into the
+        stacked Kronecker form, as all equations share the same regressors.
 
         Args:
             var_data: (t_periods, n_series) array with observations.
             factor_data: (t_periods, k_factors) array with factor observations.
-            n_series: The number of dependent variables when fitting.
-            k_factors: The number of factors when fitting.
-            model: The fitted model which hold a 'coef_' vector.
+            penalize_diagonals: Indicates if diagonal VAR entries are to be penalized.
+            penalize_factors: Indicates if factor loadings are to be penalized.
+
+        Returns:
+            X_block: (t_periods, m_features) array of shared regressors.
+            Y: (t_periods, n_series) array of responses.
+            penalty_weights: Array of ones and zeros to indicate which
+                coefficients should be penalized.
         """
-        coef_ = self._scale_coefs(
-            model=model,
-            var_data=var_data,
-            factor_data=factor_data,
+        # dimensions
+        n_series = var_data.shape[1]
+        k_factors = factor_data.shape[1]
+
+        # scaled data
+        scaled_var_data = self._scale_data(
+            data=var_data,
+            demean=self.has_intercepts,
         )
-        self._intercepts_ = self._extract_intercepts(
-            coef_=coef_, n_series=n_series, k_factors=k_factors
+        scaled_factor_data = self._scale_data(
+            data=factor_data,
+            demean=self.has_intercepts,
+        )
+
+        # regression inputs
+        X_block = self._build_X_block(
+            var_data=scaled_var_data,
+            factor_data=scaled_factor_data,
+            add_intercepts=False,
+        )
+        Y = self._build_Y(var_data=scaled_var_data)
+        penalty_weights = self._make_penalty_weights(
+            n_series=n_series,
+            k_factors=k_factors,
+            penalize_diagonals=penalize_diagonals,
+            penalize_factors=penalize_factors,
+        )
+        return (X_block, Y, penalty_weights)
+
+    def _store_estimates(
+        self,
+        var_data: np.ndarray,
+        factor_data: np.ndarray,
+        n_series: int,
+        k_factors: int,
+        model: sklearn.base.BaseEstimator,
+        penalty_weights: np.ndarray = None,
+    ) -> None:
+        """Stores the regression coefficients in the FactorVAR object.
+
+        Args:
+            var_data: (t_periods, n_series) array with observations.
+            factor_data: (t_periods, k_factors) array with factor observations.
+            n_series: The number of dependent variables when fitting.
+            k_factors: The number of factors when fitting.
+            model: The fitted model which hold a 'coef_' vector.
+            penalty_weights: Stacked coefficient penalty weights of the fit,
+                replaced by the adaptive weights of adaptive models.
+        """
+        if getattr(model, "penalty_weights", None) is not None:
+            penalty_weights = model.penalty_weights
+        if penalty_weights is not None:
+            penalty_weights = np.array(penalty_weights, dtype="float64").ravel()
+        self.penalty_weights_ = penalty_weights
+        coef_ = self._scale_coefs(
+            model=model,
+            var_data=var_data,
+            factor_data=factor_data,
+        )
+        self._intercepts_ = self._extract_intercepts(
+            coef_=coef_, n_series=n_series, k_factors=k_factors
         )
         self._factor_loadings_ = self._extract_factor_loadings(
             coef_=coef_, n_series=n_series, k_factors=k_factors
@@ -1403,6 +1923,7 @@ class FactorVAR(VAR):
         penalize_diagonals: bool = True,
         penalize_factors: bool = True,
         return_model: bool = False,
+        solver: str = "glmnet",
         **kwargs,
     ) -> None:
         """Fits the VAR coefficients using the glmnet routine.
@@ -1415,6 +1936,8 @@ class FactorVAR(VAR):
             penalize_diagonals: Indicates if diagonal VAR entries are to be penalized.
             penalize_factors: Indicates if factor loadings are to be penalized.
             return_model: Indicates whether to return the fitted model.
+            solver: Either 'glmnet' to fit the stacked system or 'gram' to fit
+                all equations jointly on their shared Gram matrix.
 
         Returns:
             model (optional): The LinearRegression object fitted to the data.
@@ -1422,21 +1945,32 @@ class FactorVAR(VAR):
         # build inputs
         n_series = var_data.shape[1]
         k_factors = factor_data.shape[1]
-        X, y, penalty_weights = self._build_inputs(
-            var_data=var_data,
-            factor_data=factor_data,
-            penalize_diagonals=penalize_diagonals,
-            penalize_factors=penalize_factors,
-        )
+        if solver == "glmnet":
+            X, y, penalty_weights = self._build_inputs(
+                var_data=var_data,
+                factor_data=factor_data,
+                penalize_diagonals=penalize_diagonals,
+                penalize_factors=penalize_factors,
+            )
+            model = ElasticNet(
+                alpha=alpha,
+                lambdau=lambdau,
+                intercept=False,
+                standardize=False,
+                **kwargs,
+            )
+        elif solver == "gram":
+            X, y, penalty_weights = self._build_block_inputs(
+                var_data=var_data,
+                factor_data=factor_data,
+                penalize_diagonals=penalize_diagonals,
+                penalize_factors=penalize_factors,
+            )
+            model = GramElasticNet(alpha=alpha, lambdau=lambdau, **kwargs)
+        else:
+            raise ValueError("solver '{}' not available".format(solver))
 
         # estimate
-        model = ElasticNet(
-            alpha=alpha,
-            lambdau=lambdau,
-            intercept=False,
-            standardize=False,
-            **kwargs,
-        )
         model.fit(
             X,
             y,
@@ -1444,7 +1978,9 @@ class FactorVAR(VAR):
         )
 
         # store estimates
-        self._store_estimates(var_data, factor_data, n_series, k_factors, model)
+        self._store_estimates(
+            var_data, factor_data, n_series, k_factors, model, penalty_weights
+        )
         self.is_fitted = True
 
         # returns
@@ -1508,7 +2044,9 @@ class FactorVAR(VAR):
         )
 
         # store estimates
-        self._store_estimates(var_data, factor_data, n_series, k_factors, model)
+        self._store_estimates(
+            var_data, factor_data, n_series, k_factors, model, penalty_weights
+        )
         self.is_fitted = True
 
         # returns
@@ -1524,6 +2062,10 @@ class FactorVAR(VAR):
         penalize_diagonals: bool = True,
         penalize_factors: bool = True,
         return_cv: bool = False,
+        solver: str = "glmnet",
+        search: str = "grid",
+        n_jobs: int = -1,
+        blas_threads: int = 1,
         **kwargs,
     ) -> None:
         """Fits the VAR coefficients using elastic net with cross-validation.
@@ -1536,6 +2078,12 @@ class FactorVAR(VAR):
             penalize_diagonals: Indicates if diagonal VAR entries are to be penalized.
             penalize_factors: Indicates if factor loadings are to be penalized.
             return_cv: Indicates whether to return the cross-validation object.
+            solver: Either 'glmnet' to cross-validate on the stacked system or
+                'gram' to cross-validate on fold-wise sufficient statistics.
+            search: Either 'grid' for an exhaustive search or 'refine' for a
+                coarse-to-fine search over the grid.
+            n_jobs: The number of worker processes, -1 to use all cores.
+            blas_threads: The maximum number of BLAS threads per worker.
 
         Returns:
             cv (optional): The GridSearchCV object fitted to the data.
@@ -1543,37 +2091,48 @@ class FactorVAR(VAR):
         # build inputs
         n_series = var_data.shape[1]
         k_factors = factor_data.shape[1]
-        X, y, penalty_weights = self._build_inputs(
-            var_data=var_data,
-            factor_data=factor_data,
-            penalize_diagonals=penalize_diagonals,
-            penalize_factors=penalize_factors,
-        )
-
-        # set up CV
-        split = self._make_cv_splitter(var_data=var_data, folds=folds)
-        elnet = ElasticNet(intercept=False, standardize=False)
-
-        # estimate
-        cv = GridSearchCV(
-            elnet,
-            grid,
-            cv=split,
-            n_jobs=-1,
-            verbose=1,
-            return_train_score=True,
-            **kwargs,
-        )
-        cv.fit(
-            X,
-            y,
-            split=split,
-            penalty_weights=penalty_weights,
-        )
+        if solver == "gram":
+            X, y, penalty_weights = self._build_block_inputs(
+                var_data=var_data,
+                factor_data=factor_data,
+                penalize_diagonals=penalize_diagonals,
+                penalize_factors=penalize_factors,
+            )
+            split = self._make_cv_splitter(
+                var_data=var_data, folds=folds, stacked=False
+            )
+            elnet = GramElasticNet()
+        else:
+            X, y, penalty_weights = self._build_inputs(
+                var_data=var_data,
+                factor_data=factor_data,
+                penalize_diagonals=penalize_diagonals,
+                penalize_factors=penalize_factors,
+            )
+            split = self._make_cv_splitter(var_data=var_data, folds=folds)
+            elnet = ElasticNet(intercept=False, standardize=False)
+
+        # estimate, glmnet searches run on one worker pool with shared inputs
+        with SharedWorkerPool(
+            n_jobs=n_jobs, blas_threads=blas_threads, enabled=solver != "gram"
+        ) as pool:
+            X, y = pool.share(X), pool.share(y)
+            penalty_weights = pool.share(penalty_weights)
+            cv = self._make_grid_search(
+                elnet, grid, split, solver=solver, search=search, **kwargs
+            )
+            cv.fit(
+                X,
+                y,
+                split=split,
+                penalty_weights=penalty_weights,
+            )
 
         # store estimates
         model = cv.best_estimator_
-        self._store_estimates(var_data, factor_data, n_series, k_factors, model)
+        self._store_estimates(
+            var_data, factor_data, n_series, k_factors, model, penalty_weights
+        )
         self.is_fitted = True
 
         # returns
@@ -1589,6 +2148,13 @@ class FactorVAR(VAR):
         penalize_diagonals: bool = True,
         penalize_factors: bool = True,
         return_cv: bool = False,
+        solver: str = "glmnet",
+        search: str = "grid",
+        ini_lambdau: float = None,
+        adaptive_weights: np.ndarray = None,
+        coef_init: np.ndarray = None,
+        n_jobs: int = -1,
+        blas_threads: int = 1,
         **kwargs,
     ) -> None:
         """Fits the VAR coefficients using adaptive elastic net with cross-validation.
@@ -1601,6 +2167,19 @@ class FactorVAR(VAR):
             penalize_diagonals: Indicates if diagonal VAR entries are to be penalized.
             penalize_factors: Indicates if factor loadings are to be penalized.
             return_cv: Indicates whether to return the cross-validation object.
+            solver: Either 'glmnet' to cross-validate on the stacked system or
+                'gram' to cross-validate on fold-wise sufficient statistics.
+            search: Either 'grid' for an exhaustive search or 'refine' for a
+                coarse-to-fine search over the grid.
+            ini_lambdau: Fixed first-stage penalty, e.g. from a previous estimate,
+                skips the first-stage cross-validation if set, default=None.
+            adaptive_weights: Fixed second-stage penalty weights of the stacked
+                coefficients, e.g. from a previous estimate, skips the first
+                stage entirely if set, default=None.
+            coef_init: (n_series, m_features) coefficients of the scaled system
+                to warm start the 'gram' solver, default=None.
+            n_jobs: The number of worker processes, -1 to use all cores.
+            blas_threads: The maximum number of BLAS threads per worker.
 
         Returns:
             cv (optional): The GridSearchCV object fitted to the data.
@@ -1608,84 +2187,149 @@ class FactorVAR(VAR):
         # build inputs
         n_series = var_data.shape[1]
         k_factors = factor_data.shape[1]
-        X, y, penalty_weights = self._build_inputs(
-            var_data=var_data,
-            factor_data=factor_data,
-            penalize_diagonals=penalize_diagonals,
-            penalize_factors=penalize_factors,
-        )
-
-        # set up CV
-        split = self._make_cv_splitter(var_data=var_data, folds=folds)
-        elnet = AdaptiveElasticNet(intercept=False, standardize=False)
-        elnet.fit(
-            X,
-            y,
-            ini_split=split,
-            penalty_weights=penalty_weights,
-        )  # required to update the penalty weights only once
+        if solver == "gram":
+            X, y, penalty_weights = self._build_block_inputs(
+                var_data=var_data,
+                factor_data=factor_data,
+                penalize_diagonals=penalize_diagonals,
+                penalize_factors=penalize_factors,
+            )
+            split = self._make_cv_splitter(
+                var_data=var_data, folds=folds, stacked=False
+            )
+            elnet = AdaptiveGramElasticNet(
+                ini_lambdau=ini_lambdau,
+                penalty_weights=adaptive_weights,
+                n_jobs=None,
+            )
+        else:
+            X, y, penalty_weights = self._build_inputs(
+                var_data=var_data,
+                factor_data=factor_data,
+                penalize_diagonals=penalize_diagonals,
+                penalize_factors=penalize_factors,
+            )
+            split = self._make_cv_splitter(var_data=var_data, folds=folds)
+            elnet = AdaptiveElasticNet(
+                intercept=False,
+                standardize=False,
+                ini_lambdau=ini_lambdau,
+                penalty_weights=adaptive_weights,
+                n_jobs=None,
+            )
 
-        # estimate
-        cv = GridSearchCV(
-            elnet,
-            grid,
-            cv=split,
-            n_jobs=-1,
-            verbose=1,
-            return_train_score=True,
-            **kwargs,
-        )
-        cv.fit(
-            X,
-            y,
-            split=split,
-            penalty_weights=penalty_weights,
-        )
+        # estimate, glmnet searches run on one worker pool with shared inputs
+        with SharedWorkerPool(
+            n_jobs=n_jobs, blas_threads=blas_threads, enabled=solver != "gram"
+        ) as pool:
+            X, y = pool.share(X), pool.share(y)
+            penalty_weights = pool.share(penalty_weights)
+
+            # set up CV
+            elnet.fit(
+                X,
+                y,
+                ini_split=split,
+                penalty_weights=penalty_weights,
+                coef_init=coef_init,
+            )  # required to update the penalty weights only once
+
+            # estimate
+            cv = self._make_grid_search(
+                elnet, grid, split, solver=solver, search=search, **kwargs
+            )
+            cv.fit(
+                X,
+                y,
+                split=split,
+                penalty_weights=penalty_weights,
+                coef_init=coef_init,
+            )
 
         # store estimates
         model = cv.best_estimator_
-        self._store_estimates(var_data, factor_data, n_series, k_factors, model)
+        self._store_estimates(
+            var_data, factor_data, n_series, k_factors, model, penalty_weights
+        )
         self.is_fitted = True
 
         # returns
         if return_cv:
             return cv
 
+    def _factor_predict_array(
+        self,
+        factor_data: np.ndarray,
+        out: np.ndarray = None,
+    ) -> np.ndarray:
+        """Calculate fitted values of the pure factor model as an array.
+
+        Args:
+            factor_data: (t_periods, k_factors) array with factor observations.
+            out: Optional (t_periods-p_lags, n_series) array to write into.
+
+        Returns:
+            factor_predictions: (t_periods-p_lags, n_series) array.
+        """
+        factor_predictions = np.matmul(
+            np.asarray(factor_data)[self.p_lags :], self.factor_loadings_.T, out=out
+        )
+        if self.has_intercepts:
+            factor_predictions += self.intercepts_.T
+        return factor_predictions
+
     def factor_predict(
         self,
         factor_data: np.ndarray = None,
+        out: np.ndarray = None,
     ):
         """Calculate fitted values from the fitted factor loadings and input data.
 
         Args:
             factor_data: (t_periods, k_factors) array with factor observations.
+            out: Optional (t_periods-p_lags, n_series) array to write the
+                fitted values into.
 
         Returns:
-            factor_predictions: (t_periods, n_series) dataframe with fitted values.
+            factor_predictions: (t_periods, n_series) dataframe with fitted values,
+                an array if factor_data is an array.
         """
-        factor_predictions = factor_data[self.p_lags :] @ self.factor_loadings_.T
-        if self.has_intercepts:
-            factor_predictions += self.intercepts_.T
+        factor_predictions = self._factor_predict_array(
+            factor_data=factor_data, out=out
+        )
+        if type(factor_data) == pd.DataFrame:
+            factor_predictions = pd.DataFrame(
+                factor_predictions, index=factor_data.index[self.p_lags :]
+            )
         return factor_predictions
 
     def factor_residuals(
         self,
         var_data: np.ndarray = None,
         factor_data: np.ndarray = None,
+        out: np.ndarray = None,
     ):
         """Calculate prediction residuals from the fitted factor loadings and input data.
 
         Args:
             var_data: (t_periods, n_series) array with observations.
             factor_data: (t_periods, k_factors) array with factor observations.
+            out: Optional (t_periods-p_lags, n_series) array to write the
+                residuals into.
 
         Returns:
-            residuals: (t_periods, n_series) dataframe with factor residuals.
+            residuals: (t_periods, n_series) dataframe with factor residuals,
+                an array if var_data is an array.
         """
-        factor_predictions = self.factor_predict(factor_data=factor_data)
+        factor_predictions = self._factor_predict_array(
+            factor_data=factor_data, out=out
+        )
+        residuals = np.subtract(
+            self._build_Y(var_data), factor_predictions, out=factor_predictions
+        )
         if type(var_data) == pd.DataFrame:
             residuals = pd.DataFrame(
-                var_data[self.p_lags :].values - factor_predictions.values,
+                residuals,
                 index=var_data[self.p_lags :].index,
                 columns=var_data.columns,
             )
@@ -1706,81 +2350,132 @@ class FactorVAR(VAR):
         systematic_variances = self.factor_loadings_**2 @ factor_data.cov().values
         return systematic_variances
 
-    def partial_r2s(
+    def component_predictions(
         self,
         var_data: np.ndarray,
         factor_data: np.ndarray,
-        weighting: str = "equal",
     ) -> dict:
-        """Calculate partial goodness of fit for each factor, all factors, and the VAR.
+        """Decompose the fitted values into the contributions of model components.
+
+        The fitted values of the full model are the sum of the returned
+        contributions, so that the fitted values of any restricted model that
+        sets blocks of coefficients to zero follow by summation without
+        rebuilding the design.
 
         Args:
             var_data: (t_periods, n_series) array with observations.
             factor_data: (t_periods, k_factors) array with factor observations.
-            weighting: Indicates how to weigh dependent variables. Available
-                options are ["equal", "variance", "granular"].
 
         Returns:
-            partial_r2s: The partial goodness of fit statistics.
+            components: Dictionary with (t_periods-p_lags, n_series) arrays of
+                contributions with keys "intercepts", "factors", and "var".
+                "factors" holds a (k_factors, t_periods-p_lags, n_series)
+                array with the contribution of each factor.
         """
-
-        # full model
-        residuals = self.residuals(var_data=var_data, factor_data=factor_data)
-        ss_full = np.nansum((residuals - residuals.mean()) ** 2, axis=0)
-
-        # single factor restricted models
-        ss_partial = []
-        for i_factor in range(factor_data.shape[1]):
-            restricted_model = self.copy()
-            restricted_model._factor_loadings_[:, i_factor] = 0
-            residuals = restricted_model.residuals(
-                var_data=var_data, factor_data=factor_data
-            )
-            ss_partial += [np.nansum((residuals - residuals.mean()) ** 2, axis=0)]
-
-        # no factors model
-        restricted_model = self.copy()
-        restricted_model._factor_loadings_[:] = 0
-        residuals = restricted_model.residuals(
-            var_data=var_data, factor_data=factor_data
+        # setup
+        var_data = np.asarray(var_data)
+        factor_data = np.asarray(factor_data)
+        X_block = self._build_X_block(
+            var_data=var_data,
+            factor_data=factor_data,
+            add_intercepts=self.has_intercepts,
         )
-        ss_partial += [np.nansum((residuals - residuals.mean()) ** 2, axis=0)]
+        t_periods, n_series = X_block.shape[0], var_data.shape[1]
+        first_lag = int(self.has_intercepts) + self.k_factors_
 
-        # no var model
-        restricted_model = self.copy()
-        restricted_model._var_matrices_ = [
-            np.zeros(m.shape) for m in restricted_model._var_matrices_
-        ]
-        residuals = restricted_model.residuals(
-            var_data=var_data, factor_data=factor_data
+        # contributions
+        if self.has_intercepts:
+            intercepts = np.broadcast_to(self.intercepts_.T, (t_periods, n_series))
+        else:
+            intercepts = np.zeros((t_periods, n_series))
+        factors = np.einsum(
+            "tk, ik -> kti", factor_data[self.p_lags :], self.factor_loadings_
         )
-        ss_partial += [np.nansum((residuals - residuals.mean()) ** 2, axis=0)]
+        var = X_block[:, first_lag:] @ np.concatenate(self.var_matrices_, axis=1).T
 
-        # calculate partial r2
-        partial_r2s = []
-        if weighting == "equal":
-            for ss_restricted in ss_partial:
-                partial_r2s += [1 - ss_full.sum() / ss_restricted.sum()]
-        elif weighting == "variance":
-            for ss_restricted in ss_partial:
-                variances = var_data[self.p_lags :].mean().values
-                partial_r2s += [
-                    1 - (ss_full / variances).sum() / (ss_restricted / variances).sum()
-                ]
-        elif weighting == "granular":
-            for ss_restricted in ss_partial:
-                partial_r2s += [1 - ss_full / ss_restricted]
-        else:
-            raise ValueError("weighting method '{}' not available".format(weighting))
+        components = {"intercepts": intercepts, "factors": factors, "var": var}
+        return components
+
+    @staticmethod
+    def _demeaned_sum_of_squares(residuals: np.ndarray) -> np.ndarray:
+        """Series-wise sums of squared deviations from the mean ignoring NaNs."""
+        return np.nansum((residuals - np.nanmean(residuals, axis=0)) ** 2, axis=0)
 
-        # create output
+    def _r2_keys(self, factor_data: np.ndarray) -> list:
+        """Output labels for each factor, all factors, and the VAR."""
         if type(factor_data) == pd.DataFrame:
             keys = factor_data.columns.tolist()
         else:
             keys = [f"factor_{i}" for i in range(factor_data.shape[1])]
         keys += ["factors", "var"]
-        partial_r2s = {k: v for (k, v) in zip(keys, partial_r2s)}
-        return partial_r2s
+        return keys
+
+    def _coef_snapshot(self) -> np.ndarray:
+        """Copy of all coefficients to detect changes of the fitted model."""
+        blocks = [self.factor_loadings_] + self.var_matrices_
+        if self.has_intercepts:
+            blocks = [self.intercepts_] + blocks
+        return np.concatenate(blocks, axis=1)
+
+    def diagnostics(
+        self,
+        var_data: np.ndarray,
+        factor_data: np.ndarray,
+    ) -> "VARDiagnostics":
+        """Goodness of fit diagnostics of the fitted model on the input data.
+
+        The diagnostics are memoized for the most recent data. The cache is
+        keyed on a hash of the data content, so that it is invalidated when
+        other data are passed, when the data are modified in place, or when
+        the coefficients change, e.g. because the model is refit. The cache
+        is not pickled with the model.
+
+        Args:
+            var_data: (t_periods, n_series) array with observations.
+            factor_data: (t_periods, k_factors) array with factor observations.
+
+        Returns:
+            diagnostics: The VARDiagnostics of the model on the input data.
+        """
+        coef_snapshot = self._coef_snapshot()
+        data_hash = joblib.hash((var_data, factor_data))
+        cache = getattr(self, "_diagnostics_cache_", None)
+        if (
+            cache is not None
+            and cache["data_hash"] == data_hash
+            and np.array_equal(cache["coef"], coef_snapshot)
+        ):
+            return cache["diagnostics"]
+
+        diagnostics = VARDiagnostics(
+            var=self, var_data=var_data, factor_data=factor_data
+        )
+        self._diagnostics_cache_ = {
+            "data_hash": data_hash,
+            "coef": coef_snapshot,
+            "diagnostics": diagnostics,
+        }
+        return diagnostics
+
+    def partial_r2s(
+        self,
+        var_data: np.ndarray,
+        factor_data: np.ndarray,
+        weighting: str = "equal",
+    ) -> dict:
+        """Calculate partial goodness of fit for each factor, all factors, and the VAR.
+
+        Args:
+            var_data: (t_periods, n_series) array with observations.
+            factor_data: (t_periods, k_factors) array with factor observations.
+            weighting: Indicates how to weigh dependent variables. Available
+                options are ["equal", "variance", "granular"].
+
+        Returns:
+            partial_r2s: The partial goodness of fit statistics.
+        """
+        diagnostics = self.diagnostics(var_data=var_data, factor_data=factor_data)
+        return diagnostics.partial_r2s(weighting=weighting)
 
     def component_r2s(
         self,
@@ -1797,72 +2492,656 @@ class FactorVAR(VAR):
                 options are ["equal", "variance", "granular"].
 
         Returns:
-            partial_r2s: The partial goodness of fit statistics.
+            component_r2s: The component goodness of fit statistics.
         """
+        diagnostics = self.diagnostics(var_data=var_data, factor_data=factor_data)
+        return diagnostics.component_r2s(weighting=weighting)
 
-        # total variation
-        levels = var_data[self.p_lags :].mean().values
-        tss = np.nansum(
-            (var_data[self.p_lags :] - levels) ** 2,
-            axis=0,
-        )
-
-        # single factor models
-        ss_component = []
-        for i_factor in range(factor_data.shape[1]):
-            component_model = self.copy()
-            component_model._factor_loadings_[:] = 0
-            component_model._var_matrices_ = [
-                np.zeros(m.shape) for m in component_model._var_matrices_
-            ]
-            component_model._factor_loadings_[:, i_factor] = self._factor_loadings_[
-                :, i_factor
-            ]
-            residuals = component_model.residuals(
-                var_data=var_data, factor_data=factor_data
-            )
-            ss_component += [np.nansum((residuals - residuals.mean()) ** 2, axis=0)]
 
-        # pure factor model
-        component_model = self.copy()
-        component_model._var_matrices_ = [
-            np.zeros(m.shape) for m in component_model._var_matrices_
-        ]
-        residuals = component_model.residuals(
+class VARDiagnostics:
+    """Goodness of fit diagnostics of a fitted FactorVAR on a data sample.
+
+    All residuals and sums of squares are calculated once from the component
+    contributions of the fitted values, so that the goodness of fit statistics
+    for every weighting are served without evaluating the model again.
+    Restricted models set the coefficients of single factors, all factors, or
+    the VAR to zero, component models only keep the intercepts and one of
+    these components.
+
+    Attributes:
+        residuals: (t_periods-p_lags, n_series) residuals of the full model.
+        factor_residuals: (t_periods-p_lags, n_series) residuals of the pure
+            factor model.
+        levels: (n_series,) array with the sample means of the observations.
+        tss: (n_series,) array with total sums of squares.
+        rss: (n_series,) array with residual sums of squares.
+        ss_full: (n_series,) array with sums of squared deviations of the
+            residuals.
+        ss_partial: List of (n_series,) arrays with sums of squared deviations
+            of the restricted model residuals.
+        ss_component: List of (n_series,) arrays with sums of squared
+            deviations of the component model residuals.
+        keys: Labels of the factors, all factors, and the VAR.
+    """
+
+    def __init__(
+        self,
+        var: FactorVAR,
+        var_data: np.ndarray,
+        factor_data: np.ndarray,
+    ):
+        """Calculates the residuals and sums of squares of all model variants.
+
+        Args:
+            var: The fitted FactorVAR to be evaluated.
+            var_data: (t_periods, n_series) array with observations.
+            factor_data: (t_periods, k_factors) array with factor observations.
+        """
+        # component contributions
+        components = var.component_predictions(
             var_data=var_data, factor_data=factor_data
         )
-        ss_component += [np.nansum((residuals - residuals.mean()) ** 2, axis=0)]
+        observations = np.asarray(var_data)[var.p_lags :]
+        deviations = observations - components["intercepts"]
+        all_factors = components["factors"].sum(axis=0)
+        factor_residuals = deviations - all_factors
+        residuals = factor_residuals - components["var"]
 
-        # pure var model
-        component_model = self.copy()
-        component_model._factor_loadings_[:] = 0
-        residuals = component_model.residuals(
-            var_data=var_data, factor_data=factor_data
+        # full model
+        self.levels = np.nanmean(observations, axis=0)
+        self.tss = np.nansum((observations - self.levels) ** 2, axis=0)
+        self.rss = np.nansum(residuals**2, axis=0)
+        self.ss_full = var._demeaned_sum_of_squares(residuals)
+
+        # restricted models add back the contributions of omitted components
+        omitted = list(components["factors"]) + [all_factors, components["var"]]
+        self.ss_partial = [
+            var._demeaned_sum_of_squares(residuals + contribution)
+            for contribution in omitted
+        ]
+
+        # component models only include the intercepts and a single component
+        self.ss_component = [
+            var._demeaned_sum_of_squares(deviations - contribution)
+            for contribution in omitted
+        ]
+
+        # outputs
+        if type(var_data) == pd.DataFrame:
+            residuals = pd.DataFrame(
+                residuals, index=var_data.index[var.p_lags :], columns=var_data.columns
+            )
+            factor_residuals = pd.DataFrame(
+                factor_residuals,
+                index=var_data.index[var.p_lags :],
+                columns=var_data.columns,
+            )
+        self.residuals = residuals
+        self.factor_residuals = factor_residuals
+        self.keys = var._r2_keys(factor_data)
+
+    def r2(self, weighting: str = "equal"):
+        """Goodness of fit of the full model.
+
+        Args:
+            weighting: Indicates how to weigh dependent variables. Available
+                options are ["equal", "variance", "granular"].
+
+        Returns:
+            r2: The goodness of fit statistic.
+        """
+        return VAR._weigh_r2(
+            rss=self.rss, tss=self.tss, weighting=weighting, weights=self.levels
         )
-        ss_component += [np.nansum((residuals - residuals.mean()) ** 2, axis=0)]
 
-        # calculate partial r2
-        component_r2s = []
-        if weighting == "equal":
-            for ss_restricted in ss_component:
-                component_r2s += [1 - ss_restricted.sum() / tss.sum()]
-        elif weighting == "variance":
-            for ss_restricted in ss_component:
-                variances = var_data[self.p_lags :].mean().values
-                component_r2s += [
-                    1 - (ss_restricted / variances).sum() / (tss / variances).sum()
-                ]
-        elif weighting == "granular":
-            for ss_restricted in ss_component:
-                component_r2s += [1 - ss_restricted / tss]
+    def partial_r2s(self, weighting: str = "equal") -> dict:
+        """Partial goodness of fit for each factor, all factors, and the VAR.
+
+        Args:
+            weighting: Indicates how to weigh dependent variables. Available
+                options are ["equal", "variance", "granular"].
+
+        Returns:
+            partial_r2s: The partial goodness of fit statistics.
+        """
+        partial_r2s = [
+            VAR._weigh_r2(
+                rss=self.ss_full,
+                tss=ss_restricted,
+                weighting=weighting,
+                weights=self.levels,
+            )
+            for ss_restricted in self.ss_partial
+        ]
+        partial_r2s = {k: v for (k, v) in zip(self.keys, partial_r2s)}
+        return partial_r2s
+
+    def component_r2s(self, weighting: str = "equal") -> dict:
+        """Goodness of fit for each factor, all factors, and the VAR.
+
+        Args:
+            weighting: Indicates how to weigh dependent variables. Available
+                options are ["equal", "variance", "granular"].
+
+        Returns:
+            component_r2s: The component goodness of fit statistics.
+        """
+        component_r2s = [
+            VAR._weigh_r2(
+                rss=ss_component,
+                tss=self.tss,
+                weighting=weighting,
+                weights=self.levels,
+            )
+            for ss_component in self.ss_component
+        ]
+        component_r2s = {k: v for (k, v) in zip(self.keys, component_r2s)}
+        return component_r2s
+
+
+class OnlineFactorVAR(FactorVAR):
+    """FactorVAR re-estimated on a rolling window from sufficient statistics.
+
+    The window's cross-products of the design including a constant, X'X and
+    X'Y, are maintained as observations enter and the oldest observations
+    leave the window. Each update changes the statistics at O(m_features²)
+    cost per observation and re-solves either OLS or an elastic net with
+    fixed hyperparameters, which is warm-started from the previous solution.
+    The elastic net operates on statistics standardised like the inputs of
+    FactorVAR.fit_elastic_net, i.e. with the window moments of each series,
+    such that both estimate the same problem for the same penalty. The window
+    itself is never rebuilt into a design matrix.
+
+    Attributes:
+        has_intercepts: Indicates if the VAR model includes a constant vector.
+        p_lags: The order of lags in the VAR(p) model.
+        method: Either 'OLS' or 'ElasticNet', default='OLS'.
+        alpha: The ratio of L1 penalisation to L2 penalisation, default=0.1.
+        lambdau: The penalty factor over all penalty terms, default=0.1.
+        penalty_weights: Stacked coefficient penalty weights of shape
+            (n_series*m_features,) without intercepts, e.g. the adaptive
+            weights of a cross-validated fit, default=None.
+        threshold: Optimisation convergence threshold, default=1e-4.
+        recompute_every: The number of updates after which the statistics are
+            recomputed from the window to purge rounding errors, default=250.
+
+    Additional attributes:
+        window_var_: (t_periods, n_series) array with the window observations.
+        window_factors_: (t_periods, k_factors) array with window factors.
+        gram_: Cross-products of the design including a constant.
+        xty_: Cross-products of the design including a constant and responses.
+        yty_: (n_series,) sums of squared responses.
+        series_sums_: (n_series+k_factors,) sums of the window observations.
+        series_squares_: (n_series+k_factors,) sums of squared window
+            observations.
+        n_updates_: The number of updates since the statistics were computed.
+    """
+
+    def __init__(
+        self,
+        has_intercepts: bool = True,
+        p_lags: int = 1,
+        method: str = "OLS",
+        alpha: float = 0.1,
+        lambdau: float = 0.1,
+        penalty_weights: np.ndarray = None,
+        threshold: float = 1e-4,
+        recompute_every: int = 250,
+    ):
+        """Initiates the OnlineFactorVAR object with its settings."""
+        FactorVAR.__init__(self, has_intercepts=has_intercepts, p_lags=p_lags)
+        if method not in ["OLS", "ElasticNet"]:
+            raise ValueError("method '{}' not available".format(method))
+        self.method = method
+        self.alpha = alpha
+        self.lambdau = lambdau
+        self.penalty_weights = penalty_weights
+        self.threshold = threshold
+        self.recompute_every = recompute_every
+
+    @property
+    def n_obs_(self) -> int:
+        """The number of regression observations in the window."""
+        return int(self.gram_[0, 0])
+
+    def _design_rows(self, var_data: np.ndarray, factor_data: np.ndarray) -> tuple:
+        """Regressors including a constant and responses of consecutive rows."""
+        Z = self._build_X_block(
+            var_data=var_data, factor_data=factor_data, add_intercepts=True
+        )
+        Y = self._build_Y(var_data)
+        return (Z, Y)
+
+    def _compute_statistics(self) -> None:
+        """Compute the sufficient statistics from the window observations."""
+        Z, Y = self._design_rows(self.window_var_, self.window_factors_)
+        self.gram_ = Z.T @ Z
+        self.xty_ = Z.T @ Y
+        self.yty_ = (Y**2).sum(axis=0)
+        series = np.concatenate([self.window_var_, self.window_factors_], axis=1)
+        self.series_sums_ = series.sum(axis=0)
+        self.series_squares_ = (series**2).sum(axis=0)
+        self.n_updates_ = 0
+
+    def _solve_ols(self) -> np.ndarray:
+        """Solve the normal equations, returns (n_series, m_features) coefficients."""
+        keep = slice(0, None) if self.has_intercepts else slice(1, None)
+        gram, xty = self.gram_[keep, keep], self.xty_[keep]
+        try:
+            coef_block = sp.linalg.cho_solve(sp.linalg.cho_factor(gram), xty)
+        except np.linalg.LinAlgError:
+            coef_block = np.linalg.lstsq(gram, xty, rcond=None)[0]
+        return coef_block.T
+
+    def _series_moments(self) -> tuple:
+        """Window means and standard deviations of the series and factors."""
+        t_periods = self.window_var_.shape[0]
+        levels = self.series_sums_ / t_periods
+        scales = np.sqrt(
+            (self.series_squares_ - t_periods * levels**2) / (t_periods - 1)
+        )
+        return (levels, scales)
+
+    def _solve_elastic_net(self) -> np.ndarray:
+        """Fit the elastic net on the standardised statistics.
+
+        As in FactorVAR._build_block_inputs, the series and factors are
+        scaled with their window moments before the design is built, and the
+        coefficients are rescaled as in FactorVAR._scale_coefs.
+
+        Returns:
+            coef_block: (n_series, m_features) coefficients on the original scale.
+        """
+        # series moments
+        n_series = self.window_var_.shape[1]
+        levels, scales = self._series_moments()
+        y_levels, y_scales = levels[:n_series], scales[:n_series]
+        x_levels = np.concatenate([levels[n_series:], np.tile(y_levels, self.p_lags)])
+        x_scales = np.concatenate([scales[n_series:], np.tile(y_scales, self.p_lags)])
+
+        # scaled variables are x / scale + shift
+        x_shifts, y_shifts = -x_levels / x_scales, -y_levels / y_scales
+        if not self.has_intercepts:
+            x_shifts, y_shifts = x_shifts + x_levels, y_shifts + y_levels
+
+        # standardised statistics
+        n_obs = self.gram_[0, 0]
+        x_sums = self.gram_[0, 1:] / x_scales
+        gram = (
+            self.gram_[1:, 1:] / np.outer(x_scales, x_scales)
+            + np.outer(x_sums, x_shifts)
+            + np.outer(x_shifts, x_sums)
+            + n_obs * np.outer(x_shifts, x_shifts)
+        )
+        xty = (
+            self.xty_[1:] / np.outer(x_scales, y_scales)
+            + np.outer(x_sums, y_shifts)
+            + np.outer(x_shifts, self.xty_[0] / y_scales)
+            + n_obs * np.outer(x_shifts, y_shifts)
+        )
+
+        # warm-started estimate
+        net = GramElasticNet(
+            alpha=self.alpha, lambdau=self.lambdau, threshold=self.threshold
+        )
+        net.fit_gram(
+            gram=gram,
+            xty=xty,
+            n_obs=int(n_obs) * xty.shape[1],
+            penalty_weights=self.penalty_weights,
+            coef_init=getattr(self, "_scaled_coef_block_", None),
+        )
+        self._scaled_coef_block_ = net.coef_block_
+
+        # original scale with moments of the design as in FactorVAR._scale_coefs
+        design_levels = self.gram_[0, 1:] / n_obs
+        design_scales = np.sqrt(np.diag(self.gram_)[1:] / n_obs - design_levels**2)
+        coef_block = net.coef_block_ * y_scales[:, None] / design_scales[None, :]
+        if self.has_intercepts:
+            intercepts = y_levels - coef_block @ design_levels
+            coef_block = np.concatenate([intercepts[:, None], coef_block], axis=1)
+        return coef_block
+
+    def _solve(self) -> None:
+        """Re-estimate the coefficients from the current statistics."""
+        if self.method == "OLS":
+            coef_block = self._solve_ols()
         else:
-            raise ValueError("weighting method '{}' not available".format(weighting))
+            coef_block = self._solve_elastic_net()
 
-        # create output
-        if type(factor_data) == pd.DataFrame:
-            keys = factor_data.columns.tolist()
+        coef_ = coef_block.ravel()
+        n_series = self.window_var_.shape[1]
+        k_factors = self.window_factors_.shape[1]
+        self._intercepts_ = self._extract_intercepts(
+            coef_=coef_, n_series=n_series, k_factors=k_factors
+        )
+        self._factor_loadings_ = self._extract_factor_loadings(
+            coef_=coef_, n_series=n_series, k_factors=k_factors
+        )
+        self._var_matrices_ = self._extract_var_matrices(
+            coef_=coef_, n_series=n_series, k_factors=k_factors
+        )
+        self.is_fitted = True
+
+    def fit_window(self, var_data: np.ndarray, factor_data: np.ndarray) -> None:
+        """Compute the statistics of an initial window and fit the model.
+
+        Args:
+            var_data: (t_periods, n_series) array with observations.
+            factor_data: (t_periods, k_factors) array with factor observations.
+        """
+        if not factor_data.shape[0] == var_data.shape[0]:
+            raise ValueError("number of observations unequal")
+        self.window_var_ = np.array(var_data, dtype="float64")
+        self.window_factors_ = np.array(factor_data, dtype="float64")
+        self._scaled_coef_block_ = None
+        self._compute_statistics()
+        self._solve()
+
+    def update(self, var_data: np.ndarray, factor_data: np.ndarray) -> None:
+        """Slide the window forward by new observations and re-fit the model.
+
+        The window length is kept constant, such that as many of the oldest
+        observations leave the window as new observations enter.
+
+        Args:
+            var_data: (k_periods, n_series) array with new observations.
+            factor_data: (k_periods, k_factors) array with new factor observations.
+        """
+        if not hasattr(self, "window_var_"):
+            raise ValueError("Model is not fitted, call fit_window first")
+        var_data = np.asarray(var_data, dtype="float64").reshape(
+            -1, self.window_var_.shape[1]
+        )
+        factor_data = np.asarray(factor_data, dtype="float64").reshape(
+            -1, self.window_factors_.shape[1]
+        )
+        if not factor_data.shape[0] == var_data.shape[0]:
+            raise ValueError("number of observations unequal")
+        k_periods = var_data.shape[0]
+        p = self.p_lags
+
+        # roll window
+        window_var = np.concatenate([self.window_var_, var_data])
+        window_factors = np.concatenate([self.window_factors_, factor_data])
+        self.window_var_ = window_var[k_periods:]
+        self.window_factors_ = window_factors[k_periods:]
+
+        # update statistics with entering and leaving rows
+        if k_periods >= self.window_var_.shape[0] - p or (
+            self.n_updates_ + 1 >= self.recompute_every
+        ):
+            self._compute_statistics()
         else:
-            keys = [f"factor_{i}" for i in range(factor_data.shape[1])]
-        keys += ["factors", "var"]
-        component_r2s = {k: v for (k, v) in zip(keys, component_r2s)}
-        return component_r2s
+            Z_new, Y_new = self._design_rows(
+                window_var[-k_periods - p :], window_factors[-k_periods - p :]
+            )
+            Z_old, Y_old = self._design_rows(
+                window_var[: k_periods + p], window_factors[: k_periods + p]
+            )
+            self.gram_ += Z_new.T @ Z_new - Z_old.T @ Z_old
+            self.xty_ += Z_new.T @ Y_new - Z_old.T @ Y_old
+            self.yty_ += (Y_new**2).sum(axis=0) - (Y_old**2).sum(axis=0)
+            series_new = np.concatenate([var_data, factor_data], axis=1)
+            series_old = np.concatenate(
+                [window_var[:k_periods], window_factors[:k_periods]], axis=1
+            )
+            self.series_sums_ += series_new.sum(axis=0) - series_old.sum(axis=0)
+            self.series_squares_ += (series_new**2).sum(axis=0) - (
+                series_old**2
+            ).sum(axis=0)
+            self.n_updates_ += 1
+        self._solve()
+
+
+def _fit_gram_window(
+    gram: np.ndarray,
+    xty: np.ndarray,
+    n_obs: int,
+    alpha: float,
+    lambdau: float,
+    penalty_weights: np.ndarray,
+    **kwargs,
+) -> np.ndarray:
+    """Fit an elastic net to the statistics of one window in a worker."""
+    model = GramElasticNet(alpha=alpha, lambdau=lambdau, **kwargs)
+    model.fit_gram(gram=gram, xty=xty, n_obs=n_obs, penalty_weights=penalty_weights)
+    return model.coef_block_
+
+
+class FactorVARBatch:
+    """FactorVARs estimated jointly on a stack of equally shaped windows.
+
+    All single equation designs are built as one (n_windows, t_periods-p_lags,
+    m_features) array, and the sufficient statistics of all windows are
+    computed with vectorised operations. OLS estimates for all windows are
+    solved in one batched call, elastic net estimates are distributed over a
+    SharedWorkerPool. Estimates coincide with FactorVAR.fit_ols and with
+    FactorVAR.fit_elastic_net using the 'gram' solver on each window.
+
+    Attributes:
+        has_intercepts: Indicates if the VAR models include a constant vector.
+        p_lags: The order of lags in the VAR(p) models.
+
+    Additional attributes:
+        coef_blocks_: (n_windows, n_series, m_features) coefficients ordered
+            as in FactorVAR, i.e. intercepts, factor loadings, VAR matrices.
+        intercepts_: (n_windows, n_series, 1) array of intercepts.
+        factor_loadings_: (n_windows, n_series, k_factors) factor loadings.
+        var_matrices_: List of p_lags (n_windows, n_series, n_series) arrays
+            of VAR coefficients.
+        var_1_matrices_: (n_windows, n_series, n_series) first lag matrices.
+    """
+
+    def __init__(
+        self,
+        has_intercepts: bool = True,
+        p_lags: int = 1,
+    ):
+        """Initiates the FactorVARBatch object with descriptive attributes."""
+        self.has_intercepts = has_intercepts
+        self.p_lags = p_lags
+        self.is_fitted = False
+
+    @property
+    def n_windows_(self) -> int:
+        """The number of estimated windows."""
+        return self.coef_blocks_.shape[0]
+
+    @property
+    def intercepts_(self) -> np.ndarray:
+        """Array of model intercepts of each window."""
+        if not self.has_intercepts:
+            raise ValueError("Model does not have intercepts")
+        return self.coef_blocks_[:, :, :1]
+
+    @property
+    def factor_loadings_(self) -> np.ndarray:
+        """Array of factor loadings of each window."""
+        first = int(self.has_intercepts)
+        return self.coef_blocks_[:, :, first : first + self.k_factors_]
+
+    @property
+    def var_matrices_(self) -> list:
+        """List of arrays with VAR coefficient matrices of each window."""
+        first = int(self.has_intercepts) + self.k_factors_
+        n_series = self.coef_blocks_.shape[1]
+        return [
+            self.coef_blocks_[:, :, first + l * n_series : first + (l + 1) * n_series]
+            for l in range(self.p_lags)
+        ]
+
+    @property
+    def var_1_matrices_(self) -> np.ndarray:
+        """Array of first lag VAR matrices of each window."""
+        return self.var_matrices_[0]
+
+    def _build_X_blocks(
+        self,
+        var_data: np.ndarray,
+        factor_data: np.ndarray,
+        add_intercepts: bool,
+    ) -> np.ndarray:
+        """Create the single equation designs of all windows.
+
+        Args:
+            var_data: (n_windows, t_periods, n_series) array with observations.
+            factor_data: (n_windows, t_periods, k_factors) array with factors.
+            add_intercepts: Indicates whether a constant is added.
+
+        Returns:
+            X_blocks: (n_windows, t_periods-p_lags, m_features) array.
+        """
+        # setup
+        n_windows, t_periods = var_data.shape[:2]
+        elements = []
+
+        # constant
+        if add_intercepts:
+            elements += [np.ones([n_windows, t_periods - self.p_lags, 1])]
+
+        # exogenous regressors
+        if not factor_data.shape[:2] == var_data.shape[:2]:
+            raise ValueError("number of windows or observations unequal")
+        elements += [factor_data[:, self.p_lags :]]
+
+        # var data lags
+        for l in range(self.p_lags):
+            elements += [var_data[:, self.p_lags - 1 - l : t_periods - 1 - l]]
+
+        X_blocks = np.concatenate(elements, axis=2)
+        return X_blocks
+
+    @staticmethod
+    def _scale_windows(data: np.ndarray, demean: bool = True) -> np.ndarray:
+        """Standardise each window as FactorVAR._scale_data does for one window."""
+        levels = data.mean(axis=1, keepdims=True)
+        scales = data.std(axis=1, ddof=1, keepdims=True)
+        scaled_data = (data - levels) / scales
+        if not demean:
+            scaled_data += levels
+        return scaled_data
+
+    def _store_estimates(self, coef_blocks: np.ndarray, k_factors: int) -> None:
+        """Stores the (n_windows, n_series, m_features) coefficient stack."""
+        self.coef_blocks_ = coef_blocks
+        self.k_factors_ = k_factors
+        self.is_fitted = True
+
+    def fit_ols(self, var_data: np.ndarray, factor_data: np.ndarray) -> None:
+        """Fits the coefficients of all windows by OLS in one batched solve.
+
+        Args:
+            var_data: (n_windows, t_periods, n_series) array with observations.
+            factor_data: (n_windows, t_periods, k_factors) array with factors.
+        """
+        var_data = np.asarray(var_data, dtype="float64")
+        factor_data = np.asarray(factor_data, dtype="float64")
+        X_blocks = self._build_X_blocks(
+            var_data, factor_data, add_intercepts=self.has_intercepts
+        )
+        Y = var_data[:, self.p_lags :]
+
+        # normal equations of all windows
+        gram = np.einsum("wti, wtj -> wij", X_blocks, X_blocks)
+        xty = np.einsum("wti, wtn -> win", X_blocks, Y)
+        coef_blocks = np.linalg.solve(gram, xty).transpose(0, 2, 1)
+        self._store_estimates(coef_blocks, k_factors=factor_data.shape[2])
+
+    def fit_elastic_net(
+        self,
+        var_data: np.ndarray,
+        factor_data: np.ndarray,
+        alpha=0.1,
+        lambdau=0.1,
+        penalize_diagonals: bool = True,
+        penalize_factors: bool = True,
+        n_jobs: int = -1,
+        blas_threads: int = 1,
+        **kwargs,
+    ) -> None:
+        """Fits the coefficients of all windows using the Gram elastic net.
+
+        Args:
+            var_data: (n_windows, t_periods, n_series) array with observations.
+            factor_data: (n_windows, t_periods, k_factors) array with factors.
+            alpha: The ratio of L1 penalisation to L2 penalisation, a scalar
+                or one value per window, default=0.1.
+            lambdau: The penalty factor over all penalty terms, a scalar or one
+                value per window, default=0.1.
+            penalize_diagonals: Indicates if diagonal VAR entries are to be penalized.
+            penalize_factors: Indicates if factor loadings are to be penalized.
+            n_jobs: The number of worker processes, -1 to use all cores.
+            blas_threads: The maximum number of BLAS threads per worker.
+        """
+        # dimensions
+        var_data = np.asarray(var_data, dtype="float64")
+        factor_data = np.asarray(factor_data, dtype="float64")
+        n_windows, _, n_series = var_data.shape
+        k_factors = factor_data.shape[2]
+        alphas = np.broadcast_to(alpha, n_windows)
+        lambdaus = np.broadcast_to(lambdau, n_windows)
+
+        # standardised statistics
+        scaled_var_data = self._scale_windows(var_data, demean=self.has_intercepts)
+        scaled_factor_data = self._scale_windows(
+            factor_data, demean=self.has_intercepts
+        )
+        X_blocks = self._build_X_blocks(
+            scaled_var_data, scaled_factor_data, add_intercepts=False
+        )
+        Y = scaled_var_data[:, self.p_lags :]
+        gram = np.einsum("wti, wtj -> wij", X_blocks, X_blocks)
+        xty = np.einsum("wti, wtn -> win", X_blocks, Y)
+        penalty_weights = FactorVAR(
+            has_intercepts=self.has_intercepts, p_lags=self.p_lags
+        )._make_penalty_weights(
+            n_series=n_series,
+            k_factors=k_factors,
+            penalize_diagonals=penalize_diagonals,
+            penalize_factors=penalize_factors,
+        )
+
+        # estimate windows in parallel
+        with SharedWorkerPool(n_jobs=n_jobs, blas_threads=blas_threads) as pool:
+            gram, xty = pool.share(gram), pool.share(xty)
+            coef_blocks = joblib.Parallel()(
+                joblib.delayed(_fit_gram_window)(
+                    gram=gram[w],
+                    xty=xty[w],
+                    n_obs=Y[w].size,
+                    alpha=alphas[w],
+                    lambdau=lambdaus[w],
+                    penalty_weights=penalty_weights,
+                    **kwargs,
+                )
+                for w in range(n_windows)
+            )
+        coef_blocks = np.stack(coef_blocks)
+
+        # rescale coefficients as in FactorVAR._scale_coefs
+        y_levels = var_data.mean(axis=1)[:, :, None]
+        y_scales = var_data.std(axis=1, ddof=1)[:, :, None]
+        x_blocks = self._build_X_blocks(var_data, factor_data, add_intercepts=False)
+        x_levels = x_blocks.mean(axis=1)[:, None, :]
+        x_scales = x_blocks.std(axis=1)[:, None, :]
+        coef_blocks = coef_blocks * y_scales / x_scales
+        if self.has_intercepts:
+            intercepts = y_levels - (coef_blocks * x_levels).sum(axis=2, keepdims=True)
+            coef_blocks = np.concatenate([intercepts, coef_blocks], axis=2)
+        self._store_estimates(coef_blocks, k_factors=k_factors)
+
+    def to_models(self) -> list:
+        """Returns the estimates as a list of fitted FactorVAR objects."""
+        if not self.is_fitted:
+            raise ValueError("Model is not fitted")
+        models = []
+        for w in range(self.n_windows_):
+            model = FactorVAR(has_intercepts=self.has_intercepts, p_lags=self.p_lags)
+            if self.has_intercepts:
+                model._intercepts_ = self.intercepts_[w].copy()
+            model._factor_loadings_ = self.factor_loadings_[w].copy()
+            model._var_matrices_ = [m[w].copy() for m in self.var_matrices_]
+            model.is_fitted = True
+            models += [model]
+        return models
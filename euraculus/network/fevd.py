@@ -5,10 +5,112 @@ import networkx as nx
 from networkx import PowerIterationFailedConvergence
 import numpy as np
 import scipy as sp
-from euraculus.utils.utils import herfindahl_index, power_law_exponent
+import scipy.sparse
+import scipy.sparse.linalg
+from euraculus.utils.utils import herfindahl_index, power_law_exponent, sparsify
 from euraculus.network.network import Network
 
 
+def _diagonality_test(
+    omega: np.ndarray,
+    t_observations: int,
+    method: str = "ledoit-wolf",
+) -> tuple:
+    """Test diagonality of one or more generalized innovation covariances.
+
+    The statistics only require traces and Frobenius norms,
+    trace((Omega - I)^2) = ||Omega - I||_F^2 = ||Omega||_F^2 - 2 trace(Omega) + N,
+    which are evaluated along the last two axes of omega.
+
+    Args:
+        omega: (..., n_series, n_series) generalized error covariances.
+        t_observations: Number of time observations in the sample.
+        method: The test statistic used, either 'ledoit-wolf' or
+            'likelihood-ratio'.
+
+    Returns:
+        test_statistic: The calculated test statistics.
+        p_value: The corresponding p-values of the tests.
+    """
+    assert method in [
+        "ledoit-wolf",
+        "likelihood-ratio",
+    ], "available methods are ledoit-wolf and likelihood-ratio"
+
+    N = omega.shape[-1]
+    T = t_observations
+    trace = np.trace(omega, axis1=-2, axis2=-1)
+
+    if method == "ledoit-wolf":
+        squared_distance = (omega**2).sum(axis=(-2, -1)) - 2 * trace + N
+        test_statistic = (
+            N
+            * T
+            / 2
+            * (1 / N * squared_distance - N / T * (1 / N * trace) ** 2 + N / T)
+        )
+    elif method == "likelihood-ratio":
+        df = t_observations - 1
+        v = df * (np.log(N) - np.log(trace) + trace - N)
+        test_statistic = (1 - 1 / (6 * df - 1) * (2 * N + 1 - 2 / (N + 1))) * v
+
+    p_value = 1 - sp.stats.chi2.cdf(test_statistic, N * (N + 1) / 2)
+    return (test_statistic, p_value)
+
+
+def _row_scaled_network_estimates(
+    table: np.ndarray,
+    row_weights: np.ndarray,
+) -> dict:
+    """Node-level network estimates of a table with scaled rows.
+
+    Calculates the estimates of the Network with adjacency matrix
+    diag(row_weights) @ table from the row sums, weighted column sums, diagonal
+    and sums of squares of table, without forming the scaled table.
+
+    Args:
+        table: The (n_series * n_series) unscaled table.
+        row_weights: The (n_series,) row scaling factors.
+
+    Returns:
+        estimates: Dictionary with (n_series,) arrays of connectedness and
+            concentration estimates.
+    """
+    row_weights = np.asarray(row_weights).ravel()
+    diagonal = np.diag(table)
+
+    # sums
+    row_sums = table.sum(axis=1)
+    self_connectedness = row_weights * diagonal
+    full_in_connectedness = row_weights * row_sums
+    full_out_connectedness = row_weights @ table
+    in_connectedness = full_in_connectedness - self_connectedness
+    out_connectedness = full_out_connectedness - self_connectedness
+
+    # sums of squared shares, the row scaling cancels in row concentrations
+    row_squares = np.einsum("ij, ij -> i", table, table)
+    column_squares = np.einsum("i, ij, ij -> j", row_weights**2, table, table)
+    self_squares = self_connectedness**2
+
+    estimates = {
+        "in_connectedness": in_connectedness,
+        "out_connectedness": out_connectedness,
+        "full_in_connectedness": full_in_connectedness,
+        "full_out_connectedness": full_out_connectedness,
+        "self_connectedness": self_connectedness,
+        "net_connectedness": out_connectedness - in_connectedness,
+        "total_connectedness": in_connectedness + out_connectedness,
+        "in_concentration": (row_squares - diagonal**2)
+        / (row_sums - diagonal) ** 2,
+        "out_concentration": (column_squares - self_squares) / out_connectedness**2,
+        "full_in_concentration": row_squares / row_sums**2,
+        "full_out_concentration": column_squares / full_out_connectedness**2,
+        "amplification_factor": full_out_connectedness / full_in_connectedness,
+        "absorption_rate": self_connectedness / full_in_connectedness,
+    }
+    return estimates
+
+
 class FEVD:
     """Forecast Error Variance Decomposition.
 
@@ -18,19 +120,45 @@ class FEVD:
         n_series: The number of series.
         p_lags: The order of the VAR(p).
         generalized_error_cov: The generalized innovation covariance matrix.
+        density_threshold: The maximum density of VAR matrices for which sparse
+            matrix products are used.
+        spectral: Indicates if IRV, FEV and MSE tables are computed in closed
+            form from the eigendecomposition of the companion matrix.
+        max_eigenvector_condition: The maximum condition number of the companion
+            eigenvectors for which closed forms are used, default=1e8.
+        chunk_entries: The maximum number of entries held at once while the
+            closed-form FEV table is computed, default=2**22.
     """
 
+    max_eigenvector_condition = 1e8
+    chunk_entries = 2**22
+
     def __init__(
         self,
         var_matrices: list,
         error_cov: np.ndarray,
+        density_threshold: float = 0.1,
+        spectral: bool = False,
     ):
         """Initiates the FEVD object with attribute matrices.
 
         Args:
-            var_matrices: The vector auto-regression coefficient matrices.
+            var_matrices: The vector auto-regression coefficient matrices,
+                dense arrays or scipy sparse matrices.
             error_cov: The innovation covariance matrix.
+            density_threshold: The maximum density of VAR matrices for which
+                sparse matrix products are used, default=0.1.
+            spectral: Indicates if IRV, FEV and MSE tables are computed in
+                closed form, so that their cost does not depend on the horizon,
+                default=False. The closed form of the FEV table costs
+                O(n_series^4 * p_lags^2) and only pays off for long horizons,
+                so that horizons below n_series*p_lags are accumulated
+                recursively. Infinite horizons require a stable VAR and are
+                computed in closed form unless the companion matrix is
+                (nearly) defective.
         """
+        self.density_threshold = density_threshold
+        self.spectral = spectral
         self.var_matrices = var_matrices
         self.error_cov = error_cov
 
@@ -45,6 +173,11 @@ class FEVD:
             var_matrices = [var_matrices]
         self._check_var_matrices(var_matrices)
         self._var_matrices = var_matrices
+        self._var_operators = [
+            sparsify(var_matrix, density_threshold=self.density_threshold)
+            for var_matrix in var_matrices
+        ]
+        self._clear_cache()
 
     def _check_var_matrices(self, var_matrices: list):
         """Checks type and dims of VAR matrices.
@@ -53,7 +186,9 @@ class FEVD:
             var_matrices: The vector auto-regression coefficient matrices.
         """
         for var_matrix in var_matrices:
-            assert type(var_matrix) == np.ndarray, "VAR matrices must be numpy arrays"
+            assert type(var_matrix) == np.ndarray or sp.sparse.issparse(
+                var_matrix
+            ), "VAR matrices must be numpy arrays or sparse matrices"
             assert (
                 var_matrix.shape[0] == var_matrix.shape[1]
             ), "VAR matrices must be square"
@@ -70,6 +205,94 @@ class FEVD:
             error_cov.shape[0] == error_cov.shape[1]
         ), "Error covariance matrix must be square"
         self._error_cov = error_cov
+        self._clear_cache()
+
+    def _clear_cache(self) -> None:
+        """Discard all quantities derived from the VAR matrices or covariance."""
+        self._vma_cache = None
+        self._n_vma = 0
+        self._cov_cache = {}
+        self._companion_cache = {}
+        self._table_cache = {}
+        self._table_cache_hits = 0
+        self._table_cache_misses = 0
+
+    @property
+    def table_cache_info(self) -> dict:
+        """Hits, misses and size of the connectedness table cache.
+
+        The counts refer to the current VAR matrices and covariance.
+        """
+        cache_info = {
+            "hits": self._table_cache_hits,
+            "misses": self._table_cache_misses,
+            "size": len(self._table_cache),
+        }
+        return cache_info
+
+    def __getstate__(self) -> dict:
+        """Excludes cached quantities from pickles."""
+        state = {
+            key: value
+            for key, value in self.__dict__.items()
+            if key not in ["_var_operators", "_vma_cache", "_n_vma"]
+            and not key.endswith("_cache")
+            and not key.startswith("_table_cache")
+        }
+        return state
+
+    def __setstate__(self, state: dict):
+        """Restores pickled FEVD objects, including pickles without caches."""
+        self.__dict__.update(state)
+        self.density_threshold = state.get("density_threshold", 0.1)
+        self.spectral = state.get("spectral", False)
+        self.var_matrices = state["_var_matrices"]
+
+    def _error_cov_factorization(self) -> tuple:
+        """Cached symmetric eigendecomposition of the innovation covariance.
+
+        Returns:
+            eigenvalues: (n_series,) array of eigenvalues in ascending order.
+            eigenvectors: (n_series, n_series) array of eigenvectors in columns.
+        """
+        if "eigh" not in self._cov_cache:
+            error_cov = (self.error_cov + self.error_cov.T) / 2
+            self._cov_cache["eigh"] = np.linalg.eigh(error_cov)
+        return self._cov_cache["eigh"]
+
+    @property
+    def _error_cov_sqrt(self) -> np.ndarray:
+        """Symmetric square root of the innovation covariance matrix.
+
+        Negative eigenvalues from numerical noise are set to zero.
+        """
+        if "sqrt" not in self._cov_cache:
+            eigenvalues, eigenvectors = self._error_cov_factorization()
+            self._cov_cache["sqrt"] = (
+                eigenvectors * np.sqrt(eigenvalues.clip(min=0))
+            ) @ eigenvectors.T
+        return self._cov_cache["sqrt"]
+
+    @property
+    def _error_cov_inv(self) -> np.ndarray:
+        """Inverse of the innovation covariance matrix."""
+        if "inv" not in self._cov_cache:
+            eigenvalues, eigenvectors = self._error_cov_factorization()
+            self._cov_cache["inv"] = (eigenvectors / eigenvalues) @ eigenvectors.T
+        return self._cov_cache["inv"]
+
+    @property
+    def _error_cov_logdet(self) -> float:
+        """Log-determinant of the innovation covariance matrix."""
+        eigenvalues, _ = self._error_cov_factorization()
+        return np.log(eigenvalues).sum()
+
+    @property
+    def _error_cov_scales(self) -> np.ndarray:
+        """Innovation standard deviations, the root of the covariance diagonal."""
+        if "scales" not in self._cov_cache:
+            self._cov_cache["scales"] = np.sqrt(np.diag(self.error_cov))
+        return self._cov_cache["scales"]
 
     @property
     def n_series(self):
@@ -83,6 +306,43 @@ class FEVD:
         p_lags = len(self.var_matrices)
         return p_lags
 
+    def _vma_sequence(self, horizon: int) -> np.ndarray:
+        """Retrieve the VMA matrices up to a horizon from the cache.
+
+        The VMA matrices are computed iteratively with the recursion
+        Phi_h = Sum_{l=1}^{min(p, h)} A_l Phi_{h-l}, starting at Phi_0 = I.
+        Computed matrices are stored in a 3-D array that grows with the
+        requested horizon, so that every matrix is computed only once.
+
+        Args:
+            horizon: Maximum horizon of the VMA matrices.
+
+        Returns:
+            vma: (horizon+1, n_series, n_series) array of VMA matrices,
+                a read-only view of the cache.
+        """
+        n_series = self.n_series
+        if self._vma_cache is None or self._vma_cache.shape[0] <= horizon:
+            capacity = max(horizon + 1, 2 * self._n_vma)
+            cache = np.zeros([capacity, n_series, n_series])
+            if self._n_vma > 0:
+                cache[: self._n_vma] = self._vma_cache[: self._n_vma]
+            self._vma_cache = cache
+
+        # iterate
+        vma = self._vma_cache
+        if self._n_vma == 0:
+            vma[0] = np.eye(n_series)
+            self._n_vma = 1
+        for h in range(self._n_vma, horizon + 1):
+            for l in range(min(self.p_lags, h)):
+                vma[h] += self._var_operators[l] @ vma[h - l - 1]
+        self._n_vma = max(self._n_vma, horizon + 1)
+
+        vma = vma[: horizon + 1]
+        vma.flags.writeable = False
+        return vma
+
     def vma_matrix(self, horizon: int) -> np.ndarray:
         """Invert the VAR to obtain MA coefficients.
 
@@ -99,25 +359,160 @@ class FEVD:
             type(horizon) == int and horizon >= 0
         ), "horizon needs to be a positive integer"
 
-        if horizon == 0:
-            # identity
-            phi_0 = np.eye(self.n_series)
-            return phi_0
+        phi_h = self._vma_sequence(horizon)[horizon].copy()
+        return phi_h
 
-        elif self.p_lags == 1:
-            # matrix power
-            phi_h = np.linalg.matrix_power(self.var_matrices[0], horizon)
-            return phi_h
+    @property
+    def companion_matrix(self) -> np.ndarray:
+        """The (n_series*p_lags * n_series*p_lags) companion matrix of the VAR."""
+        n_series, p_lags = self.n_series, self.p_lags
+        companion = np.eye(n_series * p_lags, k=-n_series)
+        companion[:n_series] = np.concatenate(
+            [
+                m.toarray() if sp.sparse.issparse(m) else m
+                for m in self.var_matrices
+            ],
+            axis=1,
+        )
+        return companion
 
-        else:
-            # initialise
-            n_series = self.n_series
-            phi_h = np.zeros([n_series, n_series])
+    def _companion_factorization(self) -> tuple:
+        """Cached eigendecomposition of the companion matrix.
+
+        Defective companion matrices, e.g. of nilpotent VARs, have no
+        eigendecomposition, and nearly defective ones only an inaccurate one.
+        The factorization is therefore only returned if the condition number
+        of the eigenvectors is below max_eigenvector_condition.
+
+        Returns:
+            eigenvalues: (n_series*p_lags,) array of eigenvalues.
+            left: (n_series, n_series*p_lags) first block rows of the eigenvectors.
+            right: (n_series*p_lags, n_series) first block columns of the
+                inverse eigenvectors.
+            The factorization is None if the eigenvectors are ill-conditioned.
+        """
+        if "eig" not in self._companion_cache:
+            eigenvalues, eigenvectors = np.linalg.eig(self.companion_matrix)
+            singular_values = np.linalg.svd(eigenvectors, compute_uv=False)
+            condition = singular_values[0] / self.max_eigenvector_condition
+            if singular_values[-1] > condition:
+                inverse = np.linalg.inv(eigenvectors)
+                self._companion_cache["eig"] = (
+                    eigenvalues,
+                    eigenvectors[: self.n_series],
+                    inverse[:, : self.n_series],
+                )
+            else:
+                self._companion_cache["eig"] = None
+        return self._companion_cache["eig"]
+
+    @property
+    def spectral_radius(self) -> float:
+        """The largest absolute eigenvalue of the companion matrix."""
+        if "radius" not in self._companion_cache:
+            eigenvalues = np.linalg.eigvals(self.companion_matrix)
+            self._companion_cache["radius"] = np.abs(eigenvalues).max()
+        return self._companion_cache["radius"]
+
+    def _use_spectral(self, horizon) -> bool:
+        """Indicates if a table is computed in closed form.
+
+        Tables of (nearly) defective companion matrices are accumulated
+        recursively instead, infinite horizons up to _truncation_horizon.
+
+        Raises:
+            ValueError: If the VAR is not stable.
+        """
+        use_spectral = self.spectral or horizon == np.inf
+        if use_spectral and self.spectral_radius >= 1:
+            raise ValueError(
+                "closed form not available for spectral radius {:.4f}".format(
+                    self.spectral_radius
+                )
+            )
+        return use_spectral and self._companion_factorization() is not None
+
+    def _use_spectral_fev(self, horizon) -> bool:
+        """Indicates if forecast error variances are computed in closed form.
+
+        The closed form costs O(n_series^4 * p_lags^2) operations, so that it
+        only pays off over the recursion for horizons of at least
+        n_series*p_lags periods and for infinite horizons.
+        """
+        return (
+            self._use_spectral(horizon) and horizon >= self.n_series * self.p_lags
+        )
+
+    def _truncation_horizon(self, horizon):
+        """The finite horizon at which recursive tables are accumulated.
+
+        Infinite horizons are truncated once the powers of the stable
+        companion matrix have vanished to machine precision, found by
+        repeated squaring.
+
+        Args:
+            horizon: Number of periods, a positive integer or np.inf.
+
+        Returns:
+            horizon: The horizon as a positive integer.
+        """
+        if horizon != np.inf:
+            return horizon
+        if "horizon" not in self._companion_cache:
+            power = self.companion_matrix
+            truncation = 1
+            while np.abs(power).max() > np.finfo("float64").eps:
+                power = power @ power
+                truncation *= 2
+            self._companion_cache["horizon"] = truncation
+        return self._companion_cache["horizon"]
+
+    def _geometric_sums(self, rates: np.ndarray, horizon) -> np.ndarray:
+        """Sums Sum_{h=0}^{H} rates^h elementwise, with H=np.inf allowed."""
+        if horizon == np.inf:
+            return 1 / (1 - rates)
+        return (1 - rates ** (horizon + 1)) / (1 - rates)
+
+    def _spectral_vma_sum(self, horizon) -> np.ndarray:
+        """Calculate Sum_{h=0}^{H-1} VMA_h in closed form."""
+        eigenvalues, left, right = self._companion_factorization()
+        sums = self._geometric_sums(eigenvalues, horizon - 1)
+        vma_sum = ((left * sums) @ right).real
+        return vma_sum
+
+    def _spectral_mean_squared_errors(self, horizon) -> np.ndarray:
+        """Calculate the h-step mean squared errors in closed form.
+
+        With Phi_h = L D^h R, the diagonal of Sum_h Phi_h Sigma Phi_h' reduces to
+        Sum_{k,l} L_ik L_il G_kl (R Sigma R')_kl with the geometric sums
+        G_kl = Sum_h (d_k d_l)^h.
+        """
+        eigenvalues, left, right = self._companion_factorization()
+        sums = self._geometric_sums(np.outer(eigenvalues, eigenvalues), horizon)
+        weights = sums * (right @ self.error_cov @ right.T)
+        mse_h = ((left @ weights) * left).sum(axis=1).real
+        return mse_h.reshape(-1, 1)
+
+    def _spectral_forecast_error_variances(self, horizon) -> np.ndarray:
+        """Calculate the h-step forecast error variances in closed form.
+
+        With Psi_h = L D^h B and B = R Sigma^(1/2), the entry (i, j) of
+        Sum_h Psi_h**2 reduces to Sum_{k,l} Z_ijk G_kl Z_ijl with
+        Z_ijk = L_ik B_kj and the geometric sums G_kl = Sum_h (d_k d_l)^h.
+        """
+        eigenvalues, left, right = self._companion_factorization()
+        sums = self._geometric_sums(np.outer(eigenvalues, eigenvalues), horizon)
+        impulses = right @ self._error_cov_sqrt
 
-            # recursion
-            for l in range(self.p_lags):
-                phi_h += self.var_matrices[l] @ self.vma_matrix(horizon - l - 1)
-            return phi_h
+        # rows in chunks, so that Z holds at most about chunk_entries entries
+        n_series, n_states = left.shape
+        chunk_size = max(1, self.chunk_entries // (n_series * n_states))
+        fev_h = np.zeros([n_series, n_series])
+        for start in range(0, n_series, chunk_size):
+            rows = slice(start, start + chunk_size)
+            z = left[rows, None, :] * impulses.T[None, :, :]
+            fev_h[rows] = ((z @ sums) * z).sum(axis=2).real
+        return fev_h
 
     def impulse_response_functions(
         self, horizon: int, use_sqrtm: bool = True
@@ -138,14 +533,15 @@ class FEVD:
             type(horizon) == int and horizon >= 0
         ), "horizon needs to be a positive integer"
 
+        phi_h = self._vma_sequence(horizon)[horizon]
+
         # sqrtm version
         if use_sqrtm:
-            psi_h = self.vma_matrix(horizon) @ sp.linalg.sqrtm(self.error_cov)
+            psi_h = phi_h @ self._error_cov_sqrt
 
         # transmission matrix from diagonal impulses
         else:
-            diag_sigma = np.diag(np.diag(self.error_cov) ** -0.5)
-            psi_h = self.vma_matrix(horizon) @ self.error_cov @ diag_sigma
+            psi_h = phi_h @ (self.error_cov / self._error_cov_scales)
 
         return psi_h
 
@@ -164,12 +560,15 @@ class FEVD:
         """
         assert (
             type(horizon) == int and horizon >= 0
-        ), "horizon needs to be a positive integer"
+        ) or horizon == np.inf, "horizon needs to be a positive integer or np.inf"
 
         # accumulate period-wise covariance contributions
-        irv_h = np.zeros(self.error_cov.shape)
-        for h in range(horizon):
-            irv_h += self.vma_matrix(h) @ self.error_cov
+        if self._use_spectral(horizon):
+            irv_h = self._spectral_vma_sum(horizon) @ self.error_cov
+        else:
+            horizon = self._truncation_horizon(horizon)
+            vma = self._vma_sequence(horizon)[:horizon]
+            irv_h = vma.sum(axis=0) @ self.error_cov
 
         return irv_h
 
@@ -187,15 +586,15 @@ class FEVD:
         """
         assert (
             type(horizon) == int and horizon >= 0
-        ), "horizon needs to be a positive integer"
+        ) or horizon == np.inf, "horizon needs to be a positive integer or np.inf"
 
-        # initialise
-        n_series = self.n_series
-        fev_h = np.zeros([n_series, n_series])
+        if self._use_spectral_fev(horizon):
+            return self._spectral_forecast_error_variances(horizon)
 
         # accumulate
-        for h in range(horizon + 1):
-            fev_h += self.impulse_response_functions(h) ** 2
+        horizon = self._truncation_horizon(horizon)
+        psi = self._vma_sequence(horizon) @ self._error_cov_sqrt
+        fev_h = (psi**2).sum(axis=0)
         return fev_h
 
     def mean_squared_errors(self, horizon: int) -> np.ndarray:
@@ -212,18 +611,17 @@ class FEVD:
         """
         assert (
             type(horizon) == int and horizon >= 0
-        ), "horizon needs to be a positive integer"
+        ) or horizon == np.inf, "horizon needs to be a positive integer or np.inf"
 
-        # initialise
-        n_series = self.n_series
-        mse_h = np.zeros([n_series, n_series])
+        if self._use_spectral(horizon):
+            return self._spectral_mean_squared_errors(horizon)
 
-        # accumulate
-        for h in range(horizon + 1):
-            phi_h = self.vma_matrix(h)
-            mse_h += phi_h @ self.error_cov @ phi_h.T
+        # accumulate diagonals of Phi_h Sigma Phi_h'
+        horizon = self._truncation_horizon(horizon)
+        vma = self._vma_sequence(horizon)
+        mse_h = np.einsum("hij, hij -> i", vma @ self.error_cov, vma)
 
-        mse_h = np.diag(mse_h).reshape(-1, 1)
+        mse_h = mse_h.reshape(-1, 1)
         return mse_h
 
     def forecast_error_variance_decomposition(
@@ -244,7 +642,7 @@ class FEVD:
         """
         assert (
             type(horizon) == int and horizon >= 0
-        ), "horizon needs to be a positive integer"
+        ) or horizon == np.inf, "horizon needs to be a positive integer or np.inf"
 
         fevd = self.forecast_error_variances(horizon) / self.mean_squared_errors(
             horizon
@@ -303,7 +701,7 @@ class FEVD:
         """
         assert (
             type(horizon) == int and horizon >= 0
-        ), "horizon needs to be a positive integer"
+        ) or horizon == np.inf, "horizon needs to be a positive integer or np.inf"
 
         fud = self.forecast_uncertainty(horizon) / self.mean_absolute_error(horizon)
 
@@ -312,6 +710,134 @@ class FEVD:
             fud /= fud.sum(axis=1).reshape(-1, 1)
         return fud
 
+    def innovation_response_variances_path(self, horizon: int) -> np.ndarray:
+        """Calculate innovation response variance matrices for all horizons.
+
+        Args:
+            horizon: Maximum number of periods for innovation response variances.
+
+        Returns:
+            irv: Innovation response variances for horizons 0 to horizon
+                (horizon+1 * n_series * n_series).
+        """
+        assert (
+            type(horizon) == int and horizon >= 0
+        ), "horizon needs to be a positive integer"
+
+        irv = np.zeros([horizon + 1, self.n_series, self.n_series])
+        vma = self._vma_sequence(horizon)[:horizon]
+        np.cumsum(vma @ self.error_cov, axis=0, out=irv[1:])
+        return irv
+
+    def forecast_error_variances_path(self, horizon: int) -> np.ndarray:
+        """Calculate forecast error variance matrices for all horizons.
+
+        Args:
+            horizon: Maximum number of periods for forecast error variances.
+
+        Returns:
+            fev: Forecast error variances for horizons 0 to horizon
+                (horizon+1 * n_series * n_series).
+        """
+        assert (
+            type(horizon) == int and horizon >= 0
+        ), "horizon needs to be a positive integer"
+
+        psi = self._vma_sequence(horizon) @ self._error_cov_sqrt
+        fev = np.cumsum(psi**2, axis=0)
+        return fev
+
+    def mean_squared_errors_path(self, horizon: int) -> np.ndarray:
+        """Calculate mean squared errors of each series for all horizons.
+
+        Args:
+            horizon: Maximum number of periods for the mean squared errors.
+
+        Returns:
+            mse: Mean squared errors for horizons 0 to horizon
+                (horizon+1 * n_series * 1).
+        """
+        assert (
+            type(horizon) == int and horizon >= 0
+        ), "horizon needs to be a positive integer"
+
+        vma = self._vma_sequence(horizon)
+        mse = np.einsum("hij, hij -> hi", vma @ self.error_cov, vma)
+        mse = np.cumsum(mse, axis=0)[:, :, None]
+        return mse
+
+    def forecast_error_variance_decomposition_path(
+        self,
+        horizon: int,
+        normalize: bool = False,
+    ) -> np.ndarray:
+        """Calculate forecast error variance decompositions for all horizons.
+
+        Args:
+            horizon: Maximum number of periods for fevd.
+            normalize: Indicates if matrices should be row-normalized.
+
+        Returns:
+            fevd: Forecast error variance decompositions for horizons 0 to
+                horizon (horizon+1 * n_series * n_series).
+        """
+        fevd = self.forecast_error_variances_path(horizon)
+        fevd /= self.mean_squared_errors_path(horizon)
+
+        # row normalize if requested
+        if normalize:
+            fevd /= fevd.sum(axis=2, keepdims=True)
+        return fevd
+
+    def forecast_uncertainty_path(self, horizon: int) -> np.ndarray:
+        """Calculate forecast uncertainty matrices for all horizons.
+
+        Args:
+            horizon: Maximum number of periods for forecast uncertainty.
+
+        Returns:
+            fu: Forecast uncertainties for horizons 0 to horizon
+                (horizon+1 * n_series * n_series).
+        """
+        fu = self.forecast_error_variances_path(horizon) ** 0.5
+        return fu
+
+    def mean_absolute_error_path(self, horizon: int) -> np.ndarray:
+        """Calculate mean absolute forecast errors of each series for all horizons.
+
+        Args:
+            horizon: Maximum number of periods for the mean absolute forecast error.
+
+        Returns:
+            mae: Mean absolute forecast errors for horizons 0 to horizon
+                (horizon+1 * n_series * 1).
+        """
+        mae = self.mean_squared_errors_path(horizon) ** 0.5
+        return mae
+
+    def forecast_uncertainty_decomposition_path(
+        self,
+        horizon: int,
+        normalize: bool = False,
+    ) -> np.ndarray:
+        """Calculate forecast uncertainty decompositions for all horizons.
+
+        Args:
+            horizon: Maximum number of periods for fud.
+            normalize: Indicates if matrices should be row-normalized.
+
+        Returns:
+            fud: Forecast uncertainty decompositions for horizons 0 to horizon
+                (horizon+1 * n_series * n_series).
+        """
+        fud = self.forecast_uncertainty_path(horizon)
+        fud /= self.mean_absolute_error_path(horizon)
+
+        # row normalize if requested
+        if normalize:
+            fud /= fud.sum(axis=2, keepdims=True)
+        return fud
+
     def _get_table(
         self,
         name: str,
@@ -333,7 +859,7 @@ class FEVD:
         # verify inputs
         assert (
             type(horizon) == int and horizon >= 0
-        ), "horizon needs to be a positive integer"
+        ) or horizon == np.inf, "horizon needs to be a positive integer or np.inf"
 
         options = ["fevd", "fev", "fud", "fu", "irv", "irf", "var", "vma"]
         assert name in options, "name needs to be one of " + ", ".join(options)
@@ -341,7 +867,37 @@ class FEVD:
         if name not in ["fevd", "fud"] and normalize:
             warnings.warn("normalization only available for tables 'fevd' and 'fud'")
 
-        # retrieve table
+        # retrieve base table
+        normalize = normalize and name in ["fevd", "fud"]
+        key = (name, horizon, normalize, self.spectral)
+        if key in self._table_cache:
+            self._table_cache_hits += 1
+        else:
+            self._table_cache_misses += 1
+            self._table_cache[key] = self._compute_table(name, horizon, normalize)
+        table = self._table_cache[key].copy()
+
+        # weigh rows
+        if weights is not None:
+            weights = np.asarray(weights).reshape(-1, 1)
+            if sp.sparse.issparse(table):
+                table = sp.sparse.diags(weights.ravel()) @ table
+            else:
+                table *= weights
+
+        return table
+
+    def _compute_table(self, name: str, horizon: int, normalize: bool) -> np.ndarray:
+        """Compute an unweighted connectedness table.
+
+        Args:
+            name: Abbreviated name of the table.
+            horizon: Number of periods to compute the table.
+            normalize: Indicates if table should be row-normalized.
+
+        Returns:
+            table: The requested (n_series * n_series) connectedness table.
+        """
         if name == "fevd":
             table = self.forecast_error_variance_decomposition(
                 horizon=horizon, normalize=normalize
@@ -362,10 +918,6 @@ class FEVD:
             table = self.var_matrices[horizon - 1]
         if name == "vma":
             table = self.vma_matrix(horizon=horizon)
-
-        if weights is not None:
-            table = np.diag(weights.flatten()) @ table
-
         return table
 
     def to_graph(
@@ -392,7 +944,14 @@ class FEVD:
             normalize=normalize,
             weights=weights,
         )
-        graph = nx.convert_matrix.from_numpy_array(table, create_using=nx.DiGraph)
+        table = sparsify(table, density_threshold=self.density_threshold)
+        if sp.sparse.issparse(table):
+            from_sparse = getattr(nx, "from_scipy_sparse_array", None) or getattr(
+                nx, "from_scipy_sparse_matrix"
+            )
+            graph = from_sparse(table, create_using=nx.DiGraph)
+        else:
+            graph = nx.convert_matrix.from_numpy_array(table, create_using=nx.DiGraph)
         return graph.reverse()
 
     def to_network(
@@ -419,9 +978,77 @@ class FEVD:
             normalize=normalize,
             weights=weights,
         )
+        if sp.sparse.issparse(table):
+            table = table.toarray()
         network = Network(adjacency_matrix=table)
         return network
 
+    def _stream_forecast_error_variances(self, horizon: int) -> np.ndarray:
+        """Accumulate the h-step forecast error variances horizon by horizon.
+
+        Only the impulse responses of the last p_lags horizons are kept, instead
+        of the full VMA sequence.
+
+        Args:
+            horizon: Number of periods for forecast error variances.
+
+        Returns:
+            fev_h: h-step forecast error variance matrix (n_series * n_series).
+        """
+        if self._use_spectral_fev(horizon):
+            return self.forecast_error_variances(horizon)
+        horizon = self._truncation_horizon(horizon)
+        if self._n_vma > horizon:
+            return self.forecast_error_variances(horizon)
+
+        psi = [self._error_cov_sqrt]
+        fev_h = psi[0] ** 2
+        for h in range(1, horizon + 1):
+            psi_h = np.zeros([self.n_series, self.n_series])
+            for l in range(min(self.p_lags, h)):
+                psi_h += self._var_operators[l] @ psi[-l - 1]
+            fev_h += psi_h**2
+            psi = (psi + [psi_h])[-self.p_lags :]
+        return fev_h
+
+    def stream_network_estimates(
+        self,
+        horizon: int,
+        weights: np.ndarray = None,
+    ) -> dict:
+        """Node-level network estimates without forming connectedness tables.
+
+        The fev, fevd and their weighted tables only differ by row scalings of
+        the forecast error variances, so that a single accumulated matrix of
+        forecast error variances suffices for the connectedness and
+        concentration estimates of all of them. Neither the tables nor the
+        VMA sequence are stored. The estimates equal those of the Network
+        objects of the tables, except for centrality measures, which require
+        the full table and are not included.
+
+        Args:
+            horizon: Number of periods to compute the tables.
+            weights: A vector indicating the weights of each node in the aggregate.
+
+        Returns:
+            estimates: Dictionary with the tables 'fev' and 'fevd', as well as
+                'wfev' and 'wfevd' if weights are given, as keys and
+                dictionaries of (n_series,) arrays of estimates as values.
+        """
+        fev_h = self._stream_forecast_error_variances(horizon)
+        mse_h = fev_h.sum(axis=1)
+
+        row_weights = {"fevd": 1 / mse_h, "fev": np.ones(self.n_series)}
+        if weights is not None:
+            weights = np.asarray(weights).ravel()
+            row_weights["wfevd"] = weights / mse_h
+            row_weights["wfev"] = weights
+        estimates = {
+            name: _row_scaled_network_estimates(fev_h, scaling)
+            for name, scaling in row_weights.items()
+        }
+        return estimates
+
     @property
     def generalized_error_cov(self) -> np.ndarray:
         """The generalized innovation covariance matrix.
@@ -431,13 +1058,19 @@ class FEVD:
         Returns:
             omega: The generalized error covariance.
         """
-        omega = (
-            np.diag(np.diag(self.error_cov)) ** 0.5
-            @ np.linalg.inv(self.error_cov)
-            @ np.diag(np.diag(self.error_cov)) ** 0.5
-        )
+        omega = self._generalized_error_cov.copy()
         return omega
 
+    @property
+    def _generalized_error_cov(self) -> np.ndarray:
+        """Cached generalized innovation covariance matrix."""
+        if "omega" not in self._cov_cache:
+            scales = self._error_cov_scales
+            self._cov_cache["omega"] = (
+                scales.reshape(-1, 1) * self._error_cov_inv * scales.reshape(1, -1)
+            )
+        return self._cov_cache["omega"]
+
     def test_diagonal_generalized_innovations(
         self,
         t_observations: int,
@@ -459,34 +1092,11 @@ class FEVD:
             test_statistic (float): The calculated test statistic.
             p_value (float): The corresponding p-value of the test.
         """
-        assert method in [
-            "ledoit-wolf",
-            "likelihood-ratio",
-        ], "available methods are ledoit-wolf and likelihood-ratio"
-
-        omega = self.generalized_error_cov
-        N = self.n_series
-        T = t_observations
-
-        if method == "ledoit-wolf":
-            test_statistic = (
-                N
-                * T
-                / 2
-                * (
-                    1 / N * np.trace(np.linalg.matrix_power(omega - np.eye(N), 2))
-                    - N / T * (1 / N * np.trace(omega)) ** 2
-                    + N / T
-                )
-            )
-        elif method == "likelihood-ratio":
-            df = t_observations - 1
-            v = df * (
-                np.log(N) - np.log(np.linalg.eigh(omega)[0].sum()) + np.trace(omega) - N
-            )
-            test_statistic = (1 - 1 / (6 * df - 1) * (2 * N + 1 - 2 / (N + 1))) * v
-
-        p_value = 1 - sp.stats.chi2.cdf(test_statistic, N * (N + 1) / 2)
+        test_statistic, p_value = _diagonality_test(
+            omega=self._generalized_error_cov,
+            t_observations=t_observations,
+            method=method,
+        )
         return (test_statistic, p_value)
 
     def index_variance_decomposition(
@@ -499,21 +1109,822 @@ class FEVD:
         Decomposes the variance of an index created with the input index
         weights correspoding to the FEVD constituents.
         IVD = w' * IRV * diag(w)
+        Several indices can be decomposed at once by passing their weights as
+        columns of a matrix, in which case the memoized innovation response
+        variances are multiplied with all weight vectors in one product.
 
         Args:
-            weights (numpy.array): Index weights associated with the FEVD variables.
+            weights (numpy.array): Index weights associated with the FEVD variables,
+                either one vector (n_series,) or one column per index
+                (n_series times n_indices).
             horizon (int): The horizon of accumulative innovations.
 
         Returns:
             index_variance_decomposition (np.array): index variance weights
-                (n_series times 1)
+                (n_series,) for a weight vector, or (n_series times n_indices)
+                for a weight matrix.
         """
-        assert weights.shape == (self.n_series,), "weights have wrong shape"
+        weights = np.asarray(weights)
+        assert weights.ndim in [1, 2], "weights have wrong shape"
+        assert weights.shape[0] == self.n_series, "weights have wrong shape"
 
-        innovation_response_variance = self.innovation_response_variances(
-            horizon=horizon
-        )
+        innovation_response_variance = self._get_table("irv", horizon)
         index_variance_decomposition = (
-            weights.T @ innovation_response_variance @ np.diag(weights)
+            innovation_response_variance.T @ weights
+        ) * weights
+        return index_variance_decomposition
+
+
+class FEVDBatch:
+    """Forecast error variance decompositions of many windows at once.
+
+    All windows need to have the same number of series and VAR lags. Tables
+    are computed for all windows with batched matrix products and batched
+    eigendecompositions, and are returned as arrays with the windows along
+    the first axis. VMA matrices are accumulated horizon by horizon, keeping
+    only the last p_lags of them, so that memory does not grow with the
+    horizon unless keep_vma is set.
+
+    Attributes:
+        var_matrices: The VAR coefficients as a list of one
+            (n_windows * n_series * n_series) array per lag.
+        error_covs: The innovation covariance matrices
+            (n_windows * n_series * n_series).
+        keep_vma: Indicates if the full VMA sequence is cached, which needs
+            (horizon+1) * n_windows * n_series**2 floats, but speeds up
+            repeated queries of VMA and impulse response matrices.
+        n_windows: The number of windows.
+        n_series: The number of series.
+        p_lags: The order of the VAR(p).
+    """
+
+    def __init__(
+        self,
+        var_matrices: list,
+        error_covs: np.ndarray,
+        keep_vma: bool = False,
+    ):
+        """Initiates the FEVDBatch object with stacked attribute matrices.
+
+        Args:
+            var_matrices: The stacked VAR coefficient matrices, a
+                (n_windows * n_series * n_series) array or a list thereof.
+            error_covs: The stacked innovation covariance matrices.
+            keep_vma: Indicates if the full VMA sequence is cached,
+                default=False.
+        """
+        self.keep_vma = keep_vma
+        self._var_matrices = None
+        self.error_covs = error_covs
+        self.var_matrices = var_matrices
+
+    @property
+    def var_matrices(self) -> list:
+        """The stacked VAR coefficients as a list of numpy arrays."""
+        return self._var_matrices
+
+    @var_matrices.setter
+    def var_matrices(self, var_matrices: list):
+        if type(var_matrices) != list:
+            var_matrices = [var_matrices]
+        var_matrices = [np.asarray(m, dtype="float64") for m in var_matrices]
+        for var_matrix in var_matrices:
+            assert (
+                var_matrix.shape == self.error_covs.shape
+            ), "VAR matrices and error covariances must have the same shape"
+        self._var_matrices = var_matrices
+        self._clear_cache()
+
+    @property
+    def error_covs(self) -> np.ndarray:
+        """The stacked innovation covariance matrices as a numpy array."""
+        return self._error_covs
+
+    @error_covs.setter
+    def error_covs(self, error_covs: np.ndarray):
+        error_covs = np.asarray(error_covs, dtype="float64")
+        assert (
+            error_covs.ndim == 3 and error_covs.shape[1] == error_covs.shape[2]
+        ), "Error covariance matrices must be square"
+        for var_matrix in self.var_matrices or []:
+            assert (
+                var_matrix.shape == error_covs.shape
+            ), "VAR matrices and error covariances must have the same shape"
+        self._error_covs = error_covs
+        self._clear_cache()
+
+    def _clear_cache(self) -> None:
+        """Discard all quantities derived from the VAR matrices or covariances."""
+        self._vma_cache = None
+        self._cov_cache = {}
+        self._accumulated = (None, None)
+
+    @classmethod
+    def from_fevds(cls, fevds: list, **kwargs):
+        """Stacks the matrices of FEVD objects of equal dimensions.
+
+        Args:
+            fevds: List of FEVD objects.
+            kwargs: Additional keyword arguments for FEVDBatch.
+
+        Returns:
+            batch: The FEVDBatch object of all windows.
+        """
+        var_matrices = []
+        for l in range(fevds[0].p_lags):
+            lag_matrices = [fevd.var_matrices[l] for fevd in fevds]
+            var_matrices += [
+                np.stack(
+                    [m.toarray() if sp.sparse.issparse(m) else m for m in lag_matrices]
+                )
+            ]
+        error_covs = np.stack([fevd.error_cov for fevd in fevds])
+        return cls(var_matrices=var_matrices, error_covs=error_covs, **kwargs)
+
+    @property
+    def n_windows(self) -> int:
+        """The number of windows."""
+        return self.error_covs.shape[0]
+
+    @property
+    def n_series(self) -> int:
+        """The number of series."""
+        return self.error_covs.shape[1]
+
+    @property
+    def p_lags(self) -> int:
+        """The order of the VAR(p)."""
+        return len(self.var_matrices)
+
+    def _vma_sequence(self, horizon: int) -> np.ndarray:
+        """Retrieve the VMA matrices of all windows up to a horizon.
+
+        Args:
+            horizon: Maximum horizon of the VMA matrices.
+
+        Returns:
+            vma: (horizon+1, n_windows, n_series, n_series) array of VMA matrices.
+        """
+        n_computed = 0 if self._vma_cache is None else self._vma_cache.shape[0]
+        if n_computed <= horizon:
+            vma = np.zeros([horizon + 1, self.n_windows, self.n_series, self.n_series])
+            if n_computed > 0:
+                vma[:n_computed] = self._vma_cache
+            else:
+                vma[0] = np.eye(self.n_series)
+                n_computed = 1
+            for h in range(n_computed, horizon + 1):
+                for l in range(min(self.p_lags, h)):
+                    vma[h] += self.var_matrices[l] @ vma[h - l - 1]
+            self._vma_cache = vma
+        return self._vma_cache[: horizon + 1]
+
+    def _iterate_vma(self, horizon: int):
+        """Iterate over the VMA matrices of all windows up to a horizon.
+
+        Unless keep_vma is set, only the last p_lags VMA matrices are kept.
+
+        Args:
+            horizon: Maximum horizon of the VMA matrices.
+
+        Yields:
+            phi_h: (n_windows, n_series, n_series) array of h-step VMA matrices.
+        """
+        if self.keep_vma:
+            yield from self._vma_sequence(horizon)
+            return
+
+        vma = [np.broadcast_to(np.eye(self.n_series), self.error_covs.shape)]
+        yield vma[0]
+        for h in range(1, horizon + 1):
+            phi_h = np.zeros(self.error_covs.shape)
+            for l in range(min(self.p_lags, h)):
+                phi_h += self.var_matrices[l] @ vma[-l - 1]
+            vma = (vma + [phi_h])[-self.p_lags :]
+            yield phi_h
+
+    def _accumulate(self, horizon: int) -> dict:
+        """Accumulate the tables of all windows horizon by horizon.
+
+        The statistics of the last requested horizon are cached, so that e.g.
+        the forecast error variances and mean squared errors of a
+        decomposition share one pass over the horizons.
+
+        Args:
+            horizon: Number of periods.
+
+        Returns:
+            statistics: Dictionary with the h-step VMA matrices 'vma', the sum
+                of the VMA matrices before the horizon 'vma_sum', the forecast
+                error variances 'fev' and the mean squared errors 'mse'.
+        """
+        cached_horizon, statistics = self._accumulated
+        if cached_horizon == horizon:
+            return statistics
+
+        n_windows, n_series = self.n_windows, self.n_series
+        error_cov_sqrt = self._error_cov_sqrt
+        vma_sum = np.zeros(self.error_covs.shape)
+        fev_h = np.zeros(self.error_covs.shape)
+        mse_h = np.zeros([n_windows, n_series])
+        for h, phi_h in enumerate(self._iterate_vma(horizon)):
+            if h < horizon:
+                vma_sum += phi_h
+            fev_h += (phi_h @ error_cov_sqrt) ** 2
+            mse_h += np.einsum("wij, wij -> wi", phi_h @ self.error_covs, phi_h)
+
+        statistics = {"vma": phi_h, "vma_sum": vma_sum, "fev": fev_h, "mse": mse_h}
+        self._accumulated = (horizon, statistics)
+        return statistics
+
+    def _error_cov_factorization(self) -> tuple:
+        """Cached batched eigendecomposition of the innovation covariances."""
+        if "eigh" not in self._cov_cache:
+            error_covs = (self.error_covs + self.error_covs.transpose(0, 2, 1)) / 2
+            self._cov_cache["eigh"] = np.linalg.eigh(error_covs)
+        return self._cov_cache["eigh"]
+
+    @property
+    def _error_cov_sqrt(self) -> np.ndarray:
+        """Symmetric square roots of the innovation covariance matrices."""
+        if "sqrt" not in self._cov_cache:
+            eigenvalues, eigenvectors = self._error_cov_factorization()
+            roots = np.sqrt(eigenvalues.clip(min=0))[:, None, :]
+            self._cov_cache["sqrt"] = (eigenvectors * roots) @ eigenvectors.transpose(
+                0, 2, 1
+            )
+        return self._cov_cache["sqrt"]
+
+    @property
+    def _error_cov_scales(self) -> np.ndarray:
+        """Innovation standard deviations (n_windows * n_series)."""
+        return np.sqrt(np.diagonal(self.error_covs, axis1=1, axis2=2))
+
+    @property
+    def generalized_error_covs(self) -> np.ndarray:
+        """The generalized innovation covariance matrices of all windows."""
+        return self._generalized_error_covs.copy()
+
+    @property
+    def _generalized_error_covs(self) -> np.ndarray:
+        """Cached generalized innovation covariance matrices of all windows."""
+        if "omega" not in self._cov_cache:
+            eigenvalues, eigenvectors = self._error_cov_factorization()
+            inverse = (eigenvectors / eigenvalues[:, None, :]) @ np.swapaxes(
+                eigenvectors, 1, 2
+            )
+            scales = self._error_cov_scales
+            self._cov_cache["omega"] = scales[:, :, None] * inverse * scales[:, None, :]
+        return self._cov_cache["omega"]
+
+    def test_diagonal_generalized_innovations(
+        self,
+        t_observations: int,
+        method: str = "ledoit-wolf",
+    ) -> tuple:
+        """Test diagonality of the innovations of all windows.
+
+        Args:
+            t_observations: Number of time observations in each sample.
+            method: The test statistic used,
+                either 'ledoit-wolf' or 'likelihood-ratio'.
+
+        Returns:
+            test_statistic: (n_windows,) array of test statistics.
+            p_value: (n_windows,) array of p-values.
+        """
+        return _diagonality_test(
+            omega=self._generalized_error_covs,
+            t_observations=t_observations,
+            method=method,
         )
-        return index_variance_decomposition.T
+
+    def vma_matrices(self, horizon: int) -> np.ndarray:
+        """Calculate the h-step VMA matrices of all windows."""
+        if self.keep_vma:
+            return self._vma_sequence(horizon)[horizon].copy()
+        return self._accumulate(horizon)["vma"].copy()
+
+    def impulse_response_functions(
+        self, horizon: int, use_sqrtm: bool = True
+    ) -> np.ndarray:
+        """Calculate the h-step impulse response matrices of all windows.
+
+        Args:
+            horizon: Number of periods for impulse response functions.
+            use_sqrtm: Indicates if matrix square root should be used.
+
+        Returns:
+            psi_h: h-step impulse responses (n_windows * n_series * n_series).
+        """
+        if self.keep_vma:
+            phi_h = self._vma_sequence(horizon)[horizon]
+        else:
+            phi_h = self._accumulate(horizon)["vma"]
+        if use_sqrtm:
+            psi_h = phi_h @ self._error_cov_sqrt
+        else:
+            psi_h = phi_h @ (self.error_covs / self._error_cov_scales[:, None, :])
+        return psi_h
+
+    def innovation_response_variances(self, horizon: int) -> np.ndarray:
+        """Calculate the h-step innovation response variances of all windows."""
+        irv_h = self._accumulate(horizon)["vma_sum"] @ self.error_covs
+        return irv_h
+
+    def forecast_error_variances(self, horizon: int) -> np.ndarray:
+        """Calculate the h-step forecast error variances of all windows."""
+        return self._accumulate(horizon)["fev"].copy()
+
+    def mean_squared_errors(self, horizon: int) -> np.ndarray:
+        """Calculate the h-step mean squared errors (n_windows * n_series * 1)."""
+        return self._accumulate(horizon)["mse"][:, :, None].copy()
+
+    def forecast_error_variance_decomposition(
+        self,
+        horizon: int,
+        normalize: bool = False,
+    ) -> np.ndarray:
+        """Calculate the forecast error variance decompositions of all windows."""
+        statistics = self._accumulate(horizon)
+        fevd = statistics["fev"] / statistics["mse"][:, :, None]
+        if normalize:
+            fevd /= fevd.sum(axis=2, keepdims=True)
+        return fevd
+
+    def forecast_uncertainty(self, horizon: int) -> np.ndarray:
+        """Calculate the h-step forecast uncertainties of all windows."""
+        return self.forecast_error_variances(horizon) ** 0.5
+
+    def mean_absolute_error(self, horizon: int) -> np.ndarray:
+        """Calculate the h-step mean absolute errors (n_windows * n_series * 1)."""
+        return self.mean_squared_errors(horizon) ** 0.5
+
+    def forecast_uncertainty_decomposition(
+        self,
+        horizon: int,
+        normalize: bool = False,
+    ) -> np.ndarray:
+        """Calculate the forecast uncertainty decompositions of all windows."""
+        fud = self.forecast_uncertainty(horizon) / self.mean_absolute_error(horizon)
+        if normalize:
+            fud /= fud.sum(axis=2, keepdims=True)
+        return fud
+
+    def _get_table(
+        self,
+        name: str,
+        horizon: int,
+        normalize: bool = False,
+        weights: np.ndarray = None,
+    ) -> np.ndarray:
+        """Retrieve the connectedness tables of all windows.
+
+        Args:
+            name: Abbreviated name of the table.
+            horizon: Number of periods to compute the table.
+            normalize: Indicates if tables should be row-normalized.
+            weights: Node weights of shape (n_series,) or (n_windows, n_series).
+
+        Returns:
+            tables: The requested (n_windows * n_series * n_series) tables.
+        """
+        assert (
+            type(horizon) == int and horizon >= 0
+        ), "horizon needs to be a positive integer"
+
+        options = ["fevd", "fev", "fud", "fu", "irv", "irf", "var", "vma"]
+        assert name in options, "name needs to be one of " + ", ".join(options)
+
+        if name not in ["fevd", "fud"] and normalize:
+            warnings.warn("normalization only available for tables 'fevd' and 'fud'")
+
+        if name == "fevd":
+            tables = self.forecast_error_variance_decomposition(horizon, normalize)
+        elif name == "fev":
+            tables = self.forecast_error_variances(horizon)
+        elif name == "fud":
+            tables = self.forecast_uncertainty_decomposition(horizon, normalize)
+        elif name == "fu":
+            tables = self.forecast_uncertainty(horizon)
+        elif name == "irv":
+            tables = self.innovation_response_variances(horizon)
+        elif name == "irf":
+            tables = self.impulse_response_functions(horizon)
+        elif name == "var":
+            tables = self.var_matrices[horizon - 1].copy()
+        elif name == "vma":
+            tables = self.vma_matrices(horizon)
+
+        if weights is not None:
+            weights = np.asarray(weights).reshape(-1, self.n_series)
+            tables = tables * weights[:, :, None]
+        return tables
+
+    def network_summaries(
+        self,
+        horizon: int,
+        table_name: str = "fevd",
+        normalize: bool = False,
+        weights: np.ndarray = None,
+        others_only: bool = True,
+    ) -> dict:
+        """Node-level connectedness of the network tables of all windows.
+
+        The summaries equal those of the Network object of each window.
+
+        Args:
+            horizon: Number of periods to compute the tables.
+            table_name: Abbreviated name of the table.
+            normalize: Indicates if tables should be row-normalized.
+            weights: Node weights of shape (n_series,) or (n_windows, n_series).
+            others_only: Indicates wheter to exclude self-linkages.
+
+        Returns:
+            summaries: Dictionary with (n_windows * n_series) arrays of in-,
+                out-, self- and net connectedness and the (n_windows,)
+                average connectedness.
+        """
+        tables = self._get_table(
+            name=table_name, horizon=horizon, normalize=normalize, weights=weights
+        )
+        self_connectedness = np.diagonal(tables, axis1=1, axis2=2)
+        in_connectedness = tables.sum(axis=2)
+        out_connectedness = tables.sum(axis=1)
+        if others_only:
+            in_connectedness = in_connectedness - self_connectedness
+            out_connectedness = out_connectedness - self_connectedness
+        summaries = {
+            "in_connectedness": in_connectedness,
+            "out_connectedness": out_connectedness,
+            "self_connectedness": self_connectedness.copy(),
+            "net_connectedness": (tables.sum(axis=1) - tables.sum(axis=2)),
+            "average_connectedness": in_connectedness.mean(axis=1),
+        }
+        return summaries
+
+
+class StructuredCovariance:
+    """Innovation covariance matrix with a sparse or low-rank structure.
+
+    The covariance is either given by a sparse precision matrix, e.g. from
+    GLASSO, or as a low-rank plus diagonal matrix Sigma = F F' + D. Products
+    with the covariance use a sparse LU factorization of the precision or the
+    factor structure, so that Sigma is never inverted or formed explicitly.
+    Only the symmetric square root in sqrtm and to_dense are dense.
+
+    Attributes:
+        n_series: The number of series.
+    """
+
+    def __init__(
+        self,
+        precision=None,
+        loadings: np.ndarray = None,
+        idiosyncratic_variances: np.ndarray = None,
+    ):
+        """Initiates the StructuredCovariance object.
+
+        Provide either a precision matrix or loadings and idiosyncratic
+        variances.
+
+        Args:
+            precision: (n_series * n_series) sparse or dense precision matrix.
+            loadings: (n_series * k_factors) factor loadings F.
+            idiosyncratic_variances: (n_series,) diagonal of D.
+        """
+        if precision is not None:
+            self._precision = sp.sparse.csc_matrix(precision)
+            self._lu = sp.sparse.linalg.splu(self._precision)
+            self._loadings = None
+        elif loadings is not None and idiosyncratic_variances is not None:
+            self._precision = None
+            self._loadings = np.asarray(loadings, dtype="float64")
+            self._idiosyncratic_variances = np.asarray(
+                idiosyncratic_variances, dtype="float64"
+            ).ravel()
+        else:
+            raise ValueError(
+                "either precision or loadings and idiosyncratic_variances required"
+            )
+        self._diagonal = None
+        self._sqrt = None
+
+    @property
+    def n_series(self) -> int:
+        """The number of series."""
+        if self._loadings is None:
+            return self._precision.shape[0]
+        return self._loadings.shape[0]
+
+    def matmul(self, X: np.ndarray) -> np.ndarray:
+        """Calculate the product Sigma @ X.
+
+        Args:
+            X: (n_series * m) dense array.
+
+        Returns:
+            product: (n_series * m) dense array.
+        """
+        if self._loadings is None:
+            product = self._lu.solve(np.asarray(X, dtype="float64"))
+        else:
+            X = np.asarray(X, dtype="float64").reshape(self.n_series, -1)
+            product = self._loadings @ (self._loadings.T @ X)
+            product += self._idiosyncratic_variances.reshape(-1, 1) * X
+        return product
+
+    def diagonal(self) -> np.ndarray:
+        """The (n_series,) diagonal of the covariance matrix."""
+        if self._diagonal is None:
+            if self._loadings is None:
+                # solve for blocks of unit vectors
+                n_series, block_size = self.n_series, 256
+                self._diagonal = np.zeros(n_series)
+                for start in range(0, n_series, block_size):
+                    size = min(block_size, n_series - start)
+                    columns = self._lu.solve(np.eye(n_series, size, -start))
+                    self._diagonal[start : start + size] = columns[
+                        start + np.arange(size), np.arange(size)
+                    ]
+            else:
+                self._diagonal = (self._loadings**2).sum(
+                    axis=1
+                ) + self._idiosyncratic_variances
+        return self._diagonal
+
+    def sqrtm(self) -> np.ndarray:
+        """The dense (n_series * n_series) symmetric square root of the covariance.
+
+        The square root is dense and requires a full eigendecomposition, i.e.
+        O(n_series^3) time and O(n_series^2) memory. A precision is decomposed
+        directly, so that the covariance is not inverted. Non-positive
+        eigenvalues from numerical noise are set to zero in both cases, for a
+        precision as in a pseudo-inverse.
+        """
+        if self._sqrt is None:
+            if self._loadings is None:
+                precision = self._precision.toarray()
+                eigenvalues, eigenvectors = np.linalg.eigh(
+                    (precision + precision.T) / 2
+                )
+                roots = np.zeros(eigenvalues.shape)
+                is_positive = eigenvalues > 0
+                roots[is_positive] = 1 / np.sqrt(eigenvalues[is_positive])
+            else:
+                eigenvalues, eigenvectors = np.linalg.eigh(self.to_dense())
+                roots = np.sqrt(eigenvalues.clip(min=0))
+            self._sqrt = (eigenvectors * roots) @ eigenvectors.T
+        return self._sqrt
+
+    def to_dense(self) -> np.ndarray:
+        """The dense (n_series * n_series) covariance matrix."""
+        return self.matmul(np.eye(self.n_series))
+
+
+class StructuredFEVD:
+    """Generalized forecast error variance decomposition for many series.
+
+    The error covariance is a StructuredCovariance and the VAR matrices are
+    used in sparse format if sufficiently sparse. By default, impulse responses
+    are generalized impulses to each variable in isolation, Psi_h = Phi_h Sigma
+    diag(Sigma)^(-1/2), as in FEVD.impulse_response_functions with
+    use_sqrtm=False. This differs from the default FEVD tables, which identify
+    impulses with the symmetric square root of the covariance, and only needs
+    products with the covariance. The impulse responses of blocks of block_size
+    shocks are propagated with the VAR recursion and accumulated horizon by
+    horizon, so that memory is O(n_series * block_size) besides the results,
+    and neither the VMA sequence nor any dense covariance, inverse or table is
+    formed. Dense tables are only materialised on request.
+
+    The identification of FEVD.forecast_error_variances, Psi_h = Phi_h
+    Sigma^(1/2), is available with use_sqrtm=True. The square root is dense, so
+    that this costs O(n_series^3) time and O(n_series^2) memory like FEVD.
+
+    Attributes:
+        var_matrices: The vector auto-regression coefficient matrices.
+        error_cov: The StructuredCovariance of the innovations.
+        density_threshold: The maximum density of VAR matrices for which sparse
+            matrix products are used.
+        use_sqrtm: Indicates if impulses are identified with the symmetric
+            square root of the covariance.
+        block_size: The number of shocks propagated jointly, default=256.
+        n_series: The number of series.
+        p_lags: The order of the VAR(p).
+    """
+
+    block_size = 256
+
+    def __init__(
+        self,
+        var_matrices: list,
+        error_cov: StructuredCovariance,
+        density_threshold: float = 0.1,
+        use_sqrtm: bool = False,
+    ):
+        """Initiates the StructuredFEVD object with attribute matrices."""
+        self.density_threshold = density_threshold
+        self.use_sqrtm = use_sqrtm
+        self.var_matrices = var_matrices
+        self.error_cov = error_cov
+
+    @property
+    def var_matrices(self) -> list:
+        """The VAR coefficients as a list of matrices."""
+        return self._var_matrices
+
+    @var_matrices.setter
+    def var_matrices(self, var_matrices: list):
+        if type(var_matrices) != list:
+            var_matrices = [var_matrices]
+        self._var_matrices = var_matrices
+        self._var_operators = [
+            sparsify(var_matrix, density_threshold=self.density_threshold)
+            for var_matrix in var_matrices
+        ]
+        self._clear_cache()
+
+    @property
+    def error_cov(self) -> StructuredCovariance:
+        """The StructuredCovariance of the innovations."""
+        return self._error_cov
+
+    @error_cov.setter
+    def error_cov(self, error_cov: StructuredCovariance):
+        self._error_cov = error_cov
+        self._clear_cache()
+
+    def _clear_cache(self) -> None:
+        """Discard the accumulated statistics of previous matrices."""
+        self._accumulated = {}
+
+    @property
+    def n_series(self) -> int:
+        """The number of series."""
+        return self.error_cov.n_series
+
+    @property
+    def p_lags(self) -> int:
+        """The order of the VAR(p)."""
+        return len(self.var_matrices)
+
+    def _impulse_blocks(self, horizon: int):
+        """Accumulate the forecast error variances of blocks of shocks.
+
+        For generalized impulses, the responses Phi_h Sigma E to the unit
+        vectors E of a block are propagated jointly with Phi_h E, so that the
+        block contributions Sum_j Phi_ij (Phi Sigma)_ij to the mean squared
+        errors are accumulated alongside. The block of the covariance diagonal
+        is read from Sigma E, so that each shock requires a single product
+        with the covariance.
+
+        Args:
+            horizon: Number of periods.
+
+        Yields:
+            columns: (block_size,) array with the indices of the shocks.
+            fev_block: (n_series * block_size) columns of the h-step forecast
+                error variance matrix.
+            mse_block: (n_series,) contribution of the block to the h-step mean
+                squared errors.
+        """
+        assert (
+            type(horizon) == int and horizon >= 0
+        ), "horizon needs to be a positive integer"
+        n_series = self.n_series
+        for start in range(0, n_series, self.block_size):
+            columns = np.arange(start, min(start + self.block_size, n_series))
+            size = columns.size
+            if self.use_sqrtm:
+                state = self.error_cov.sqrtm()[:, columns]
+                scales = None
+            else:
+                units = np.eye(n_series, size, -start)
+                cov_block = self.error_cov.matmul(units)
+                scales = np.sqrt(cov_block[columns, np.arange(size)])
+                state = np.concatenate([units, cov_block], axis=1)
+
+            states = [state]
+            fev_block = np.zeros([n_series, size])
+            mse_block = np.zeros(n_series)
+            for h in range(horizon + 1):
+                if h > 0:
+                    state = np.zeros(state.shape)
+                    for l in range(min(self.p_lags, h)):
+                        state += self._var_operators[l] @ states[-l - 1]
+                    states = (states + [state])[-self.p_lags :]
+                if self.use_sqrtm:
+                    fev_block += state**2
+                else:
+                    phi_h, phi_cov_h = state[:, :size], state[:, size:]
+                    fev_block += (phi_cov_h / scales) ** 2
+                    mse_block += (phi_h * phi_cov_h).sum(axis=1)
+            if self.use_sqrtm:
+                mse_block = fev_block.sum(axis=1)
+            yield (columns, fev_block, mse_block)
+
+    def _accumulate(self, horizon: int) -> dict:
+        """Accumulate the node-level statistics of the forecast error variances.
+
+        Args:
+            horizon: Number of periods.
+
+        Returns:
+            statistics: Dictionary with (n_series,) arrays of the mean squared
+                errors 'mse', row sums 'row_sums', column sums 'column_sums'
+                and diagonal 'diagonal' of the forecast error variance matrix.
+        """
+        if horizon not in self._accumulated:
+            n_series = self.n_series
+            statistics = {
+                key: np.zeros(n_series)
+                for key in ["mse", "row_sums", "column_sums", "diagonal"]
+            }
+            for columns, fev_block, mse_block in self._impulse_blocks(horizon):
+                statistics["mse"] += mse_block
+                statistics["row_sums"] += fev_block.sum(axis=1)
+                statistics["column_sums"][columns] = fev_block.sum(axis=0)
+                statistics["diagonal"][columns] = fev_block[
+                    columns, np.arange(columns.size)
+                ]
+            self._accumulated[horizon] = statistics
+        return self._accumulated[horizon]
+
+    def forecast_error_variances(self, horizon: int) -> np.ndarray:
+        """Calculate the dense h-step forecast error variance matrix."""
+        fev_h = np.zeros([self.n_series, self.n_series])
+        for columns, fev_block, _ in self._impulse_blocks(horizon):
+            fev_h[:, columns] = fev_block
+        return fev_h
+
+    def mean_squared_errors(self, horizon: int) -> np.ndarray:
+        """Calculate h-step mean squared error of each series (n_series * 1)."""
+        return self._accumulate(horizon)["mse"].reshape(-1, 1)
+
+    def forecast_error_variance_decomposition(
+        self,
+        horizon: int,
+        normalize: bool = False,
+    ) -> np.ndarray:
+        """Calculate the dense forecast error variance decomposition matrix."""
+        fevd = self.forecast_error_variances(horizon) / self.mean_squared_errors(
+            horizon
+        )
+        if normalize:
+            fevd /= fevd.sum(axis=1).reshape(-1, 1)
+        return fevd
+
+    def network_summaries(
+        self,
+        horizon: int,
+        table_name: str = "fevd",
+        normalize: bool = False,
+        others_only: bool = True,
+    ) -> dict:
+        """Node-level connectedness without forming the dense table.
+
+        The fev and fevd tables only differ by row scalings, so that the
+        summaries follow from the row sums, the diagonal and the column sums of
+        the forecast error variances weighted by the row scalings. The
+        weighted column sums of the fevd table require the mean squared errors
+        of all series and thus a second pass over the blocks of shocks.
+
+        Args:
+            horizon: Number of periods to compute the table.
+            table_name: Either 'fevd' or 'fev'.
+            normalize: Indicates if the fevd table should be row-normalized.
+            others_only: Indicates wheter to exclude self-linkages.
+
+        Returns:
+            summaries: Dictionary with (n_series,) arrays of in-, out-, self-
+                and net connectedness and the average connectedness.
+        """
+        statistics = self._accumulate(horizon)
+        if table_name == "fev":
+            row_weights = np.ones(self.n_series)
+            out_connectedness = statistics["column_sums"].copy()
+        elif table_name == "fevd":
+            if normalize:
+                row_weights = 1 / statistics["row_sums"]
+            else:
+                row_weights = 1 / statistics["mse"]
+            out_connectedness = np.zeros(self.n_series)
+            for columns, fev_block, _ in self._impulse_blocks(horizon):
+                out_connectedness[columns] = row_weights @ fev_block
+        else:
+            raise ValueError("table_name '{}' not available".format(table_name))
+
+        self_connectedness = statistics["diagonal"] * row_weights
+        in_connectedness = statistics["row_sums"] * row_weights
+        net_connectedness = out_connectedness - in_connectedness
+        if others_only:
+            in_connectedness -= self_connectedness
+            out_connectedness -= self_connectedness
+        summaries = {
+            "in_connectedness": in_connectedness,
+            "out_connectedness": out_connectedness,
+            "self_connectedness": self_connectedness,
+            "net_connectedness": net_connectedness,
+            "average_connectedness": in_connectedness.mean(),
+        }
+        return summaries
@@ -229,12 +229,12 @@ class Network:
             raise ValueError(
                 "measure neets to be one of 'power_law_exponent', 'herfindahl_index', 'entropy'"
             )
-        table = self.adjacency_matrix
+        table = self.adjacency_matrix.copy()
         n = self.n_nodes
 
         # remove diagonal values
         if others_only:
-            table = table[~np.eye(n, dtype=bool)].reshape(n - 1, n)
+            table = table.T[~np.eye(n, dtype=bool)].reshape(n, n - 1).T
 
         # scale columns to one
         table /= table.sum(axis=0).reshape(1, n)
@@ -3,6 +3,8 @@
 import datetime as dt
 import numpy as np
 import pandas as pd
+import scipy as sp
+import scipy.sparse
 
 
 def matrix_asymmetry(M: np.ndarray, drop_diag: bool = False) -> float:
@@ -194,4 +196,45 @@ def remove_diagonal(M: np.ndarray):
         _M: The matrix without its diagonal values.
     """
     _M = M - np.diag(np.diag(M))
-    return _M
\ No newline at end of file
+    return _M
+
+
+def matrix_density(M) -> float:
+    """Returns the share of non-zero entries in a dense or sparse matrix.
+
+    Args:
+        M: The matrix to be analyzed.
+
+    Returns:
+        density: The share of non-zero entries.
+    """
+    if sp.sparse.issparse(M):
+        n_nonzero = M.count_nonzero()
+    else:
+        n_nonzero = np.count_nonzero(M)
+    density = n_nonzero / max(np.prod(M.shape), 1)
+    return density
+
+
+def sparsify(M, density_threshold: float = 0.1):
+    """Converts a matrix to CSR format if it is sufficiently sparse.
+
+    Sparse products only pay off if few entries are non-zero, so that matrices
+    with a density above the threshold are returned as dense arrays.
+
+    Args:
+        M: A dense or sparse matrix.
+        density_threshold: The maximum density for the sparse format,
+            default=0.1.
+
+    Returns:
+        M_: The matrix as CSR matrix or as dense numpy array.
+    """
+    if matrix_density(M) <= density_threshold:
+        M_ = sp.sparse.csr_matrix(M)
+        M_.eliminate_zeros()
+    elif sp.sparse.issparse(M):
+        M_ = M.toarray()
+    else:
+        M_ = np.asarray(M)
+    return M_
@@ -37,6 +37,7 @@ from euraculus.models.var import FactorVAR
 from euraculus.models.estimate import (
     load_estimation_data,
     estimate_fevd,
+    RollingFEVDEstimator,
 )
 from euraculus.settings import (
     DATA_DIR,
@@ -88,6 +89,8 @@ residuals = var.residuals(var_data=var_data, factor_data=factor_data)
 # %%
 # %%time
 sampling_date = FIRST_ESTIMATION_DATE
+# "glmnet" estimates every window cold, "gram" warm-starts from the previous window
+estimator = RollingFEVDEstimator(var_grid=VAR_GRID, cov_grid=COV_GRID, solver="glmnet")
 while sampling_date <= LAST_SAMPLING_DATE:
     # load data
     df_info, df_log_vola, df_factors = load_estimation_data(
@@ -97,11 +100,9 @@ while sampling_date <= LAST_SAMPLING_DATE:
     # estimate
     var_data = df_log_vola
     factor_data = df_factors[FACTORS]
-    var_cv, var, cov_cv, cov, fevd = estimate_fevd(
+    var_cv, var, cov_cv, cov, fevd = estimator.estimate(
         var_data=var_data,
         factor_data=factor_data,
-        var_grid=VAR_GRID,
-        cov_grid=COV_GRID,
     )
     residuals = var.residuals(var_data=var_data, factor_data=factor_data)
 
@@ -0,0 +1,85 @@
+import numpy as np
+
+from euraculus.models.bootstrap import FactorVARBootstrap, StreamingQuantiles
+from euraculus.models.var import FactorVAR
+from tests.test_var import make_data
+
+
+class TestStreamingQuantiles:
+    """This class serves to test the streaming accumulation of quantiles."""
+
+    def test_matches_full_sample(self):
+        rng = np.random.default_rng(0)
+        samples = rng.standard_normal((4000, 2, 3)) * np.arange(1, 4)
+        accumulator = StreamingQuantiles(quantiles=(0.05, 0.5, 0.95))
+        for sample in samples:
+            accumulator.update(sample)
+        expected = np.quantile(samples, (0.05, 0.5, 0.95), axis=0)
+        assert accumulator.quantiles_.shape == (3, 2, 3)
+        np.testing.assert_allclose(accumulator.quantiles_, expected, atol=0.1)
+        np.testing.assert_allclose(accumulator.mean_, samples.mean(axis=0))
+        np.testing.assert_allclose(accumulator.std_, samples.std(axis=0, ddof=1))
+
+    def test_few_observations(self):
+        samples = np.arange(3.0).reshape(3, 1)
+        accumulator = StreamingQuantiles(quantiles=(0.5,))
+        for sample in samples:
+            accumulator.update(sample)
+        np.testing.assert_allclose(accumulator.quantiles_, [[1.0]])
+
+
+class TestFactorVARBootstrap:
+    """This class serves to test the residual bootstrap of FactorVARs."""
+
+    def test_deterministic_seeding(self):
+        var_data, factor_data = make_data(t_periods=80, n_series=4, k_factors=1)
+        var = FactorVAR(has_intercepts=True, p_lags=1)
+        var.fit_elastic_net(
+            var_data, factor_data, alpha=0.5, lambdau=0.05, solver="gram"
+        )
+        kwargs = dict(var=var, alpha=0.5, lambdau=0.05, n_replications=10, seed=1)
+        serial = FactorVARBootstrap(n_jobs=1, batch_size=10, **kwargs)
+        serial.fit(var_data, factor_data)
+        parallel = FactorVARBootstrap(n_jobs=2, batch_size=3, **kwargs)
+        parallel.fit(var_data, factor_data)
+
+        assert parallel.n_replications_ == 10
+        for statistic in ["var_1_matrix", "in_connectedness", "out_connectedness"]:
+            lower, upper = serial.confidence_bands(statistic)
+            np.testing.assert_allclose(parallel.confidence_bands(statistic)[0], lower)
+            np.testing.assert_allclose(parallel.confidence_bands(statistic)[1], upper)
+            assert (lower <= upper).all()
+        assert serial.confidence_bands("var_1_matrix")[0].shape == (4, 4)
+        assert serial.standard_errors("in_connectedness").shape == (4,)
+
+    def test_point_estimate_penalty_weights(self):
+        var_data, factor_data = make_data(t_periods=80, n_series=4, k_factors=1)
+        var = FactorVAR(has_intercepts=True, p_lags=1)
+        var.fit_adaptive_elastic_net_cv(
+            var_data=var_data,
+            factor_data=factor_data,
+            grid={"alpha": [0.5], "lambdau": [1e-2, 1e-1]},
+            folds=4,
+            penalize_factors=False,
+            solver="gram",
+            n_jobs=1,
+        )
+        weights = var.penalty_weights_.reshape(4, 5)
+        assert (weights[:, 0] == 0).all()
+        assert (weights[:, 1:] > 0).all()
+
+        kwargs = dict(var=var, alpha=0.5, lambdau=0.1, n_replications=5, seed=1)
+        inherited = FactorVARBootstrap(n_jobs=1, **kwargs).fit(var_data, factor_data)
+        explicit = FactorVARBootstrap(
+            n_jobs=1, penalty_weights=var.penalty_weights_, **kwargs
+        ).fit(var_data, factor_data)
+        uniform = FactorVARBootstrap(
+            n_jobs=1, penalty_weights=np.ones(20), **kwargs
+        ).fit(var_data, factor_data)
+        np.testing.assert_allclose(
+            inherited.standard_errors(), explicit.standard_errors()
+        )
+        assert not np.allclose(inherited.standard_errors(), uniform.standard_errors())
+
+        var.fit_ols(var_data, factor_data)
+        assert var.penalty_weights_ is None
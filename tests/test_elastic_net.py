@@ -0,0 +1,208 @@
+import numpy as np
+import scipy as sp
+import scipy.sparse
+from sklearn.linear_model import ElasticNet as SklearnElasticNet
+
+from euraculus.models.elastic_net import (
+    GramElasticNet,
+    GramGridSearchCV,
+    gram_coordinate_descent,
+    ridge_path,
+    ridge_path_cv,
+    strong_rule_coordinate_descent,
+)
+
+
+def make_data(t_samples=200, m_features=6, n_responses=4, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.standard_normal((t_samples, m_features))
+    B = rng.standard_normal((m_features, n_responses)) * (
+        rng.random((m_features, n_responses)) > 0.5
+    )
+    Y = X @ B + rng.standard_normal((t_samples, n_responses))
+    return X, Y
+
+
+class TestGramCoordinateDescent:
+    """This class serves to test the shared Gram matrix elastic net solver."""
+
+    def test_matches_single_response_fits(self):
+        X, Y = make_data()
+        coef, _ = gram_coordinate_descent(
+            gram=X.T @ X,
+            xty=X.T @ Y,
+            n_obs=X.shape[0],
+            lambdau=0.1,
+            alpha=0.5,
+            threshold=1e-12,
+        )
+        for i in range(Y.shape[1]):
+            reference = SklearnElasticNet(
+                alpha=0.1, l1_ratio=0.5, fit_intercept=False, tol=1e-12
+            ).fit(X, Y[:, i])
+            np.testing.assert_allclose(coef[:, i], reference.coef_, atol=1e-6)
+
+    def test_unpenalised_coefficients(self):
+        X, Y = make_data()
+        penalty_weights = np.zeros((X.shape[1], Y.shape[1]))
+        coef, _ = gram_coordinate_descent(
+            gram=X.T @ X,
+            xty=X.T @ Y,
+            n_obs=X.shape[0],
+            lambdau=10.0,
+            alpha=0.5,
+            penalty_weights=penalty_weights,
+            threshold=1e-14,
+        )
+        expected = np.linalg.lstsq(X, Y, rcond=None)[0]
+        np.testing.assert_allclose(coef, expected, atol=1e-6)
+
+    def test_warm_start(self):
+        X, Y = make_data()
+        kwargs = dict(gram=X.T @ X, xty=X.T @ Y, n_obs=X.shape[0], alpha=0.5)
+        cold, cold_iter = gram_coordinate_descent(lambdau=0.1, **kwargs)
+        warm, warm_iter = gram_coordinate_descent(lambdau=0.1, coef=cold, **kwargs)
+        assert warm_iter <= cold_iter
+        np.testing.assert_allclose(warm, cold, atol=1e-3)
+
+    def test_strong_rule_matches_unscreened(self):
+        X, Y = make_data(m_features=20)
+        kwargs = dict(gram=X.T @ X, xty=X.T @ Y, n_obs=X.shape[0], alpha=0.9)
+        previous, _ = gram_coordinate_descent(lambdau=0.5, threshold=1e-14, **kwargs)
+        expected, _ = gram_coordinate_descent(lambdau=0.4, threshold=1e-14, **kwargs)
+        coef, _, n_screened = strong_rule_coordinate_descent(
+            lambdau=0.4,
+            previous_lambdau=0.5,
+            coef=previous,
+            threshold=1e-14,
+            **kwargs,
+        )
+        assert n_screened > 0
+        np.testing.assert_allclose(coef, expected, atol=1e-6)
+
+
+class TestGramElasticNet:
+    """This class serves to test the multi-response GramElasticNet estimator."""
+
+    def test_matches_stacked_system(self):
+        X, Y = make_data()
+        n_responses = Y.shape[1]
+        net = GramElasticNet(lambdau=0.05, alpha=0.5, threshold=1e-12).fit(X, Y)
+        X_stacked = sp.sparse.kron(sp.sparse.eye(n_responses), X).toarray()
+        y_stacked = Y.reshape(-1, order="F")
+        reference = SklearnElasticNet(
+            alpha=0.05, l1_ratio=0.5, fit_intercept=False, tol=1e-12
+        ).fit(X_stacked, y_stacked)
+        np.testing.assert_allclose(net.coef_, reference.coef_, atol=1e-6)
+
+    def test_predict_shape(self):
+        X, Y = make_data()
+        net = GramElasticNet().fit(X, Y)
+        assert net.predict(X).shape == Y.shape
+        assert net.coef_block_.shape == (Y.shape[1], X.shape[1])
+
+
+class TestGramGridSearchCV:
+    """This class serves to test cross-validation on fold-wise statistics."""
+
+    def test_matches_refitting_each_fold(self):
+        X, Y = make_data(t_samples=120)
+        test_fold = np.repeat(np.arange(4), 30)
+        grid = {"alpha": [0.5, 1.0], "lambdau": [0.01, 0.1, 1.0]}
+        cv = GramGridSearchCV(
+            GramElasticNet(threshold=1e-12), grid, cv=test_fold
+        ).fit(X, Y)
+
+        for i_candidate, params in enumerate(cv.cv_results_["params"]):
+            scores = []
+            for fold in range(4):
+                train, test = test_fold != fold, test_fold == fold
+                net = GramElasticNet(threshold=1e-12, **params).fit(X[train], Y[train])
+                scores += [net.score(X[test], Y[test])]
+            np.testing.assert_allclose(
+                cv.cv_results_["mean_test_score"][i_candidate],
+                np.mean(scores),
+                rtol=1e-6,
+            )
+        assert cv.n_fits_ == 6 * 4 + 1
+
+    def test_best_estimator_refit(self):
+        X, Y = make_data(t_samples=120)
+        cv = GramGridSearchCV(
+            GramElasticNet(), {"lambdau": [0.01, 0.1, 1.0]}, cv=3
+        ).fit(X, Y)
+        expected = GramElasticNet(**cv.best_params_).fit(X, Y)
+        np.testing.assert_allclose(
+            cv.best_estimator_.coef_, expected.coef_, atol=1e-6
+        )
+
+    def test_warm_started_search(self):
+        X, Y = make_data(t_samples=120)
+        grid = {"lambdau": [0.01, 0.1, 1.0]}
+        cold = GramGridSearchCV(GramElasticNet(threshold=1e-10), grid, cv=3).fit(X, Y)
+        warm = GramGridSearchCV(GramElasticNet(threshold=1e-10), grid, cv=3).fit(
+            X, Y, coef_init=cold.best_estimator_.coef_block_
+        )
+        assert warm.best_params_ == cold.best_params_
+        np.testing.assert_allclose(
+            warm.cv_results_["mean_test_score"],
+            cold.cv_results_["mean_test_score"],
+            rtol=1e-6,
+        )
+
+    def test_screening(self):
+        X, Y = make_data(t_samples=120, m_features=20)
+        grid = {"alpha": [0.5, 1.0], "lambdau": np.geomspace(1e-2, 1, 12)}
+        kwargs = dict(estimator=GramElasticNet(threshold=1e-12), param_grid=grid, cv=3)
+        plain = GramGridSearchCV(**kwargs).fit(X, Y)
+        screened = GramGridSearchCV(screening=True, **kwargs).fit(X, Y)
+        assert screened.cv_results_["mean_n_screened"].sum() > 0
+        assert plain.cv_results_["mean_n_screened"].sum() == 0
+        np.testing.assert_allclose(
+            screened.cv_results_["mean_test_score"],
+            plain.cv_results_["mean_test_score"],
+            rtol=1e-6,
+        )
+
+
+class TestRidgePath:
+    """This class serves to test the closed-form ridge first stage."""
+
+    def test_matches_coordinate_descent(self):
+        X, Y = make_data()
+        penalty_weights = np.ones((X.shape[1], Y.shape[1]))
+        penalty_weights[:2] = 0
+        kwargs = dict(
+            gram=X.T @ X, xty=X.T @ Y, n_obs=Y.size, penalty_weights=penalty_weights
+        )
+        coefs = ridge_path(lambdaus=[0.01, 0.1, 1.0], **kwargs)
+        for coef, lambdau in zip(coefs, [0.01, 0.1, 1.0]):
+            expected, _ = gram_coordinate_descent(
+                lambdau=lambdau, alpha=0, threshold=1e-16, **kwargs
+            )
+            np.testing.assert_allclose(coef, expected, atol=1e-7)
+
+    def test_sparse_stacked_design(self):
+        X, Y = make_data()
+        n_responses = Y.shape[1]
+        X_stacked = sp.sparse.kron(sp.sparse.eye(n_responses), X, format="csc")
+        y_stacked = Y.reshape(-1, 1, order="F")
+        stacked = ridge_path(
+            gram=X_stacked.T @ X_stacked,
+            xty=X_stacked.T @ y_stacked,
+            n_obs=y_stacked.size,
+            lambdaus=[0.1],
+        )[0]
+        block = ridge_path(gram=X.T @ X, xty=X.T @ Y, n_obs=Y.size, lambdaus=[0.1])[0]
+        np.testing.assert_allclose(stacked.ravel(), block.T.ravel())
+
+    def test_cv_matches_grid_search(self):
+        X, Y = make_data(t_samples=120)
+        lambdaus = np.geomspace(1e-3, 1, 7)
+        best_lambdau, coef, scores = ridge_path_cv(X, Y, lambdaus, cv=4)
+        cv = GramGridSearchCV(
+            GramElasticNet(alpha=0, threshold=1e-16), {"lambdau": lambdaus}, cv=4
+        ).fit(X, Y)
+        np.testing.assert_allclose(scores, cv.cv_results_["mean_test_score"])
+        assert best_lambdau == cv.best_params_["lambdau"]
+        np.testing.assert_allclose(coef.T, cv.best_estimator_.coef_block_, atol=1e-7)
@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+
+import euraculus.models.estimate
+from euraculus.models.estimate import (
+    RollingFEVDEstimator,
+    _align_block,
+    estimate_fevd,
+)
+from tests.test_var import make_data
+
+
+class TestAlignBlock:
+    """This class serves to test the alignment of estimates to new series."""
+
+    def test_entering_and_leaving_series(self):
+        old_series = pd.Index(["a", "b", "c"])
+        new_series = pd.Index(["b", "c", "d", "e"])
+        block = np.arange(3 * (1 + 3 * 2), dtype=float).reshape(3, 7)
+        aligned = _align_block(block, old_series, new_series, k_factors=1, p_lags=2)
+        assert aligned.shape == (4, 1 + 4 * 2)
+
+        # factor columns of remaining series, zeros for entering series
+        np.testing.assert_array_equal(aligned[:, 0], [block[1, 0], block[2, 0], 0, 0])
+
+        # lag blocks keep the links between remaining series only
+        for lag in range(2):
+            np.testing.assert_array_equal(
+                aligned[:2, 1 + lag * 4 : 3 + lag * 4],
+                block[1:, 1 + lag * 3 + 1 : 1 + (lag + 1) * 3],
+            )
+            np.testing.assert_array_equal(aligned[2:, 1 + lag * 4 : 5 + lag * 4], 0)
+            np.testing.assert_array_equal(aligned[:, 3 + lag * 4 : 5 + lag * 4], 0)
+
+
+class TestRollingFEVDEstimator:
+    """This class serves to test warm-started estimation of rolling windows."""
+
+    var_grid = {"alpha": [0.5, 1.0], "lambdau": [1e-3, 1e-2, 1e-1]}
+    cov_grid = {"alpha": [0.02, 0.1]}
+
+    def assert_matches_cold_fit(self, estimator, var_data, factor_data):
+        warm = estimator.estimate(var_data, factor_data)
+        cold = estimate_fevd(
+            var_data=var_data,
+            factor_data=factor_data,
+            var_grid=self.var_grid,
+            cov_grid=self.cov_grid,
+            solver="gram",
+            n_jobs=1,
+        )
+        assert warm[0].best_params_ == cold[0].best_params_
+        assert warm[3].alpha == cold[3].alpha
+
+        # both fits agree up to the default convergence threshold of the solvers
+        np.testing.assert_allclose(
+            warm[1].var_1_matrix_, cold[1].var_1_matrix_, atol=2e-2
+        )
+        np.testing.assert_allclose(
+            warm[1].factor_loadings_, cold[1].factor_loadings_, atol=2e-2
+        )
+        np.testing.assert_allclose(warm[3].covariance_, cold[3].covariance_, atol=5e-3)
+        np.testing.assert_allclose(
+            warm[4].forecast_error_variance_decomposition(21),
+            cold[4].forecast_error_variance_decomposition(21),
+            atol=1e-2,
+        )
+
+    def test_warm_windows_match_cold_fits(self):
+        var_data, factor_data = make_data(t_periods=200)
+        estimator = RollingFEVDEstimator(
+            self.var_grid, self.cov_grid, solver="gram", n_jobs=1
+        )
+        for start in [0, 20, 40]:
+            window = slice(start, start + 150)
+            self.assert_matches_cold_fit(
+                estimator, var_data.iloc[window], factor_data.iloc[window]
+            )
+        assert estimator.is_warm
+        assert estimator.n_estimates_ == 3
+
+    def test_changing_series(self):
+        var_data, factor_data = make_data(t_periods=200, n_series=6)
+        var_data.columns = list("abcdef")
+        estimator = RollingFEVDEstimator(
+            self.var_grid, self.cov_grid, solver="gram", n_jobs=1
+        )
+        estimator.estimate(var_data.iloc[:150, :5], factor_data.iloc[:150])
+
+        # series 'a' leaves, series 'f' enters
+        self.assert_matches_cold_fit(
+            estimator, var_data.iloc[20:170, 1:], factor_data.iloc[20:170]
+        )
+        assert estimator.series_.equals(pd.Index(list("bcdef")))
+
+    def test_glmnet_windows_start_cold(self, monkeypatch):
+        calls = []
+
+        def fake_estimate_fevd(**kwargs):
+            calls.append(kwargs)
+            return estimate_fevd(**{**kwargs, "solver": "gram"})
+
+        monkeypatch.setattr(
+            euraculus.models.estimate, "estimate_fevd", fake_estimate_fevd
+        )
+        var_data, factor_data = make_data(t_periods=200)
+        estimator = RollingFEVDEstimator(
+            self.var_grid, self.cov_grid, solver="glmnet", n_jobs=1
+        )
+        for start in [0, 20]:
+            window = slice(start, start + 150)
+            estimator.estimate(var_data.iloc[window], factor_data.iloc[window])
+        assert estimator.is_warm
+        for kwargs in calls:
+            assert kwargs["solver"] == "glmnet"
+            assert "coef_init" not in kwargs
+            assert "cov_init" not in kwargs
+        assert calls[0].keys() == calls[1].keys()
@@ -0,0 +1,569 @@
+import pickle
+import tracemalloc
+
+import numpy as np
+import pytest
+import scipy as sp
+import scipy.linalg
+import scipy.sparse
+
+from euraculus.network.fevd import (
+    FEVD,
+    FEVDBatch,
+    StructuredCovariance,
+    StructuredFEVD,
+)
+from euraculus.network.network import Network
+
+
+def make_fevd(n_series=8, p_lags=1, density=0.2, seed=0, **kwargs):
+    rng = np.random.default_rng(seed)
+    var_matrices = [
+        sp.sparse.random(n_series, n_series, density=density, random_state=seed + l)
+        .toarray()
+        * 0.3
+        for l in range(p_lags)
+    ]
+    A = rng.standard_normal((n_series, n_series))
+    error_cov = A @ A.T / n_series + np.eye(n_series)
+    return FEVD(var_matrices=var_matrices, error_cov=error_cov, **kwargs)
+
+
+class TestSparseVAR:
+    """This class serves to test FEVD calculations with sparse VAR matrices."""
+
+    def test_vma_matches_dense(self):
+        for p_lags in [1, 2]:
+            dense = make_fevd(p_lags=p_lags, density_threshold=0.0)
+            sparse = make_fevd(p_lags=p_lags, density_threshold=1.0)
+            assert sp.sparse.issparse(sparse._var_operators[0])
+            assert not sp.sparse.issparse(dense._var_operators[0])
+            for horizon in range(5):
+                np.testing.assert_allclose(
+                    sparse.vma_matrix(horizon), dense.vma_matrix(horizon)
+                )
+
+    def test_sparse_input(self):
+        dense = make_fevd()
+        sparse = FEVD(
+            var_matrices=[sp.sparse.csr_matrix(dense.var_matrices[0])],
+            error_cov=dense.error_cov,
+        )
+        np.testing.assert_allclose(
+            sparse.forecast_error_variance_decomposition(horizon=3),
+            dense.forecast_error_variance_decomposition(horizon=3),
+        )
+        dense_graph = dense.to_graph(table_name="var", horizon=1)
+        sparse_graph = sparse.to_graph(table_name="var", horizon=1)
+        assert sorted(sparse_graph.edges) == sorted(dense_graph.edges)
+
+
+def naive_vma(var_matrices, horizon):
+    n_series = var_matrices[0].shape[0]
+    vma = [np.eye(n_series)]
+    for h in range(1, horizon + 1):
+        vma += [
+            sum(
+                var_matrices[l] @ vma[h - l - 1]
+                for l in range(min(len(var_matrices), h))
+            )
+        ]
+    return vma
+
+
+class TestVMACache:
+    """This class serves to test the cached VMA sequence."""
+
+    def test_matches_naive_recursion(self):
+        for p_lags in [1, 3]:
+            fevd = make_fevd(p_lags=p_lags, density=0.5)
+            expected = naive_vma(fevd.var_matrices, 12)
+            for horizon in [3, 12, 0, 7]:
+                np.testing.assert_allclose(
+                    fevd.vma_matrix(horizon), expected[horizon], atol=1e-12
+                )
+
+    def test_tables_match_horizon_loops(self):
+        fevd = make_fevd(p_lags=2, density=0.5)
+        vma = naive_vma(fevd.var_matrices, 5)
+        sqrt_cov = sp.linalg.sqrtm(fevd.error_cov)
+        expected_fev = sum((phi @ sqrt_cov) ** 2 for phi in vma)
+        expected_mse = np.diag(sum(phi @ fevd.error_cov @ phi.T for phi in vma))
+        expected_irv = sum(phi @ fevd.error_cov for phi in vma[:5])
+        np.testing.assert_allclose(fevd.forecast_error_variances(5), expected_fev)
+        np.testing.assert_allclose(fevd.mean_squared_errors(5).ravel(), expected_mse)
+        np.testing.assert_allclose(
+            fevd.innovation_response_variances(5), expected_irv
+        )
+
+    def test_invalidation(self):
+        fevd = make_fevd()
+        fevd.vma_matrix(4)
+        fevd.var_matrices = [2 * fevd.var_matrices[0]]
+        np.testing.assert_allclose(
+            fevd.vma_matrix(4), naive_vma(fevd.var_matrices, 4)[4]
+        )
+
+
+class TestErrorCovFactorization:
+    """This class serves to test the cached factorization of the covariance."""
+
+    def test_matches_direct_computation(self):
+        fevd = make_fevd()
+        sigma = fevd.error_cov
+        scales = np.diag(np.diag(sigma) ** 0.5)
+        np.testing.assert_allclose(fevd._error_cov_sqrt, sp.linalg.sqrtm(sigma))
+        np.testing.assert_allclose(
+            fevd.generalized_error_cov, scales @ np.linalg.inv(sigma) @ scales
+        )
+        np.testing.assert_allclose(
+            fevd._error_cov_logdet, np.linalg.slogdet(sigma)[1]
+        )
+        np.testing.assert_allclose(
+            fevd.impulse_response_functions(2, use_sqrtm=False),
+            fevd.vma_matrix(2) @ sigma @ np.linalg.inv(scales),
+        )
+
+    def test_invalidation(self):
+        fevd = make_fevd()
+        fevd.impulse_response_functions(1)
+        fevd.error_cov = 4 * fevd.error_cov
+        np.testing.assert_allclose(
+            fevd._error_cov_sqrt, sp.linalg.sqrtm(fevd.error_cov)
+        )
+
+
+class TestHorizonPaths:
+    """This class serves to test the tables for all horizons at once."""
+
+    def test_matches_single_horizons(self):
+        fevd = make_fevd(p_lags=2, density=0.5)
+        methods = [
+            "innovation_response_variances",
+            "forecast_error_variances",
+            "mean_squared_errors",
+            "forecast_error_variance_decomposition",
+            "forecast_uncertainty",
+            "mean_absolute_error",
+            "forecast_uncertainty_decomposition",
+        ]
+        for method in methods:
+            path = getattr(fevd, method + "_path")(6)
+            assert path.shape[0] == 7
+            for horizon in range(7):
+                np.testing.assert_allclose(
+                    path[horizon], getattr(fevd, method)(horizon)
+                )
+        np.testing.assert_allclose(
+            fevd.forecast_error_variance_decomposition_path(6, normalize=True)[6],
+            fevd.forecast_error_variance_decomposition(6, normalize=True),
+        )
+
+
+class TestFEVDBatch:
+    """This class serves to test FEVDs of stacked windows."""
+
+    def test_matches_single_windows(self):
+        fevds = [make_fevd(p_lags=2, density=0.5, seed=seed) for seed in range(3)]
+        weights = np.arange(1.0, 9.0)
+        for keep_vma in [False, True]:
+            batch = FEVDBatch.from_fevds(fevds, keep_vma=keep_vma)
+            for table_name in ["fevd", "fev", "fud", "irv", "irf", "vma"]:
+                for horizon in [0, 4]:
+                    tables = batch._get_table(table_name, horizon, weights=weights)
+                    for fevd, table in zip(fevds, tables):
+                        np.testing.assert_allclose(
+                            table,
+                            fevd._get_table(table_name, horizon, weights=weights),
+                        )
+            assert (batch._vma_cache is not None) == keep_vma
+        np.testing.assert_allclose(
+            batch.generalized_error_covs[1], fevds[1].generalized_error_cov
+        )
+
+    def test_setters_clear_cache(self):
+        fevds = [make_fevd(p_lags=2, density=0.5, seed=seed) for seed in range(3)]
+        others = [make_fevd(p_lags=2, density=0.5, seed=seed) for seed in range(3, 6)]
+        batch = FEVDBatch.from_fevds(fevds)
+        other = FEVDBatch.from_fevds(others)
+        batch._get_table("fevd", horizon=4)
+        batch.var_matrices = other.var_matrices
+        batch.error_covs = other.error_covs
+        for table_name in ["fevd", "irv", "vma"]:
+            np.testing.assert_allclose(
+                batch._get_table(table_name, horizon=4),
+                other._get_table(table_name, horizon=4),
+            )
+
+    def test_network_summaries(self):
+        fevds = [make_fevd(seed=seed) for seed in range(3)]
+        summaries = FEVDBatch.from_fevds(fevds).network_summaries(horizon=5)
+        for w, fevd in enumerate(fevds):
+            network = fevd.to_network(horizon=5)
+            np.testing.assert_allclose(
+                summaries["in_connectedness"][w], network.in_connectedness().ravel()
+            )
+            np.testing.assert_allclose(
+                summaries["out_connectedness"][w], network.out_connectedness().ravel()
+            )
+            np.testing.assert_allclose(
+                summaries["net_connectedness"][w], network.net_connectedness().ravel()
+            )
+            np.testing.assert_allclose(
+                summaries["average_connectedness"][w], network.average_connectedness()
+            )
+
+
+class TestSpectralFEVD:
+    """This class serves to test the closed-form FEVD tables."""
+
+    def test_matches_recursion(self):
+        for p_lags in [1, 2]:
+            recursive = make_fevd(p_lags=p_lags, density=0.4 / p_lags)
+            spectral = make_fevd(p_lags=p_lags, density=0.4 / p_lags, spectral=True)
+            assert spectral.spectral_radius < 1
+            for horizon in [0, 1, 30]:
+                for name in ["irv", "fev", "fevd", "fud"]:
+                    np.testing.assert_allclose(
+                        spectral._get_table(name, horizon),
+                        recursive._get_table(name, horizon),
+                        atol=1e-10,
+                    )
+
+    def test_infinite_horizon(self):
+        fevd = make_fevd(density=0.5)
+        assert fevd.spectral_radius < 1
+        np.testing.assert_allclose(
+            fevd.forecast_error_variance_decomposition(np.inf),
+            fevd.forecast_error_variance_decomposition(2000),
+        )
+        np.testing.assert_allclose(
+            fevd.innovation_response_variances(np.inf),
+            np.linalg.inv(np.eye(8) - fevd.var_matrices[0]) @ fevd.error_cov,
+        )
+
+    def test_chunked_forecast_error_variances(self):
+        recursive = make_fevd(n_series=12, p_lags=2, density=0.2)
+        spectral = make_fevd(n_series=12, p_lags=2, density=0.2, spectral=True)
+        spectral.chunk_entries = 1
+        assert not spectral._use_spectral_fev(23)
+        assert spectral._use_spectral_fev(24)
+        assert spectral._use_spectral_fev(np.inf)
+        for horizon in [5, 24]:
+            np.testing.assert_allclose(
+                spectral.forecast_error_variances(horizon),
+                recursive.forecast_error_variances(horizon),
+                atol=1e-10,
+            )
+
+    def test_defective_companion(self):
+        var_matrix = np.zeros((4, 4))
+        var_matrix[0, 1] = var_matrix[1, 2] = 0.5
+        var_matrix[3, 3] = 0.3
+        error_cov = make_fevd(n_series=4).error_cov
+        spectral = FEVD([var_matrix], error_cov, spectral=True)
+        recursive = FEVD([var_matrix], error_cov)
+        assert spectral._companion_factorization() is None
+        np.testing.assert_allclose(spectral.spectral_radius, 0.3)
+        for name in ["irv", "fev", "fevd", "fud"]:
+            np.testing.assert_allclose(
+                spectral._get_table(name, 30), recursive._get_table(name, 30)
+            )
+            np.testing.assert_allclose(
+                spectral._get_table(name, np.inf),
+                recursive._get_table(name, 2000),
+            )
+        np.testing.assert_allclose(
+            spectral.innovation_response_variances(np.inf),
+            np.linalg.inv(np.eye(4) - var_matrix) @ error_cov,
+        )
+        streamed = spectral.stream_network_estimates(np.inf)
+        np.testing.assert_allclose(
+            streamed["fevd"]["in_connectedness"],
+            spectral.to_network(horizon=np.inf).in_connectedness().ravel(),
+        )
+
+    def test_unstable(self):
+        fevd = make_fevd(density=0.5)
+        fevd.var_matrices = [np.eye(8)]
+        with pytest.raises(ValueError):
+            fevd.forecast_error_variances(np.inf)
+
+
+class TestTableCache:
+    """This class serves to test the memoization of connectedness tables."""
+
+    def test_weighted_tables(self):
+        fevd = make_fevd()
+        weights = np.arange(1.0, 9.0).reshape(-1, 1)
+        weighted = fevd._get_table("fev", horizon=5, weights=weights)
+        table = fevd._get_table("fev", horizon=5)
+        np.testing.assert_allclose(weighted, np.diag(weights.ravel()) @ table)
+        table += 1
+        np.testing.assert_allclose(fevd._get_table("fev", horizon=5) + 1, table)
+        assert fevd.table_cache_info == {"hits": 2, "misses": 1, "size": 1}
+
+    def test_invalidation_and_pickling(self):
+        fevd = make_fevd()
+        fevd.to_network(horizon=5, table_name="fevd")
+        restored = pickle.loads(pickle.dumps(fevd))
+        assert restored.table_cache_info["size"] == 0
+        np.testing.assert_allclose(
+            restored._get_table("fevd", horizon=5),
+            fevd._get_table("fevd", horizon=5),
+        )
+        fevd.error_cov = 2 * fevd.error_cov
+        assert fevd.table_cache_info["size"] == 0
+
+
+class TestDiagonalityTest:
+    """This class serves to test the diagonality tests of innovations."""
+
+    def test_matches_reference(self):
+        fevds = [make_fevd(seed=seed) for seed in range(3)]
+        batch = FEVDBatch.from_fevds(fevds)
+        T = 250
+        for method in ["ledoit-wolf", "likelihood-ratio"]:
+            statistics, p_values = batch.test_diagonal_generalized_innovations(
+                t_observations=T, method=method
+            )
+            for fevd, statistic, p_value in zip(fevds, statistics, p_values):
+                omega = fevd.generalized_error_cov
+                N = fevd.n_series
+                if method == "ledoit-wolf":
+                    expected = (
+                        N
+                        * T
+                        / 2
+                        * (
+                            np.trace(np.linalg.matrix_power(omega - np.eye(N), 2)) / N
+                            - N / T * (np.trace(omega) / N) ** 2
+                            + N / T
+                        )
+                    )
+                else:
+                    df = T - 1
+                    v = df * (
+                        np.log(N)
+                        - np.log(np.linalg.eigh(omega)[0].sum())
+                        + np.trace(omega)
+                        - N
+                    )
+                    expected = (1 - 1 / (6 * df - 1) * (2 * N + 1 - 2 / (N + 1))) * v
+                result = fevd.test_diagonal_generalized_innovations(T, method=method)
+                np.testing.assert_allclose(result[0], expected)
+                np.testing.assert_allclose(statistic, expected)
+                np.testing.assert_allclose(p_value, result[1])
+
+
+class TestStructuredFEVD:
+    """This class serves to test FEVDs with structured error covariances."""
+
+    def make_covariances(self, n_series=8, seed=0):
+        rng = np.random.default_rng(seed)
+        loadings = rng.standard_normal((n_series, 2))
+        variances = rng.random(n_series) + 0.5
+        precision = np.eye(n_series) * 2 + np.diag(np.full(n_series - 1, 0.5), k=1)
+        precision = (precision + precision.T) / 2
+        low_rank = StructuredCovariance(
+            loadings=loadings, idiosyncratic_variances=variances
+        )
+        sparse = StructuredCovariance(precision=sp.sparse.csr_matrix(precision))
+        return [
+            (low_rank, loadings @ loadings.T + np.diag(variances)),
+            (sparse, np.linalg.inv(precision)),
+        ]
+
+    def test_matches_dense_fevd(self):
+        for p_lags in [1, 2]:
+            dense = make_fevd(p_lags=p_lags, density=0.3)
+            for structured_cov, error_cov in self.make_covariances():
+                np.testing.assert_allclose(structured_cov.to_dense(), error_cov)
+                np.testing.assert_allclose(
+                    structured_cov.diagonal(), np.diag(error_cov)
+                )
+                np.testing.assert_allclose(
+                    structured_cov.sqrtm(), sp.linalg.sqrtm(error_cov)
+                )
+                dense.error_cov = error_cov
+
+                # generalized impulses
+                structured = StructuredFEVD(dense.var_matrices, structured_cov)
+                structured.block_size = 3
+                expected_fev = sum(
+                    dense.impulse_response_functions(h, use_sqrtm=False) ** 2
+                    for h in range(6)
+                )
+                np.testing.assert_allclose(
+                    structured.forecast_error_variances(5), expected_fev
+                )
+                np.testing.assert_allclose(
+                    structured.mean_squared_errors(5), dense.mean_squared_errors(5)
+                )
+
+                # symmetric square root
+                structured = StructuredFEVD(
+                    dense.var_matrices, structured_cov, use_sqrtm=True
+                )
+                structured.block_size = 3
+                np.testing.assert_allclose(
+                    structured.forecast_error_variances(5),
+                    dense.forecast_error_variances(5),
+                )
+                np.testing.assert_allclose(
+                    structured.forecast_error_variance_decomposition(21),
+                    dense.forecast_error_variance_decomposition(21),
+                )
+
+    def test_sqrtm_clips_eigenvalues(self):
+        precision = np.diag([2.0, 1.0, -1e-14])
+        structured_cov = StructuredCovariance(precision=precision)
+        np.testing.assert_allclose(
+            structured_cov.sqrtm(), np.diag([2**-0.5, 1.0, 0.0])
+        )
+
+    def test_setters_clear_cache(self):
+        dense = make_fevd(density=0.3)
+        (low_rank, _), (sparse, sparse_cov) = self.make_covariances()
+        structured = StructuredFEVD(dense.var_matrices, low_rank)
+        structured.mean_squared_errors(5)
+        other = make_fevd(density=0.3, seed=1)
+        structured.var_matrices = other.var_matrices
+        structured.error_cov = sparse
+        other.error_cov = sparse_cov
+        np.testing.assert_allclose(
+            structured.mean_squared_errors(5), other.mean_squared_errors(5)
+        )
+
+    def test_network_summaries(self):
+        dense = make_fevd(density=0.3)
+        for structured_cov, _ in self.make_covariances():
+            for use_sqrtm in [False, True]:
+                structured = StructuredFEVD(
+                    dense.var_matrices, structured_cov, use_sqrtm=use_sqrtm
+                )
+                structured.block_size = 3
+                fev = structured.forecast_error_variances(5)
+                tables = {
+                    ("fev", False): fev,
+                    ("fevd", False): fev / structured.mean_squared_errors(5),
+                    ("fevd", True): fev / fev.sum(axis=1, keepdims=True),
+                }
+                for (table_name, normalize), table in tables.items():
+                    summaries = structured.network_summaries(
+                        5, table_name=table_name, normalize=normalize
+                    )
+                    network = Network(table)
+                    np.testing.assert_allclose(
+                        summaries["in_connectedness"],
+                        network.in_connectedness().ravel(),
+                    )
+                    np.testing.assert_allclose(
+                        summaries["out_connectedness"],
+                        network.out_connectedness().ravel(),
+                    )
+                    np.testing.assert_allclose(
+                        summaries["average_connectedness"],
+                        network.average_connectedness(),
+                    )
+
+    def test_large_sparse_precision(self, monkeypatch):
+        n_series = 3000
+        precision = sp.sparse.diags(
+            [np.full(n_series - 1, 0.5), np.full(n_series, 2.0)], [-1, 0]
+        )
+        structured_cov = StructuredCovariance(precision=precision + precision.T)
+        var_matrix = sp.sparse.diags(np.full(n_series, 0.5), format="csr")
+        structured = StructuredFEVD([var_matrix], structured_cov)
+        structured.block_size = 64
+
+        def densify(*args, **kwargs):
+            raise AssertionError("structured covariance densified")
+
+        monkeypatch.setattr(StructuredCovariance, "sqrtm", densify)
+        monkeypatch.setattr(StructuredCovariance, "to_dense", densify)
+        tracemalloc.start()
+        summaries = structured.network_summaries(3)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert peak < n_series**2 * 8 / 4
+        assert summaries["in_connectedness"].shape == (n_series,)
+        assert (summaries["in_connectedness"] > 0).all()
+
+
+class TestStreamNetworkEstimates:
+    """This class serves to test network estimates streamed from the FEVD."""
+
+    def test_matches_network_estimates(self):
+        weights = np.random.default_rng(1).random(8)
+        for p_lags in [1, 2]:
+            fevd = make_fevd(p_lags=p_lags, density=0.4 / p_lags)
+            streamed = fevd.stream_network_estimates(5, weights=weights)
+            assert fevd._n_vma == 0
+            for name, table_weights in [
+                ("fevd", None),
+                ("fev", None),
+                ("wfevd", weights),
+                ("wfev", weights),
+            ]:
+                network = fevd.to_network(
+                    5, table_name=name.lstrip("w"), weights=table_weights
+                )
+                expected = {
+                    "in_connectedness": network.in_connectedness(),
+                    "out_connectedness": network.out_connectedness(),
+                    "full_in_connectedness": network.in_connectedness(
+                        others_only=False
+                    ),
+                    "full_out_connectedness": network.out_connectedness(
+                        others_only=False
+                    ),
+                    "self_connectedness": network.self_connectedness(),
+                    "net_connectedness": network.net_connectedness(),
+                    "total_connectedness": network.total_connectedness(),
+                    "in_concentration": network.in_concentration(),
+                    "out_concentration": network.out_concentration(),
+                    "full_in_concentration": network.in_concentration(
+                        others_only=False
+                    ),
+                    "full_out_concentration": network.out_concentration(
+                        others_only=False
+                    ),
+                    "amplification_factor": network.amplification_factor(),
+                    "absorption_rate": network.absorption_rate(),
+                }
+                for estimate, value in expected.items():
+                    np.testing.assert_allclose(
+                        streamed[name][estimate], np.ravel(value), rtol=1e-8
+                    )
+
+    def test_spectral_infinite_horizon(self):
+        fevd = make_fevd(density=0.5, spectral=True)
+        streamed = fevd.stream_network_estimates(np.inf)
+        network = fevd.to_network(np.inf, table_name="fevd")
+        np.testing.assert_allclose(
+            streamed["fevd"]["in_connectedness"],
+            np.ravel(network.in_connectedness()),
+        )
+        assert "wfevd" not in streamed
+
+
+class TestIndexVarianceDecomposition:
+    """This class serves to test variance decompositions of weighted indices."""
+
+    def test_weight_matrix(self):
+        fevd = make_fevd(p_lags=2, density=0.2)
+        weights = np.random.default_rng(1).random((8, 3))
+        irv = fevd.innovation_response_variances(5)
+        decompositions = fevd.index_variance_decomposition(weights, 5)
+        assert decompositions.shape == (8, 3)
+        for i_index in range(3):
+            w = weights[:, i_index]
+            expected = w.T @ irv @ np.diag(w)
+            np.testing.assert_allclose(
+                fevd.index_variance_decomposition(w, 5), expected
+            )
+            np.testing.assert_allclose(decompositions[:, i_index], expected)
+        index_variances = np.einsum("im, ij, jm -> m", weights, irv, weights)
+        np.testing.assert_allclose(decompositions.sum(axis=0), index_variances)
+        assert fevd.table_cache_info["hits"] == 3
@@ -0,0 +1,37 @@
+import numpy as np
+
+from euraculus.network.network import Network
+
+
+class TestConcentration:
+    """This class serves to test the concentration of network links."""
+
+    def test_out_concentration_matches_transpose(self):
+        rng = np.random.default_rng(0)
+        adjacency_matrix = rng.random((5, 5))
+        original = adjacency_matrix.copy()
+        network = Network(adjacency_matrix)
+        transposed = Network(adjacency_matrix.T.copy())
+        for others_only in [True, False]:
+            for measure in ["herfindahl_index", "entropy"]:
+                np.testing.assert_allclose(
+                    network.out_concentration(others_only=others_only, measure=measure),
+                    transposed.in_concentration(
+                        others_only=others_only, measure=measure
+                    ),
+                )
+        np.testing.assert_array_equal(network.adjacency_matrix, original)
+
+    def test_out_concentration_excludes_diagonal(self):
+        adjacency_matrix = np.array(
+            [
+                [9.0, 1.0, 1.0],
+                [1.0, 9.0, 3.0],
+                [0.0, 1.0, 9.0],
+            ]
+        )
+        # column shares of the off-diagonal links
+        shares = np.array([[1.0, 0.5, 0.25], [0.0, 0.5, 0.75]])
+        expected = (shares**2).sum(axis=0)
+        concentration = Network(adjacency_matrix).out_concentration()
+        np.testing.assert_allclose(concentration.ravel(), expected)
@@ -0,0 +1,60 @@
+import os
+import joblib
+import numpy as np
+import scipy as sp
+import scipy.sparse
+
+from euraculus.models.parallel import SharedWorkerPool, share_data
+
+
+def _worker_state(data):
+    from threadpoolctl import threadpool_info
+
+    n_threads = [info["num_threads"] for info in threadpool_info()]
+    return data.sum(), max(n_threads, default=1)
+
+
+def _is_memory_mapped(array):
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = getattr(array, "base", None)
+    return False
+
+
+class TestSharedWorkerPool:
+    """This class serves to test the coordinated worker pool with shared data."""
+
+    def test_share_data(self, tmp_path):
+        rng = np.random.default_rng(0)
+        X = sp.sparse.kron(sp.sparse.eye(3), rng.random((10, 4)), format="csc")
+        shared = share_data(X, folder=str(tmp_path))
+        assert sp.sparse.isspmatrix_csc(shared)
+        assert _is_memory_mapped(shared.data)
+        assert _is_memory_mapped(shared.indices)
+        assert (shared != X).nnz == 0
+
+        y = rng.random((30, 1))
+        np.testing.assert_array_equal(share_data(y, folder=str(tmp_path)), y)
+        assert share_data(None, folder=str(tmp_path)) is None
+
+    def test_workers(self):
+        y = np.arange(12.0).reshape(4, 3)
+        with SharedWorkerPool(n_jobs=2, blas_threads=1) as pool:
+            shared = pool.share(y)
+            results = joblib.Parallel()(
+                joblib.delayed(_worker_state)(shared) for _ in range(2)
+            )
+            folder = pool.folder_
+        for total, n_threads in results:
+            assert total == y.sum()
+            assert n_threads == 1
+        assert not os.path.exists(folder)
+
+    def test_inactive_pool(self):
+        y = np.arange(12.0).reshape(4, 3)
+        for kwargs in [dict(n_jobs=2, enabled=False), dict(n_jobs=1)]:
+            with SharedWorkerPool(**kwargs) as pool:
+                assert not pool.is_active
+                assert pool.share(y) is y
+                assert pool.folder_ is None
@@ -0,0 +1,45 @@
+import numpy as np
+
+from euraculus.models.elastic_net import GramElasticNet, GramGridSearchCV
+from euraculus.models.search import RefinedGridSearchCV, count_fits
+
+
+def make_data(t_samples=240, m_features=10, n_responses=5, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.standard_normal((t_samples, m_features))
+    B = rng.standard_normal((m_features, n_responses)) * (
+        rng.random((m_features, n_responses)) > 0.7
+    )
+    Y = X @ B + 2 * rng.standard_normal((t_samples, n_responses))
+    return X, Y
+
+
+class TestRefinedGridSearchCV:
+    """This class serves to test the coarse-to-fine hyperparameter search."""
+
+    grid = {
+        "alpha": np.geomspace(1e-2, 1, 5),
+        "lambdau": np.geomspace(1e-3, 1e1, 17),
+    }
+
+    def test_matches_exhaustive_search(self):
+        X, Y = make_data()
+        search_cv = GramGridSearchCV(GramElasticNet(threshold=1e-12), self.grid, cv=4)
+        refined = RefinedGridSearchCV(search_cv, self.grid).fit(X, Y)
+        exhaustive = search_cv.fit(X, Y)
+        assert refined.best_params_ == exhaustive.best_params_
+        np.testing.assert_allclose(refined.best_score_, exhaustive.best_score_)
+        np.testing.assert_allclose(
+            refined.best_estimator_.coef_, exhaustive.best_estimator_.coef_
+        )
+
+    def test_fewer_fits(self):
+        X, Y = make_data()
+        search_cv = GramGridSearchCV(GramElasticNet(), self.grid, cv=4)
+        refined = RefinedGridSearchCV(search_cv, self.grid).fit(X, Y)
+        n_candidates = len(refined.cv_results_["params"])
+        assert n_candidates < 5 * 17
+        assert len({tuple(p.values()) for p in refined.cv_results_["params"]}) == (
+            n_candidates
+        )
+        assert count_fits(refined) == n_candidates * 4 + refined.n_stages_
@@ -0,0 +1,347 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import scipy as sp
+import scipy.sparse
+from sklearn.linear_model import LinearRegression
+
+from euraculus.models.var import VAR, FactorVAR, FactorVARBatch, OnlineFactorVAR
+
+
+def make_data(t_periods=150, n_series=5, k_factors=2, seed=0):
+    rng = np.random.default_rng(seed)
+    factors = rng.standard_normal((t_periods, k_factors))
+    var_matrix = 0.4 * np.eye(n_series) + 0.05 * rng.standard_normal(
+        (n_series, n_series)
+    )
+    loadings = rng.standard_normal((n_series, k_factors))
+    data = np.zeros((t_periods, n_series))
+    for t in range(1, t_periods):
+        data[t] = (
+            0.1 + var_matrix @ data[t - 1] + loadings @ factors[t]
+        ) + rng.standard_normal(n_series)
+    return pd.DataFrame(data), pd.DataFrame(factors)
+
+
+class TestFitOLS:
+    """This class serves to test OLS estimation of VARs."""
+
+    def test_var_matches_stacked_regression(self):
+        var_data, _ = make_data()
+        var = VAR(has_intercepts=True, p_lags=2)
+        var.fit_ols(var_data)
+        X, y = var._build_X_y(var_data=var_data, add_intercepts=True)
+        expected = LinearRegression(fit_intercept=False).fit(X, y).coef_.ravel()
+        model = var.fit_ols(var_data, return_model=True)
+        np.testing.assert_allclose(model.coef_.ravel(), expected, atol=1e-8)
+        np.testing.assert_allclose(
+            var.var_matrices_[1],
+            var._extract_var_matrices(coef_=expected, n_series=5)[1],
+            atol=1e-8,
+        )
+
+    def test_factor_var_standard_errors(self):
+        var_data, factor_data = make_data()
+        var = FactorVAR(has_intercepts=True, p_lags=1)
+        standard_errors = var.fit_ols(var_data, factor_data, return_se=True)
+
+        # standard errors of the first equation
+        X = var._build_X_block(
+            var_data=var_data.values,
+            factor_data=factor_data.values,
+            add_intercepts=True,
+        )
+        y = var_data.values[1:, 0]
+        coef = np.linalg.lstsq(X, y, rcond=None)[0]
+        sigma2 = ((y - X @ coef) ** 2).sum() / (X.shape[0] - X.shape[1])
+        expected = np.sqrt(sigma2 * np.diag(np.linalg.inv(X.T @ X)))
+
+        np.testing.assert_allclose(var.factor_loadings_[0], coef[1:3])
+        np.testing.assert_allclose(standard_errors["intercepts"][0, 0], expected[0])
+        np.testing.assert_allclose(
+            standard_errors["factor_loadings"][0], expected[1:3]
+        )
+        np.testing.assert_allclose(standard_errors["var_matrices"][0][0], expected[3:])
+
+
+class TestR2Diagnostics:
+    """This class serves to test goodness of fit diagnostics of FactorVARs."""
+
+    @staticmethod
+    def restricted_sum_of_squares(var, var_data, factor_data, factors, keep_var):
+        restricted = var.copy()
+        restricted._factor_loadings_ = var.factor_loadings_ * factors
+        if not keep_var:
+            restricted._var_matrices_ = [np.zeros(m.shape) for m in var.var_matrices_]
+        residuals = restricted.residuals(var_data=var_data, factor_data=factor_data)
+        return np.nansum((residuals - residuals.mean()) ** 2, axis=0)
+
+    def test_matches_restricted_models(self):
+        var_data, factor_data = make_data(k_factors=3)
+        var = FactorVAR(has_intercepts=True, p_lags=2)
+        var.fit_ols(var_data, factor_data)
+        args = (var, var_data, factor_data)
+        ones, zeros = np.ones(3), np.zeros(3)
+
+        ss_full = self.restricted_sum_of_squares(*args, ones, True)
+        ss_partial = [
+            self.restricted_sum_of_squares(*args, ones - np.eye(3)[k], True)
+            for k in range(3)
+        ] + [
+            self.restricted_sum_of_squares(*args, zeros, True),
+            self.restricted_sum_of_squares(*args, ones, False),
+        ]
+        ss_component = [
+            self.restricted_sum_of_squares(*args, np.eye(3)[k], False)
+            for k in range(3)
+        ] + [
+            self.restricted_sum_of_squares(*args, ones, False),
+            self.restricted_sum_of_squares(*args, zeros, True),
+        ]
+        tss = np.nansum((var_data[2:] - var_data[2:].mean()) ** 2, axis=0)
+
+        for weighting in ["equal", "variance", "granular"]:
+            weights = var_data[2:].mean().values
+            partial = var.partial_r2s(var_data, factor_data, weighting=weighting)
+            component = var.component_r2s(var_data, factor_data, weighting=weighting)
+            assert list(partial) == [0, 1, 2, "factors", "var"]
+            for value, ss in zip(partial.values(), ss_partial):
+                expected = var._weigh_r2(ss_full, ss, weighting, weights)
+                np.testing.assert_allclose(value, expected)
+            for value, ss in zip(component.values(), ss_component):
+                expected = var._weigh_r2(ss, tss, weighting, weights)
+                np.testing.assert_allclose(value, expected)
+
+    def test_diagnostics_cache(self):
+        var_data, factor_data = make_data()
+        var = FactorVAR(has_intercepts=True, p_lags=1)
+        var.fit_ols(var_data, factor_data)
+        diagnostics = var.diagnostics(var_data, factor_data)
+        assert var.diagnostics(var_data, factor_data) is diagnostics
+        np.testing.assert_allclose(
+            diagnostics.r2(weighting="granular"),
+            var.r2(var_data=var_data, factor_data=factor_data, weighting="granular"),
+        )
+        pd.testing.assert_frame_equal(
+            diagnostics.residuals,
+            var.residuals(var_data=var_data, factor_data=factor_data),
+        )
+
+        # the cache is not pickled with the model
+        assert "_diagnostics_cache_" not in pickle.loads(pickle.dumps(var)).__dict__
+
+        # modifying the data in place invalidates the cache
+        var_data.iloc[:10] = 0.0
+        modified = var.diagnostics(var_data, factor_data)
+        assert modified is not diagnostics
+        np.testing.assert_allclose(
+            modified.r2(),
+            var.r2(var_data=var_data, factor_data=factor_data, weighting="equal"),
+        )
+
+        # refitting invalidates the cache
+        var.fit_ols(var_data[:100], factor_data[:100])
+        refitted = var.diagnostics(var_data, factor_data)
+        assert refitted is not modified
+        assert refitted.r2() < modified.r2()
+
+
+class TestPredict:
+    """This class serves to test predictions from the single equation design."""
+
+    def test_matches_stacked_design(self):
+        var_data, factor_data = make_data()
+        var = FactorVAR(has_intercepts=True, p_lags=2)
+        var.fit_ols(var_data, factor_data)
+        X = var._build_X(
+            var_data=var_data.values,
+            factor_data=factor_data.values,
+            add_intercepts=True,
+        )
+        expected = (X @ var._coef_).reshape(-1, 5, order="F")
+
+        y_pred = var.predict(var_data, factor_data=factor_data)
+        np.testing.assert_allclose(y_pred.values, expected)
+        assert (y_pred.index == var_data.index[2:]).all()
+
+        residuals = var.residuals(var_data.values, factor_data=factor_data.values)
+        assert isinstance(residuals, np.ndarray)
+        np.testing.assert_allclose(residuals, var_data.values[2:] - expected)
+
+    def test_output_buffers(self):
+        var_data, factor_data = make_data()
+        var = FactorVAR(has_intercepts=False, p_lags=1)
+        var.fit_ols(var_data, factor_data)
+        out = np.empty((149, 5))
+        residuals = var.residuals(
+            var_data.values, factor_data=factor_data.values, out=out
+        )
+        assert residuals is out
+        np.testing.assert_allclose(
+            out, var.residuals(var_data, factor_data=factor_data).values
+        )
+        factor_residuals = var.factor_residuals(
+            var_data.values, factor_data.values, out=out
+        )
+        assert factor_residuals is out
+        np.testing.assert_allclose(
+            out,
+            var_data.values[1:] - factor_data.values[1:] @ var.factor_loadings_.T,
+        )
+
+    def test_sparse_coefficients(self):
+        var_data, factor_data = make_data()
+        var = FactorVAR(has_intercepts=True, p_lags=1)
+        var.fit_ols(var_data, factor_data)
+        var.density_threshold = 0.0
+        dense = var.residuals(var_data.values, factor_data=factor_data.values)
+        var.density_threshold = 1.0
+        assert sp.sparse.isspmatrix_csr(var.sparse_var_matrices_[0])
+        sparse = var.residuals(var_data.values, factor_data=factor_data.values)
+        np.testing.assert_allclose(sparse, dense)
+
+        # the sparse matrix is built once per stored estimate
+        coef_matrix = var._prediction_matrix_
+        assert sp.sparse.isspmatrix_csr(coef_matrix)
+        var.predict(var_data, factor_data=factor_data)
+        assert var._prediction_matrix_ is coef_matrix
+        var.fit_ols(var_data[1:], factor_data[1:])
+        assert var._prediction_matrix_ is not coef_matrix
+        np.testing.assert_allclose(
+            var._prediction_matrix_.toarray(), var._coef_matrix_
+        )
+
+
+class TestFitCV:
+    """This class serves to test cross-validated estimation in the worker pool."""
+
+    def test_gram_adaptive_elastic_net_cv(self):
+        var_data, factor_data = make_data()
+        grid = {"alpha": [0.5, 1.0], "lambdau": [1e-3, 1e-2, 1e-1]}
+        var = FactorVAR(has_intercepts=True, p_lags=1)
+        cv = var.fit_adaptive_elastic_net_cv(
+            var_data=var_data,
+            factor_data=factor_data,
+            grid=grid,
+            folds=4,
+            solver="gram",
+            return_cv=True,
+            n_jobs=2,
+        )
+        assert var.is_fitted
+        assert cv.best_params_["lambdau"] in grid["lambdau"]
+        assert var.var_1_matrix_.shape == (5, 5)
+
+
+class TestOnlineFactorVAR:
+    """This class serves to test rolling window updates of sufficient statistics."""
+
+    def test_ols_update_matches_refit(self):
+        var_data, factor_data = make_data(t_periods=200)
+        online = OnlineFactorVAR(has_intercepts=True, p_lags=2)
+        online.fit_window(var_data[:150], factor_data[:150])
+        for t in range(150, 160):
+            online.update(var_data.values[t], factor_data.values[t])
+        online.update(var_data[160:165], factor_data[160:165])
+
+        var = FactorVAR(has_intercepts=True, p_lags=2)
+        var.fit_ols(var_data[15:165], factor_data[15:165])
+        assert online.n_obs_ == 148
+        np.testing.assert_allclose(online.intercepts_, var.intercepts_, atol=1e-8)
+        np.testing.assert_allclose(
+            online.factor_loadings_, var.factor_loadings_, atol=1e-8
+        )
+        np.testing.assert_allclose(online.var_matrices_[1], var.var_matrices_[1])
+
+    def test_elastic_net_update_matches_refit(self):
+        var_data, factor_data = make_data(t_periods=200)
+        kwargs = dict(method="ElasticNet", lambdau=0.05, alpha=0.5, threshold=1e-12)
+        online = OnlineFactorVAR(**kwargs)
+        online.fit_window(var_data[:150], factor_data[:150])
+        online.update(var_data[150:160], factor_data[150:160])
+        refit = OnlineFactorVAR(**kwargs)
+        refit.fit_window(var_data[10:160], factor_data[10:160])
+        np.testing.assert_allclose(online._coef_, refit._coef_, atol=1e-5)
+        assert (online.var_1_matrix_ == 0).any()
+
+    def test_elastic_net_matches_factor_var(self):
+        var_data, factor_data = make_data(t_periods=200)
+        for has_intercepts, p_lags in [(True, 1), (False, 1)]:
+            kwargs = dict(has_intercepts=has_intercepts, p_lags=p_lags)
+            online = OnlineFactorVAR(
+                method="ElasticNet", lambdau=0.05, alpha=0.5, threshold=1e-12, **kwargs
+            )
+            online.fit_window(var_data[:150], factor_data[:150])
+            online.update(var_data[150:160], factor_data[150:160])
+            var = FactorVAR(**kwargs)
+            var.fit_elastic_net(
+                var_data[10:160],
+                factor_data[10:160],
+                alpha=0.5,
+                lambdau=0.05,
+                solver="gram",
+                threshold=1e-12,
+            )
+            np.testing.assert_allclose(
+                online.factor_loadings_, var.factor_loadings_, atol=1e-5
+            )
+            np.testing.assert_allclose(
+                online.var_1_matrix_, var.var_1_matrix_, atol=1e-5
+            )
+            if has_intercepts:
+                np.testing.assert_allclose(
+                    online.intercepts_, var.intercepts_, atol=1e-5
+                )
+
+
+class TestFactorVARBatch:
+    """This class serves to test the joint estimation of multiple windows."""
+
+    def make_windows(self, n_windows=4, t_periods=80):
+        var_data, factor_data = make_data(t_periods=t_periods + 10 * n_windows)
+        windows = [slice(10 * w, 10 * w + t_periods) for w in range(n_windows)]
+        return [(var_data[window], factor_data[window]) for window in windows]
+
+    def test_ols_matches_single_windows(self):
+        windows = self.make_windows()
+        batch = FactorVARBatch(has_intercepts=True, p_lags=2)
+        batch.fit_ols(
+            np.stack([v.values for v, _ in windows]),
+            np.stack([f.values for _, f in windows]),
+        )
+        for model, (var_data, factor_data) in zip(batch.to_models(), windows):
+            var = FactorVAR(has_intercepts=True, p_lags=2)
+            var.fit_ols(var_data, factor_data)
+            np.testing.assert_allclose(model._coef_, var._coef_, atol=1e-8)
+
+    def test_elastic_net_matches_single_windows(self):
+        windows = self.make_windows()
+        lambdaus = [0.01, 0.05, 0.1, 0.2]
+        batch = FactorVARBatch(has_intercepts=True, p_lags=1)
+        batch.fit_elastic_net(
+            np.stack([v.values for v, _ in windows]),
+            np.stack([f.values for _, f in windows]),
+            alpha=0.5,
+            lambdau=lambdaus,
+            penalize_factors=False,
+            threshold=1e-12,
+            n_jobs=1,
+        )
+        assert batch.var_1_matrices_.shape == (4, 5, 5)
+        for w, (var_data, factor_data) in enumerate(windows):
+            var = FactorVAR(has_intercepts=True, p_lags=1)
+            var.fit_elastic_net(
+                var_data,
+                factor_data,
+                alpha=0.5,
+                lambdau=lambdaus[w],
+                penalize_factors=False,
+                solver="gram",
+                threshold=1e-12,
+            )
+            np.testing.assert_allclose(batch.var_1_matrices_[w], var.var_1_matrix_)
+            np.testing.assert_allclose(
+                batch.factor_loadings_[w], var.factor_loadings_, atol=1e-10
+            )
+            np.testing.assert_allclose(batch.intercepts_[w], var.intercepts_)